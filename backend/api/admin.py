@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import User, Lead, SavedList, SavedFilter, CreditTransaction
+from .models import User, Lead, SavedList, SavedFilter, CreditTransaction, StripeEvent
 
 
 @admin.register(User)
@@ -14,21 +14,39 @@ class LeadAdmin(admin.ModelAdmin):
     list_display = ("name", "owner", "industry", "location", "email_unlocked", "phone_unlocked")
     search_fields = ("name", "email", "owner__email")
     list_filter = ("industry", "location")
+    list_select_related = ("owner",)
 
 
 @admin.register(SavedList)
 class SavedListAdmin(admin.ModelAdmin):
     list_display = ("name", "owner", "created_at")
     search_fields = ("name", "owner__email")
+    list_select_related = ("owner",)
+
+    def formfield_for_manytomany(self, db_field, request, **kwargs):
+        if db_field.name == "leads":
+            # Lead.__str__ shows the owner's email; join it instead of one query per option.
+            kwargs["queryset"] = Lead.objects.select_related("owner")
+        return super().formfield_for_manytomany(db_field, request, **kwargs)
 
 
 @admin.register(SavedFilter)
 class SavedFilterAdmin(admin.ModelAdmin):
     list_display = ("name", "owner", "created_at")
     search_fields = ("name", "owner__email")
+    list_select_related = ("owner",)
 
 
 @admin.register(CreditTransaction)
 class CreditTransactionAdmin(admin.ModelAdmin):
     list_display = ("owner", "amount", "description", "created_at")
     search_fields = ("owner__email", "description")
+    list_select_related = ("owner",)
+
+
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = ("event_id", "event_type", "session_id", "owner", "credits", "processed_at")
+    search_fields = ("event_id", "session_id", "owner__email")
+    list_filter = ("event_type",)
+    list_select_related = ("owner",)
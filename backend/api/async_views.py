@@ -0,0 +1,134 @@
+"""
+Async variants of the I/O-bound endpoints, for deployments served by ASGI.
+
+DRF's ``APIView`` is synchronous, so these are plain Django async views that
+reuse the same building blocks: JWT authentication (and its user cache),
+the filter, field and cursor parsers, the ETag and the values() fast path.
+Queries go through Django's async ORM and the Stripe call is awaited (see
+:mod:`api.payments`), so one ASGI worker can hold many slow requests at
+once. Under WSGI they still work, one request per thread as before.
+
+Responses match their synchronous counterparts; content negotiation is
+limited to JSON for the list and to ``format=csv|ndjson`` for the export.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .authentication import CachedJWTAuthentication
+from .exports import CSV_FIELDS, streaming_csv_response, streaming_ndjson_response
+from .filters import get_lead_filter_lookups
+from .models import Lead
+from .pagination import LeadPagination
+from .payments import acreate_checkout_session
+from .representations import get_requested_fields, lead_values, represent_leads
+from .versioning import etag_matches, owner_etag
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(JSONRenderer().render(data), status=status_code, content_type="application/json")
+
+
+class AsyncAPIView(View):
+    """
+    The parts of ``APIView`` these endpoints need: JWT authentication, DRF's
+    parsers and query params, and API exceptions rendered as JSON.
+    """
+
+    authentication_class = CachedJWTAuthentication
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token authenticated, like every APIView: no CSRF cookie involved.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        method = request.method.lower()
+        handler = getattr(self, method, None) if method in self.http_method_names else None
+        if handler is None:
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+        try:
+            user = await self.authenticate(request)
+            api_request = Request(request, parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES])
+            api_request.user = user
+            return await handler(api_request, *args, **kwargs)
+        except APIException as exc:
+            response = json_response(
+                exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}, exc.status_code
+            )
+            if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+                response["WWW-Authenticate"] = self.authentication_class().authenticate_header(request)
+            return response
+
+    async def authenticate(self, request):
+        result = await sync_to_async(self.authentication_class().authenticate)(request)
+        if result is None:
+            raise NotAuthenticated()
+        return result[0]
+
+
+class AsyncLeadListView(AsyncAPIView):
+    """``GET /api/leads/`` with the same filters, ``fields``, cursor pages and ETag."""
+
+    async def get(self, request):
+        etag = await sync_to_async(owner_etag)(request)
+        if etag_matches(request, etag):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = json_response(await self.list_values(request))
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    async def list_values(self, request):
+        fields = get_requested_fields(request)
+        # A saved filter in the params is looked up with the sync ORM.
+        lookups = await sync_to_async(get_lead_filter_lookups)(request)
+        queryset = Lead.objects.filter(owner=request.user, **lookups).order_by("-created_at", "-id")
+        queryset = lead_values(queryset, fields, extra=("created_at", "id"))
+        paginator = LeadPagination()
+        if not paginator.is_requested(request):
+            return represent_leads([row async for row in queryset], fields)
+        page = paginator.take_page([row async for row in paginator.page_queryset(queryset, request)])
+        return paginator.get_paginated_data(represent_leads(page, fields))
+
+
+class AsyncExportLeadsView(AsyncAPIView):
+    """``GET /api/leads/export/?format=csv|ndjson``, streamed from an async cursor."""
+
+    async def get(self, request):
+        lookups = await sync_to_async(get_lead_filter_lookups)(request)
+        leads = Lead.objects.filter(owner=request.user, **lookups).order_by("-created_at", "-id")
+        format_type = request.query_params.get("format") or "csv"
+        if format_type == "csv":
+            fields = get_requested_fields(request, default=CSV_FIELDS)
+            return streaming_csv_response(leads, fields, asynchronous=True)
+        if format_type == "ndjson":
+            return streaming_ndjson_response(leads, get_requested_fields(request), asynchronous=True)
+        raise ValidationError({"format": "Expected csv or ndjson."})
+
+
+class AsyncStripeCheckoutView(AsyncAPIView):
+    """``POST /api/credits/checkout/`` that awaits Stripe instead of blocking a thread."""
+
+    async def post(self, request):
+        try:
+            amount = int(request.data.get("amount", 0))
+            credits = int(request.data.get("credits", 0))
+        except (TypeError, ValueError):
+            return json_response({"detail": "Amount and credits must be integers"}, status.HTTP_400_BAD_REQUEST)
+        if amount <= 0 or credits <= 0:
+            return json_response({"detail": "Amount and credits must be positive"}, status.HTTP_400_BAD_REQUEST)
+        if not settings.STRIPE_SECRET_KEY:
+            return json_response({"detail": "Stripe secret key missing"}, status.HTTP_400_BAD_REQUEST)
+
+        session = await acreate_checkout_session(request.user.id, amount, credits)
+        return json_response({"id": session.id, "url": session.url})
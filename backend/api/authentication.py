@@ -0,0 +1,97 @@
+"""
+JWT authentication with an in-process cache of user rows.
+
+simplejwt's ``JWTAuthentication`` loads the user on every request; this
+caches it per process, keyed by ``(user id, token version)``. With
+``CHECK_REVOKE_TOKEN`` on, tokens carry a hash of the password they were
+issued against and that hash is the version, so a password change revokes
+old tokens and they miss this process's cache. Credit changes and user
+saves drop the entry once their transaction commits.
+
+Both only reach the process that made the change. Every other worker keeps
+its entry until it expires, so there a revoked token, a deactivated user or
+a deleted user is still accepted for up to ``AUTH_USER_CACHE_TIMEOUT``
+seconds (0 disables the cache). For the same reason, code that needs a
+current value (credits, the data version behind ETags) reads it from the
+database rather than from ``request.user``.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+class UserCache:
+    """A small thread-safe LRU of ``user id -> (token version, user)`` entries with a TTL."""
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, version):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            entry_version, user, expires = entry
+            if entry_version != version or expires <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return user
+
+    def set(self, user_id, version, user):
+        if self.timeout <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (version, user, time.monotonic() + self.timeout)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TIMEOUT)
+
+
+def invalidate_cached_user(user_id):
+    """
+    Forget the cached user now and again once the current transaction commits.
+
+    The second delete covers a concurrent request that re-cached the old row
+    while the write was still uncommitted.
+    """
+    key = str(user_id)
+    user_cache.delete(key)
+    transaction.on_commit(lambda: user_cache.delete(key))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        key = str(user_id)
+        version = validated_token.get(api_settings.REVOKE_TOKEN_CLAIM)
+        user = user_cache.get(key, version)
+        if user is None:
+            # Raises for unknown, inactive and revoked (password changed) users.
+            user = super().get_user(validated_token)
+            user_cache.set(key, version, user)
+        # Views may assign to request.user; keep the cached instance pristine.
+        return copy.copy(user)
@@ -0,0 +1,14 @@
+"""Synthetic lead rows shared by the benchmark commands and api.loadbench."""
+
+
+def synthetic_rows(count):
+    for index in range(count):
+        yield {
+            "name": f"Bench Lead {index}",
+            "industry": ("Technology", "Finance", "Healthcare", "Retail")[index % 4],
+            "location": ("United States", "India", "Canada")[index % 3],
+            "email": f"bench{index}@example.com",
+            "phone": f"555-{index:07d}",
+            "website": f"bench{index}.example.com",
+            "source": "import",
+        }
@@ -0,0 +1,111 @@
+"""
+Delta sync for leads (``/api/leads/changes/``).
+
+A change cursor holds two keyset positions, ``(updated_at, id)`` over leads
+and ``(deleted_at, id)`` over tombstones, so each poll reads only what
+changed since the previous one through the ``(owner, updated_at, id)`` and
+``(owner, deleted_at, id)`` indexes. Rows younger than
+``LEAD_CHANGES_SETTLE_SECONDS`` are held back: a writer that stamped its row
+before a concurrent one but committed after it would otherwise land behind a
+cursor that has already moved on.
+"""
+
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Lead, LeadTombstone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class CursorExpired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = "Change cursor has expired; resync from scratch."
+    default_code = "cursor_expired"
+
+
+def encode_change_cursor(updated, deleted):
+    raw = f"{updated[0].isoformat()}|{updated[1]}|{deleted[0].isoformat()}|{deleted[1]}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_change_cursor(token):
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        parts = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii").split("|")
+        updated_at, lead_id, deleted_at, tombstone_id = parts
+        return (
+            (datetime.fromisoformat(updated_at), int(lead_id)),
+            (datetime.fromisoformat(deleted_at), int(tombstone_id)),
+        )
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValidationError({"since": "Invalid cursor."})
+
+
+def _after(field, position):
+    value, pk = position
+    return Q(**{f"{field}__gt": value}) | Q(**{field: value, "id__gt": pk})
+
+
+def get_lead_changes(owner_id, since=None, limit=None):
+    """
+    Return leads written and lead ids deleted after the ``since`` cursor.
+
+    Without ``since`` every current lead counts as changed and tombstones
+    start at the settle horizon: deletions before the first sync concern rows
+    the client never had. At most ``limit`` rows of each kind are returned;
+    ``has_more`` tells the client to call again straight away.
+    """
+    limit = limit or settings.API_PAGE_SIZE
+    horizon = timezone.now() - timedelta(seconds=settings.LEAD_CHANGES_SETTLE_SECONDS)
+    if since:
+        updated_position, deleted_position = decode_change_cursor(since)
+        retention = timedelta(days=settings.LEAD_TOMBSTONE_RETENTION_DAYS)
+        if deleted_position[0] < timezone.now() - retention:
+            raise CursorExpired()
+    else:
+        updated_position, deleted_position = (EPOCH, 0), (horizon, 0)
+
+    leads = list(
+        Lead.objects.filter(owner_id=owner_id, updated_at__lte=horizon)
+        .filter(_after("updated_at", updated_position))
+        .order_by("updated_at", "id")[: limit + 1]
+    )
+    tombstones = list(
+        LeadTombstone.objects.filter(owner_id=owner_id, deleted_at__lte=horizon)
+        .filter(_after("deleted_at", deleted_position))
+        .order_by("deleted_at", "id")
+        .values_list("id", "lead_id", "deleted_at")[: limit + 1]
+    )
+    has_more = len(leads) > limit or len(tombstones) > limit
+    leads, tombstones = leads[:limit], tombstones[:limit]
+
+    if leads:
+        updated_position = (leads[-1].updated_at, leads[-1].id)
+    if tombstones:
+        tombstone_id, _, deleted_at = tombstones[-1]
+        deleted_position = (deleted_at, tombstone_id)
+    else:
+        # Nothing was deleted up to the horizon; moving there keeps an idle
+        # cursor from ageing past the tombstone retention window.
+        deleted_position = (horizon, 0)
+
+    return {
+        "changed": leads,
+        "deleted": [lead_id for _, lead_id, _ in tombstones],
+        "cursor": encode_change_cursor(updated_position, deleted_position),
+        "has_more": has_more,
+    }
+
+
+def prune_tombstones(days=None):
+    days = settings.LEAD_TOMBSTONE_RETENTION_DAYS if days is None else days
+    cutoff = timezone.now() - timedelta(days=days)
+    return LeadTombstone.objects.filter(deleted_at__lt=cutoff).delete()[0]
@@ -0,0 +1,60 @@
+"""
+Columnar lead payloads for bulk reads.
+
+Instead of one object per lead (every key repeated on every row) the payload
+carries one array per field. ``industry``, ``location`` and ``source`` have
+few distinct values, so they are dictionary encoded: a list of the distinct
+values plus one small integer code per row::
+
+    {
+        "count": 2,
+        "fields": ["id", "industry"],
+        "columns": {
+            "id": [7, 6],
+            "industry": {"dictionary": ["Tech"], "codes": [0, 0]},
+        },
+    }
+
+Paginated responses keep ``next`` and ``next_cursor`` next to the columns.
+"""
+
+DICTIONARY_FIELDS = frozenset(("industry", "location", "source"))
+
+
+def dictionary_encode(values):
+    index = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    return {"dictionary": list(index), "codes": codes}
+
+
+def encode_columns(rows, fields):
+    """Build the columnar payload from row tuples ordered like ``fields``."""
+    rows = rows if isinstance(rows, list) else list(rows)
+    columns = {}
+    transposed = zip(*rows) if rows else ([] for _ in fields)
+    for field, values in zip(fields, transposed):
+        values = list(values)
+        columns[field] = dictionary_encode(values) if field in DICTIONARY_FIELDS else values
+    return {"count": len(rows), "fields": list(fields), "columns": columns}
+
+
+def columnar_from_dicts(rows):
+    """Columnar payload for the dicts the JSON views already produce."""
+    fields = list(rows[0]) if rows else []
+    return encode_columns([tuple(row.values()) for row in rows], fields)
+
+
+def to_columnar(data):
+    """
+    Convert a lead list response body to columns.
+
+    Lists and paginated ``{"results": [...]}`` bodies are converted; anything
+    else (error details, an already columnar payload) passes through.
+    """
+    if isinstance(data, list):
+        return columnar_from_dicts(data)
+    if isinstance(data, dict) and isinstance(data.get("results"), list):
+        payload = {key: value for key, value in data.items() if key != "results"}
+        payload.update(columnar_from_dicts(data["results"]))
+        return payload
+    return data
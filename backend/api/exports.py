@@ -0,0 +1,88 @@
+import csv
+import json
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from .representations import DATETIME_FIELDS, LEAD_FIELDS, format_datetime, output_timezone
+
+# Column order of the CSV download; unchanged from the original export.
+CSV_FIELDS = ["name", "industry", "location", "email", "phone", "website", "source", "email_unlocked", "phone_unlocked"]
+# Keys of a JSON lead, matching LeadSerializer.
+JSON_FIELDS = list(LEAD_FIELDS)
+
+
+class Echo:
+    """File-like object whose ``write`` hands the line back instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, fields):
+    """Stream tuples straight from the cursor; no model instances are built."""
+    return queryset.values_list(*fields).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+def iter_formatted_rows(queryset, fields):
+    """Like :func:`iter_rows` with datetime columns formatted as in the JSON API."""
+    positions = [position for position, field in enumerate(fields) if field in DATETIME_FIELDS]
+    if not positions:
+        yield from iter_rows(queryset, fields)
+        return
+    tz = output_timezone()
+    for row in iter_rows(queryset, fields):
+        row = list(row)
+        for position in positions:
+            row[position] = format_datetime(row[position], tz)
+        yield row
+
+
+async def aiter_formatted_rows(queryset, fields):
+    """Async :func:`iter_formatted_rows`, for streaming responses served by ASGI."""
+    datetime_fields = DATETIME_FIELDS.intersection(fields)
+    tz = output_timezone()
+    # values(), not values_list(): the tuple iterable runs its query as soon as
+    # it is created, which aiterator() does on the event loop.
+    async for row in queryset.values(*fields).aiterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        for field in datetime_fields:
+            row[field] = format_datetime(row[field], tz)
+        yield [row[field] for field in fields]
+
+
+def iter_csv(queryset, fields=CSV_FIELDS):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in iter_formatted_rows(queryset, fields):
+        yield writer.writerow(row)
+
+
+async def aiter_csv(queryset, fields=CSV_FIELDS):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    async for row in aiter_formatted_rows(queryset, fields):
+        yield writer.writerow(row)
+
+
+def iter_ndjson(queryset, fields=JSON_FIELDS):
+    for row in iter_formatted_rows(queryset, fields):
+        yield json.dumps(dict(zip(fields, row))) + "\n"
+
+
+async def aiter_ndjson(queryset, fields=JSON_FIELDS):
+    async for row in aiter_formatted_rows(queryset, fields):
+        yield json.dumps(dict(zip(fields, row))) + "\n"
+
+
+def streaming_csv_response(queryset, fields=CSV_FIELDS, filename="leads.csv", asynchronous=False):
+    rows = aiter_csv(queryset, fields) if asynchronous else iter_csv(queryset, fields)
+    response = StreamingHttpResponse(rows, content_type="text/csv")
+    response["Content-Disposition"] = f"attachment; filename={filename}"
+    return response
+
+
+def streaming_ndjson_response(queryset, fields=JSON_FIELDS, filename="leads.ndjson", asynchronous=False):
+    rows = aiter_ndjson(queryset, fields) if asynchronous else iter_ndjson(queryset, fields)
+    response = StreamingHttpResponse(rows, content_type="application/x-ndjson")
+    response["Content-Disposition"] = f"attachment; filename={filename}"
+    return response
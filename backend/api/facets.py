@@ -0,0 +1,52 @@
+"""
+Facet counts for the filter sidebar, cached per owner and data version.
+
+The cache key carries the owner's ``data_version``, which every lead write
+bumps in its own transaction (api.versioning). Counts cached before a write
+are never read again once it commits, in this process or any other, so a
+per-process cache is safe; ``FACET_CACHE_TIMEOUT`` only bounds how long
+unreachable entries take memory.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Lead
+from .versioning import current_data_version
+
+FACET_FIELDS = ("industry", "location", "source")
+
+
+def facet_cache_key(owner_id, version):
+    return f"lead-facets:{owner_id}:{version}"
+
+
+def compute_lead_facets(owner_id):
+    leads = Lead.objects.filter(owner_id=owner_id)
+    facets = {}
+    for field in FACET_FIELDS:
+        rows = (
+            leads.values(field)
+            .annotate(count=Count("id"))
+            .order_by("-count", field)[: settings.FACET_MAX_VALUES]
+        )
+        facets[field] = [{"value": row[field], "count": row["count"]} for row in rows]
+    totals = leads.aggregate(
+        total=Count("id"),
+        email_unlocked=Count("id", filter=Q(email_unlocked=True)),
+        phone_unlocked=Count("id", filter=Q(phone_unlocked=True)),
+    )
+    facets["total"] = totals["total"]
+    facets["unlocked"] = {"email": totals["email_unlocked"], "phone": totals["phone_unlocked"]}
+    return facets
+
+
+def get_lead_facets(owner_id):
+    """Facet counts for the owner's leads; a cache hit costs the data version lookup."""
+    key = facet_cache_key(owner_id, current_data_version(owner_id))
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_lead_facets(owner_id)
+        cache.set(key, facets, settings.FACET_CACHE_TIMEOUT)
+    return facets
@@ -0,0 +1,103 @@
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+
+from .models import SavedFilter
+
+# Saved filter criteria keys (see client FilterCriteria) mapped to Lead columns.
+# "tags" is UI-only today and has no column to filter on.
+CRITERIA_FIELDS = {
+    "countries": "location",
+    "industries": "industry",
+}
+
+LIST_PARAMS = ("industry", "location", "source")
+BOOLEAN_PARAMS = ("email_unlocked", "phone_unlocked")
+TRUE_VALUES = {"1", "true", "yes"}
+FALSE_VALUES = {"0", "false", "no"}
+
+
+def _parse_bool(name, raw):
+    value = raw.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValidationError({name: "Expected true or false."})
+
+
+def _parse_timestamp(name, raw, end_of_day=False):
+    value = parse_datetime(raw)
+    if value is None:
+        day = parse_date(raw)
+        if day is None:
+            raise ValidationError({name: "Expected an ISO 8601 date or datetime."})
+        value = datetime.combine(day, time.max if end_of_day else time.min)
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def get_saved_filter_lookups(user, filter_id):
+    """Translate a SavedFilter's stored criteria into ``Lead`` lookups."""
+    try:
+        saved = SavedFilter.objects.only("criteria").get(id=filter_id, owner=user)
+    except (SavedFilter.DoesNotExist, ValueError):
+        raise NotFound("Saved filter not found")
+
+    lookups = {}
+    criteria = saved.criteria if isinstance(saved.criteria, dict) else {}
+    for key, field in CRITERIA_FIELDS.items():
+        values = [value for value in criteria.get(key) or [] if isinstance(value, str) and value]
+        if values:
+            lookups[f"{field}__in"] = values
+    return lookups
+
+
+def get_lead_filter_lookups(request):
+    """
+    Compile the lead filter query params into ORM lookups.
+
+    Supports ``filter=<saved filter id>`` plus ad-hoc ``industry``, ``location``
+    and ``source`` (repeatable), ``email_unlocked``/``phone_unlocked`` and a
+    ``created_after``/``created_before`` range. Every condition is ANDed and
+    scoped under ``owner`` so the composite ``(owner, ...)`` indexes apply.
+    """
+    params = request.query_params
+    lookups = {}
+
+    filter_id = params.get("filter")
+    if filter_id:
+        lookups.update(get_saved_filter_lookups(request.user, filter_id))
+
+    for name in LIST_PARAMS:
+        values = [value for value in params.getlist(name) if value]
+        if not values:
+            continue
+        existing = lookups.get(f"{name}__in")
+        if existing is not None:
+            # Ad-hoc params narrow a saved filter rather than widening it.
+            values = [value for value in values if value in existing]
+        lookups[f"{name}__in"] = values
+
+    for name in BOOLEAN_PARAMS:
+        raw = params.get(name)
+        if raw not in (None, ""):
+            lookups[name] = _parse_bool(name, raw)
+
+    created_after = params.get("created_after")
+    if created_after:
+        lookups["created_at__gte"] = _parse_timestamp("created_after", created_after)
+    created_before = params.get("created_before")
+    if created_before:
+        lookups["created_at__lte"] = _parse_timestamp("created_before", created_before, end_of_day=True)
+
+    return lookups
+
+
+def filter_leads(queryset, request):
+    """Apply :func:`get_lead_filter_lookups` to a lead queryset."""
+    lookups = get_lead_filter_lookups(request)
+    return queryset.filter(**lookups) if lookups else queryset
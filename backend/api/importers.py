@@ -0,0 +1,209 @@
+import csv
+import io
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import ImportJob, Lead, lead_dedup_key
+from .serializers import LeadSerializer
+from .versioning import leads_changed
+
+IMPORT_COLUMNS = ("name", "industry", "location", "email", "phone", "website", "source")
+IMPORT_MODES = tuple(mode for mode, _ in ImportJob.MODE_CHOICES)
+
+
+def get_import_mode(request):
+    """Read ``?mode=skip|update|insert`` (default ``skip``) for an import request."""
+    mode = request.query_params.get("mode") or ImportJob.MODE_SKIP
+    if mode not in IMPORT_MODES:
+        raise ValidationError({"mode": f"Expected one of: {', '.join(IMPORT_MODES)}."})
+    return mode
+
+
+def iter_csv_rows(text_stream, defaults=None):
+    """
+    Yield one dict per CSV data row, reading ``text_stream`` incrementally.
+
+    Header names are matched case-insensitively against the importable lead
+    columns. Unknown columns are ignored, and empty cells are left out so the
+    serializer's required-field checks report them.
+    """
+    reader = csv.reader(text_stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [(position, name.strip().lower()) for position, name in enumerate(header)]
+    columns = [(position, name) for position, name in columns if name in IMPORT_COLUMNS]
+    for cells in reader:
+        if not any(cells):
+            continue
+        row = dict(defaults or {})
+        for position, name in columns:
+            if position < len(cells) and cells[position] != "":
+                row[name] = cells[position]
+        yield row
+
+
+def open_text_upload(upload, encoding="utf-8-sig"):
+    """Wrap an uploaded file in a text stream without reading it into memory."""
+    upload.seek(0)
+    return io.TextIOWrapper(upload.file, encoding=encoding, errors="replace", newline="")
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class LeadImporter:
+    """
+    Validate and insert lead rows in fixed-size batches.
+
+    One serializer instance validates every row (building a serializer per row
+    dominates the old import cost) and each batch lands with a single
+    ``bulk_create``. Invalid rows are skipped and reported by their position
+    in the input. The caller owns the transaction: wrap :meth:`import_rows` in
+    ``transaction.atomic()`` for all-or-nothing writes.
+
+    Rows whose dedup key (see :func:`api.models.lead_dedup_key`) matches an
+    existing lead, or an earlier row of the same import, are duplicates. In
+    ``skip`` mode they are dropped, in ``update`` mode their columns are
+    written onto the existing lead, and ``insert`` mode keeps the old
+    insert-everything behaviour. Collisions are resolved with one
+    ``dedup_key IN (...)`` query per batch.
+    """
+
+    def __init__(self, owner, batch_size=None, max_reported_errors=None, mode=ImportJob.MODE_SKIP):
+        self.owner = owner
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.max_reported_errors = max_reported_errors or settings.IMPORT_MAX_REPORTED_ERRORS
+        self.mode = mode
+        self.validator = LeadSerializer()
+        self.processed = 0
+        self.created = 0
+        self.updated = 0
+        self.duplicates = 0
+        self.error_count = 0
+        self.errors = []
+
+    def record_error(self, index, detail):
+        self.error_count += 1
+        if len(self.errors) < self.max_reported_errors:
+            self.errors.append({"index": index, "errors": detail})
+
+    def validate_row(self, index, row):
+        if not isinstance(row, dict):
+            self.record_error(index, {"non_field_errors": ["Expected an object."]})
+            return None
+        try:
+            return self.validator.run_validation(row)
+        except ValidationError as exc:
+            self.record_error(index, exc.detail)
+            return None
+
+    def resolve_duplicates(self, rows):
+        """
+        Split validated rows into rows to insert and updates for existing leads.
+
+        Returns ``(new_rows, updates)`` where ``updates`` maps an existing lead
+        id to the columns to write onto it.
+        """
+        keyed = [(lead_dedup_key(data.get("email"), data.get("phone")), data) for data in rows]
+        keys = {key for key, _ in keyed if key}
+        existing = {}
+        if keys:
+            matches = Lead.objects.filter(owner=self.owner, dedup_key__in=keys).order_by("id")
+            for key, lead_id in matches.values_list("dedup_key", "id"):
+                existing.setdefault(key, lead_id)
+
+        new_rows, updates, pending = [], {}, {}
+        for key, data in keyed:
+            if not key:
+                new_rows.append(data)
+            elif key in existing:
+                self.duplicates += 1
+                if self.mode == ImportJob.MODE_UPDATE:
+                    updates.setdefault(existing[key], {}).update(data)
+            elif key in pending:
+                # Repeated within this batch: merge into the row being inserted.
+                self.duplicates += 1
+                if self.mode == ImportJob.MODE_UPDATE:
+                    pending[key].update(data)
+            else:
+                pending[key] = data
+                new_rows.append(data)
+        return new_rows, updates
+
+    def apply_updates(self, updates):
+        leads = Lead.objects.filter(owner=self.owner).in_bulk(list(updates))
+        now = timezone.now()
+        fields = {"dedup_key", "updated_at"}
+        for lead_id, data in updates.items():
+            lead = leads[lead_id]
+            for name, value in data.items():
+                setattr(lead, name, value)
+            lead.dedup_key = lead_dedup_key(lead.email, lead.phone)
+            lead.updated_at = now
+            fields.update(data)
+        Lead.objects.bulk_update(leads.values(), sorted(fields), batch_size=self.batch_size)
+        return len(leads)
+
+    def import_batch(self, indexed_rows):
+        rows = []
+        for index, row in indexed_rows:
+            data = self.validate_row(index, row)
+            if data is not None:
+                rows.append(data)
+        self.processed += len(indexed_rows)
+        return self.write_rows(rows)
+
+    def write_rows(self, rows):
+        """Insert (or, by mode, merge) rows that have already been validated."""
+        updates = {}
+        if self.mode != ImportJob.MODE_INSERT:
+            rows, updates = self.resolve_duplicates(rows)
+
+        leads = [
+            Lead(owner=self.owner, dedup_key=lead_dedup_key(data.get("email"), data.get("phone")), **data)
+            for data in rows
+        ]
+        if leads:
+            Lead.objects.bulk_create(leads, batch_size=self.batch_size)
+        if updates:
+            self.updated += self.apply_updates(updates)
+        if leads or updates:
+            leads_changed(self.owner.id)
+        self.created += len(leads)
+        return leads
+
+    def import_rows(self, rows, atomic_batches=False, progress=None):
+        """
+        Consume ``rows`` lazily, one batch at a time, and return the summary.
+
+        With ``atomic_batches`` every batch commits on its own, so a very large
+        stream keeps what it has written if it fails part way through.
+        ``progress`` is called with the importer after every batch.
+        """
+        for batch in batched(enumerate(rows), self.batch_size):
+            if atomic_batches:
+                with transaction.atomic():
+                    self.import_batch(batch)
+            else:
+                self.import_batch(batch)
+            if progress is not None:
+                progress(self)
+        return self.summary()
+
+    def summary(self):
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "updated": self.updated,
+            "duplicates": self.duplicates,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
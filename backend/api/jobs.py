@@ -0,0 +1,168 @@
+import io
+import json
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .importers import LeadImporter, iter_csv_rows
+from .models import ImportJob
+
+TRUE_VALUES = {"1", "true", "yes"}
+
+
+def wants_background(request):
+    """True when the client asked for a queued import (``?async=1``)."""
+    return request.query_params.get("async", "").lower() in TRUE_VALUES
+
+
+def _spool_path(suffix):
+    spool_dir = Path(settings.IMPORT_JOB_DIR)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    return spool_dir / f"{uuid.uuid4().hex}.{suffix}"
+
+
+def enqueue_rows(owner, rows, mode=ImportJob.MODE_SKIP):
+    """Queue already-parsed rows, spooled to disk as newline-delimited JSON."""
+    path = _spool_path(ImportJob.FORMAT_NDJSON)
+    with path.open("w", encoding="utf-8") as spool:
+        for row in rows:
+            spool.write(json.dumps(row))
+            spool.write("\n")
+    return ImportJob.objects.create(
+        owner=owner,
+        input_format=ImportJob.FORMAT_NDJSON,
+        input_path=str(path),
+        mode=mode,
+        total_bytes=path.stat().st_size,
+    )
+
+
+def enqueue_upload(owner, upload, mode=ImportJob.MODE_SKIP):
+    """Queue an uploaded CSV, copied to the spool directory chunk by chunk."""
+    path = _spool_path(ImportJob.FORMAT_CSV)
+    with path.open("wb") as spool:
+        for chunk in upload.chunks():
+            spool.write(chunk)
+    return ImportJob.objects.create(
+        owner=owner,
+        input_format=ImportJob.FORMAT_CSV,
+        input_path=str(path),
+        mode=mode,
+        total_bytes=path.stat().st_size,
+    )
+
+
+def enqueue_csv_file(owner, path, row_defaults=None, mode=ImportJob.MODE_SKIP):
+    """Queue a CSV that already lives on the server; the file is left in place."""
+    path = Path(path)
+    return ImportJob.objects.create(
+        owner=owner,
+        input_format=ImportJob.FORMAT_CSV,
+        input_path=str(path),
+        delete_input=False,
+        row_defaults=row_defaults or {},
+        mode=mode,
+        total_bytes=path.stat().st_size,
+    )
+
+
+def claim_jobs(limit):
+    """
+    Move up to ``limit`` pending jobs to running and return their ids.
+
+    The status check in the UPDATE makes the claim atomic, so several workers
+    can poll the same table without picking up the same job twice.
+    """
+    claimed = []
+    candidates = ImportJob.objects.filter(status=ImportJob.STATUS_PENDING).order_by("created_at", "id")
+    for job_id in candidates.values_list("id", flat=True)[:limit]:
+        updated = ImportJob.objects.filter(id=job_id, status=ImportJob.STATUS_PENDING).update(
+            status=ImportJob.STATUS_RUNNING, started_at=timezone.now(), updated_at=timezone.now()
+        )
+        if updated:
+            claimed.append(job_id)
+    return claimed
+
+
+def fail_stale_jobs(max_age_seconds):
+    """
+    Fail running jobs whose worker stopped reporting progress.
+
+    They are not re-queued: batches already committed would be imported twice.
+    """
+    cutoff = timezone.now() - timedelta(seconds=max_age_seconds)
+    return ImportJob.objects.filter(status=ImportJob.STATUS_RUNNING, updated_at__lt=cutoff).update(
+        status=ImportJob.STATUS_FAILED,
+        detail="Worker stopped reporting progress",
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+    )
+
+
+def _iter_ndjson(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def run_import_job(job_id):
+    """
+    Execute one claimed job, writing progress after every batch.
+
+    Runs inside worker processes, so it only takes the id and loads
+    everything else from the database.
+    """
+    job = ImportJob.objects.select_related("owner").get(id=job_id)
+    importer = LeadImporter(job.owner, mode=job.mode)
+    path = Path(job.input_path)
+
+    try:
+        with path.open("rb") as raw:
+
+            def report(progress):
+                ImportJob.objects.filter(id=job.id).update(
+                    bytes_read=raw.tell(),
+                    processed_rows=progress.processed,
+                    created_rows=progress.created,
+                    updated_rows=progress.updated,
+                    duplicate_rows=progress.duplicates,
+                    error_count=progress.error_count,
+                    updated_at=timezone.now(),
+                )
+
+            text = io.TextIOWrapper(raw, encoding="utf-8-sig", errors="replace", newline="")
+            if job.input_format == ImportJob.FORMAT_CSV:
+                rows = iter_csv_rows(text, defaults=job.row_defaults)
+            else:
+                rows = _iter_ndjson(text)
+            importer.import_rows(rows, atomic_batches=True, progress=report)
+            text.detach()
+    except Exception as exc:
+        # Whatever went wrong has to end up on the job row for the poller.
+        _finish(job, importer, ImportJob.STATUS_FAILED, detail=str(exc)[:255])
+        raise
+
+    _finish(job, importer, ImportJob.STATUS_SUCCEEDED, bytes_read=job.total_bytes)
+    if job.delete_input:
+        path.unlink(missing_ok=True)
+    return job.id
+
+
+def _finish(job, importer, status, detail="", **extra):
+    ImportJob.objects.filter(id=job.id).update(
+        status=status,
+        processed_rows=importer.processed,
+        created_rows=importer.created,
+        updated_rows=importer.updated,
+        duplicate_rows=importer.duplicates,
+        error_count=importer.error_count,
+        errors=importer.errors,
+        detail=detail,
+        finished_at=timezone.now(),
+        updated_at=timezone.now(),
+        **extra,
+    )
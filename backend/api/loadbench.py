@@ -0,0 +1,317 @@
+"""
+Load benchmark for the lead API's hot paths.
+
+:func:`seed` creates N users with M synthetic leads each and
+:func:`run_suite` drives the list, search, unlock, import and export
+endpoints through one or more transports, timing every request:
+
+* ``client`` - Django's test client (the WSGI handler, in process);
+* ``asgi`` - ``django.test.AsyncClient`` (the ASGI handler, in process);
+* ``server`` - a local uvicorn server on a loopback port, over real HTTP.
+  Needs ``uvicorn`` installed.
+
+Results are plain dicts (requests, errors, throughput, p50/p99/mean/max in
+milliseconds) that serialize to stable JSON, so two runs can be diffed or
+checked with :func:`compare_results`. The ``bench_lead_api`` command wraps
+this around a throwaway test database.
+"""
+
+import asyncio
+import itertools
+import json
+import math
+import platform
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+import django
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .benchdata import synthetic_rows
+from .models import Lead
+
+try:
+    import uvicorn
+except ImportError:  # optional; only the "server" transport needs it
+    uvicorn = None
+
+User = get_user_model()
+
+SCENARIOS = ("list", "search", "unlock", "import", "export")
+TRANSPORTS = ("client", "asgi", "server")
+SEARCH_TERMS = ("technology", "finance", "bench", "canada", "health")
+RESULT_VERSION = 1
+
+
+class BenchData:
+    """The seeded users, their access tokens and lead ids."""
+
+    def __init__(self, users, tokens, lead_ids, import_rows):
+        self.users = users
+        self.tokens = tokens
+        self.lead_ids = lead_ids
+        self.import_rows = import_rows
+        # Shared across transports, so a later transport does not re-unlock
+        # leads or re-import rows (cheaper no-ops) that an earlier one wrote.
+        self.unlocks = itertools.count()
+        self.imports = itertools.count()
+
+
+def seed(users, leads_per_user, import_rows=100):
+    """Create ``users`` users with ``leads_per_user`` leads each."""
+    run = uuid.uuid4().hex[:8]
+    owners = [
+        User.objects.create_user(
+            email=f"loadbench-{run}-{n}@example.com", password=None, credits=leads_per_user * 10 + 1000
+        )
+        for n in range(users)
+    ]
+    lead_ids = []
+    for owner in owners:
+        Lead.objects.bulk_create(
+            (Lead(owner=owner, **row) for row in synthetic_rows(leads_per_user)), batch_size=2000
+        )
+        lead_ids.append(list(Lead.objects.filter(owner=owner).order_by("id").values_list("id", flat=True)))
+    tokens = [str(AccessToken.for_user(owner)) for owner in owners]
+    return BenchData(owners, tokens, lead_ids, import_rows)
+
+
+def build_request(scenario, data, iteration):
+    """``(method, path, json body or None, token)`` for one request of ``scenario``."""
+    user = iteration % len(data.users)
+    token = data.tokens[user]
+    if scenario == "list":
+        return "GET", "/api/leads/?page_size=50", None, token
+    if scenario == "search":
+        return "GET", f"/api/leads/search/?q={SEARCH_TERMS[iteration % len(SEARCH_TERMS)]}", None, token
+    if scenario == "unlock":
+        # Walk every user's leads so requests pay for a fresh unlock until they run out.
+        position, user = divmod(next(data.unlocks), len(data.users))
+        ids = data.lead_ids[user]
+        lead_id = ids[position % len(ids)]
+        return "POST", "/api/leads/unlock/", {"lead_id": lead_id, "type": "email"}, data.tokens[user]
+    if scenario == "import":
+        batch = next(data.imports)
+        rows = [
+            {**row, "email": f"import{batch}-{n}@example.com", "phone": f"556-{batch:04d}{n:05d}"}
+            for n, row in enumerate(synthetic_rows(data.import_rows))
+        ]
+        return "POST", "/api/leads/import/", {"leads": rows}, token
+    if scenario == "export":
+        return "GET", "/api/leads/export/?format=csv", None, token
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+class ClientTransport:
+    name = "client"
+    is_async = False
+
+    def __init__(self):
+        self.client = APIClient()
+
+    def request(self, method, path, body, token):
+        response = self.client.generic(
+            method,
+            path,
+            json.dumps(body) if body is not None else "",
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class ASGITransport:
+    name = "asgi"
+    is_async = True
+
+    def __init__(self):
+        self.client = AsyncClient()
+
+    async def request(self, method, path, body, token):
+        response = await self.client.generic(
+            method,
+            path,
+            json.dumps(body) if body is not None else "",
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        if response.streaming:
+            if response.is_async:
+                async for _ in response.streaming_content:
+                    pass
+            else:
+                # A synchronous iterator queries the database as it goes.
+                await sync_to_async(b"".join)(response.streaming_content)
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class ServerTransport:
+    """Serve ``config.asgi`` with uvicorn from a background thread."""
+
+    name = "server"
+    is_async = False
+
+    def __init__(self):
+        if uvicorn is None:
+            raise RuntimeError("The server transport needs uvicorn (pip install uvicorn)")
+        from config.asgi import application
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(("127.0.0.1", 0))
+        host, port = self.socket.getsockname()
+        self.base_url = f"http://{host}:{port}"
+        self.server = uvicorn.Server(uvicorn.Config(application, lifespan="off", log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, kwargs={"sockets": [self.socket]}, daemon=True)
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError("uvicorn did not start")
+            time.sleep(0.01)
+
+    def request(self, method, path, body, token):
+        payload = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=payload,
+            method=method,
+            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as exc:
+            return exc.code
+
+    def close(self):
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+        self.socket.close()
+
+
+TRANSPORT_CLASSES = {cls.name: cls for cls in (ClientTransport, ASGITransport, ServerTransport)}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(transport, scenario, latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        "transport": transport,
+        "scenario": scenario,
+        "requests": count,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "mean_ms": round(sum(latencies) / count * 1000, 3) if count else 0.0,
+        "max_ms": round(latencies[-1] * 1000, 3) if count else 0.0,
+    }
+
+
+def _measure_sync(transport, scenario, data, requests, warmup):
+    for iteration in range(warmup):
+        transport.request(*build_request(scenario, data, iteration))
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for iteration in range(warmup, warmup + requests):
+        call = build_request(scenario, data, iteration)
+        sent = time.perf_counter()
+        status_code = transport.request(*call)
+        latencies.append(time.perf_counter() - sent)
+        errors += status_code >= 400
+    return latencies, errors, time.perf_counter() - started
+
+
+async def _measure_async(transport, scenario, data, requests, warmup):
+    for iteration in range(warmup):
+        await transport.request(*build_request(scenario, data, iteration))
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for iteration in range(warmup, warmup + requests):
+        call = build_request(scenario, data, iteration)
+        sent = time.perf_counter()
+        status_code = await transport.request(*call)
+        latencies.append(time.perf_counter() - sent)
+        errors += status_code >= 400
+    return latencies, errors, time.perf_counter() - started
+
+
+def run_suite(data, transports=TRANSPORTS[:2], scenarios=SCENARIOS, requests=50, warmup=5):
+    """Run every scenario over every transport and return the result document."""
+    results = []
+    for name in transports:
+        transport = TRANSPORT_CLASSES[name]()
+        try:
+            for scenario in scenarios:
+                if transport.is_async:
+                    measured = asyncio.run(_measure_async(transport, scenario, data, requests, warmup))
+                else:
+                    measured = _measure_sync(transport, scenario, data, requests, warmup)
+                results.append(summarize(name, scenario, *measured))
+        finally:
+            transport.close()
+    return {
+        "version": RESULT_VERSION,
+        "environment": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+        },
+        "parameters": {
+            "users": len(data.users),
+            "leads_per_user": len(data.lead_ids[0]) if data.lead_ids else 0,
+            "import_rows": data.import_rows,
+            "requests": requests,
+            "warmup": warmup,
+        },
+        "results": results,
+    }
+
+
+def compare_results(current, baseline, max_regression=0.2):
+    """
+    Return a line per (transport, scenario) whose p50 or p99 latency grew by
+    more than ``max_regression`` (0.2 = 20%) over ``baseline``.
+    """
+    previous = {(row["transport"], row["scenario"]): row for row in baseline.get("results", [])}
+    regressions = []
+    for row in current["results"]:
+        before = previous.get((row["transport"], row["scenario"]))
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            if before[metric] and row[metric] > before[metric] * (1 + max_regression):
+                change = row[metric] / before[metric] - 1
+                regressions.append(
+                    f"{row['transport']}/{row['scenario']} {metric}: "
+                    f"{before[metric]:.3f} -> {row[metric]:.3f} (+{change:.0%})"
+                )
+    return regressions
@@ -0,0 +1,87 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, override_settings
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.stripe_stub import FakeStripeServer
+
+User = get_user_model()
+
+CHECKOUT = {"amount": 500, "credits": 50}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare checkout throughput against a local fake Stripe with a fixed response delay: the sync "
+        "view on a pool of WSGI worker threads against the async view on one ASGI event loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--delay", type=float, default=0.2, help="Seconds the fake Stripe takes to answer.")
+        parser.add_argument("--wsgi-threads", type=int, default=8, help="Sync workers, like gunicorn --threads.")
+        parser.add_argument("--concurrency", type=int, default=100, help="In-flight requests on the event loop.")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1:
+            raise CommandError("--requests must be at least 1")
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            user = User.objects.create_user(email="bench-checkout@example.com", password=None)
+            token = str(AccessToken.for_user(user))
+            with FakeStripeServer(delay=options["delay"]) as fake, override_settings(
+                STRIPE_SECRET_KEY="sk_test_bench", STRIPE_API_BASE=fake.base_url
+            ):
+                wsgi = self.bench_wsgi(token, options["requests"], options["wsgi_threads"])
+                asgi = asyncio.run(self.bench_asgi(token, options["requests"], options["concurrency"]))
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.report(f"wsgi x{options['wsgi_threads']}", options["requests"], *wsgi)
+        self.report(f"asgi x{options['concurrency']}", options["requests"], *asgi)
+        self.stdout.write(self.style.SUCCESS(f"speedup  {wsgi[0] / asgi[0]:.1f}x"))
+
+    def report(self, label, requests, elapsed, errors):
+        self.stdout.write(
+            f"{label:<10} {requests:>6} checkouts  {elapsed:8.3f}s  {requests / elapsed:9.1f} req/s  errors {errors}"
+        )
+
+    def bench_wsgi(self, token, requests, threads):
+        local = threading.local()
+
+        def checkout(_):
+            client = getattr(local, "client", None)
+            if client is None:
+                client = local.client = APIClient()
+                client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+            return client.post("/api/credits/checkout/", CHECKOUT, format="json").status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            statuses = list(pool.map(checkout, range(requests)))
+        return time.perf_counter() - started, sum(code != 200 for code in statuses)
+
+    async def bench_asgi(self, token, requests, concurrency):
+        client = AsyncClient()
+        headers = {"Authorization": f"Bearer {token}"}
+        slots = asyncio.Semaphore(concurrency)
+
+        async def checkout():
+            async with slots:
+                response = await client.post(
+                    "/api/async/credits/checkout/", CHECKOUT, content_type="application/json", headers=headers
+                )
+                return response.status_code
+
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*(checkout() for _ in range(requests)))
+        return time.perf_counter() - started, sum(code != 200 for code in statuses)
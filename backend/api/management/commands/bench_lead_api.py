@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from api.loadbench import SCENARIOS, TRANSPORTS, compare_results, run_suite, seed, uvicorn
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed N users x M leads into a throwaway test database and measure throughput and p50/p99 "
+        "latency of list, search, unlock, import and export. Prints the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=5)
+        parser.add_argument("--leads", type=int, default=2000, help="Leads per user.")
+        parser.add_argument("--requests", type=int, default=100, help="Measured requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--import-rows", type=int, default=100, help="Rows per import request.")
+        parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Repeatable; default: all.")
+        parser.add_argument(
+            "--transport", action="append", choices=TRANSPORTS, help="Repeatable; default: client and asgi."
+        )
+        parser.add_argument("--output", help="Write the JSON here instead of stdout.")
+        parser.add_argument("--baseline", help="Earlier JSON output; fail if p50/p99 regressed.")
+        parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed slowdown, 0.2 = 20%%.")
+
+    def handle(self, *args, **options):
+        transports = options["transport"] or list(TRANSPORTS[:2])
+        if "server" in transports and uvicorn is None:
+            raise CommandError("The server transport needs uvicorn (pip install uvicorn)")
+        if options["users"] < 1 or options["leads"] < 1:
+            raise CommandError("--users and --leads must be at least 1")
+        baseline = json.loads(Path(options["baseline"]).read_text()) if options["baseline"] else None
+
+        # The same throwaway database the test runner uses: committed, so the
+        # in-process ASGI handler and the server thread see the seeded rows.
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            data = seed(options["users"], options["leads"], options["import_rows"])
+            report = run_suite(
+                data,
+                transports=transports,
+                scenarios=options["scenario"] or SCENARIOS,
+                requests=options["requests"],
+                warmup=options["warmup"],
+            )
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, indent=2, sort_keys=True) + "\n"
+        if options["output"]:
+            Path(options["output"]).write_text(output)
+        else:
+            self.stdout.write(output, ending="")
+
+        if baseline is not None:
+            regressions = compare_results(report, baseline, options["max_regression"])
+            if regressions:
+                raise CommandError("Latency regressions:\n" + "\n".join(regressions))
+            self.stderr.write(self.style.SUCCESS("No regressions against the baseline"))
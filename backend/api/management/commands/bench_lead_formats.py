@@ -0,0 +1,77 @@
+import gzip
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.benchdata import synthetic_rows
+from api.columnar import encode_columns
+from api.exports import iter_formatted_rows
+from api.models import Lead
+from api.renderers import ColumnarJSONRenderer, MessagePackColumnarRenderer, msgpack
+from api.representations import LEAD_FIELDS, serialize_leads
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Compare size and encode time of JSON lead lists with the columnar JSON and MessagePack formats."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+        parser.add_argument("--repeat", type=int, default=3, help="Best of N runs per measurement.")
+
+    def measure(self, func, repeat):
+        best, body = float("inf"), b""
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = func()
+            best = min(best, time.perf_counter() - started)
+        return best, body
+
+    def bench(self, count, repeat):
+        formats = [
+            ("json", lambda leads: JSONRenderer().render(serialize_leads(leads))),
+            (
+                "columnar",
+                lambda leads: ColumnarJSONRenderer().render(
+                    encode_columns(iter_formatted_rows(leads, LEAD_FIELDS), LEAD_FIELDS)
+                ),
+            ),
+        ]
+        if msgpack is not None:
+            formats.append(
+                (
+                    "msgpack",
+                    lambda leads: MessagePackColumnarRenderer().render(
+                        encode_columns(iter_formatted_rows(leads, LEAD_FIELDS), LEAD_FIELDS)
+                    ),
+                )
+            )
+        else:
+            self.stdout.write("msgpack is not installed; skipping the MessagePack format")
+
+        results = []
+        # Everything happens in one rolled-back transaction; nothing is left behind.
+        with transaction.atomic():
+            owner = User.objects.create_user(email=f"bench-{uuid.uuid4().hex}@example.com", password=None)
+            Lead.objects.bulk_create((Lead(owner=owner, **row) for row in synthetic_rows(count)), batch_size=2000)
+            leads = Lead.objects.filter(owner=owner).order_by("-created_at", "-id")
+            for label, render in formats:
+                elapsed, body = self.measure(lambda: render(leads), repeat)
+                results.append((label, elapsed, len(body), len(gzip.compress(body))))
+            transaction.set_rollback(True)
+
+        _, json_elapsed, json_size, _ = results[0]
+        for label, elapsed, size, gzipped in results:
+            self.stdout.write(
+                f"{count:>8} rows  {label:<9} {elapsed:7.3f}s ({json_elapsed / elapsed:4.1f}x)  "
+                f"{size / 1024:10.0f} KiB ({size / json_size:4.0%})  gzip {gzipped / 1024:8.0f} KiB"
+            )
+
+    def handle(self, *args, **options):
+        for count in options["rows"]:
+            self.bench(count, max(1, options["repeat"]))
@@ -0,0 +1,50 @@
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from api.benchdata import synthetic_rows
+from api.models import Lead
+from api.representations import serialize_leads
+from api.serializers import LeadSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Compare LeadSerializer(many=True) with the values() fast path used by the lead list and export."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+        parser.add_argument("--repeat", type=int, default=3, help="Best of N runs per measurement.")
+
+    def measure(self, func, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    def bench(self, count, repeat):
+        # Everything happens in one rolled-back transaction; nothing is left behind.
+        with transaction.atomic():
+            owner = User.objects.create_user(email=f"bench-{uuid.uuid4().hex}@example.com", password=None)
+            Lead.objects.bulk_create((Lead(owner=owner, **row) for row in synthetic_rows(count)), batch_size=2000)
+            leads = Lead.objects.filter(owner=owner).order_by("-created_at", "-id")
+            renderer = JSONRenderer()
+
+            serializer = self.measure(lambda: renderer.render(LeadSerializer(leads, many=True).data), repeat)
+            fast = self.measure(lambda: renderer.render(serialize_leads(leads)), repeat)
+            transaction.set_rollback(True)
+
+        for label, elapsed in (("serializer", serializer), ("values", fast)):
+            self.stdout.write(f"{count:>8} rows  {label:<10} {elapsed:8.3f}s  {count / elapsed:12.0f} rows/s")
+        self.stdout.write(self.style.SUCCESS(f"{count:>8} rows  speedup    {serializer / fast:.1f}x"))
+
+    def handle(self, *args, **options):
+        for count in options["rows"]:
+            self.bench(count, max(1, options["repeat"]))
@@ -0,0 +1,117 @@
+import random
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.benchdata import synthetic_rows
+from api.models import Lead, User
+from config.dbprofiles import PROFILES, apply_profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a mixed read/write workload from several threads against a scratch SQLite "
+        "database per DATABASE_PROFILE and report throughput and lock errors."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of operations that write.")
+        parser.add_argument("--leads", type=int, default=5000)
+        parser.add_argument("--profile", action="append", choices=PROFILES, help="Repeatable; default: all.")
+
+    def handle(self, *args, **options):
+        base = connections["default"].settings_dict
+        if base["ENGINE"] != "django.db.backends.sqlite3":
+            raise CommandError("This benchmark only runs against the sqlite3 backend")
+        scratch = Path(tempfile.mkdtemp(prefix="bench-sqlite-"))
+        try:
+            for profile in options["profile"] or PROFILES:
+                self.bench(base, profile, scratch, options)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    def bench(self, base, profile, scratch, options):
+        alias = f"bench_{profile.replace('-', '_')}"
+        database = apply_profile({**base, "OPTIONS": dict(base.get("OPTIONS", {}))}, profile)
+        database.update(NAME=str(scratch / f"{alias}.sqlite3"), CONN_MAX_AGE=database.get("CONN_MAX_AGE", 0))
+        connections.settings[alias] = database
+        try:
+            call_command("migrate", database=alias, verbosity=0)
+            owner = User.objects.db_manager(alias).create_user(email=f"{alias}@example.com", password=None)
+            Lead.objects.using(alias).bulk_create(
+                (Lead(owner=owner, **row) for row in synthetic_rows(options["leads"])), batch_size=2000
+            )
+            lead_ids = list(Lead.objects.using(alias).values_list("id", flat=True))
+            connections[alias].close()
+
+            totals = {"reads": 0, "writes": 0, "errors": 0}
+            lock = threading.Lock()
+            deadline = time.monotonic() + options["seconds"]
+            workers = [
+                threading.Thread(
+                    target=self.worker,
+                    args=(alias, owner.id, lead_ids, options["write_ratio"], deadline, totals, lock),
+                )
+                for _ in range(max(1, options["threads"]))
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            connections[alias].close()
+            del connections.settings[alias]
+
+        ops = totals["reads"] + totals["writes"]
+        self.stdout.write(
+            f"{profile:<13} {ops / options['seconds']:9.0f} ops/s  "
+            f"reads {totals['reads']:>7}  writes {totals['writes']:>6}  lock errors {totals['errors']:>5}"
+        )
+
+    def worker(self, alias, owner_id, lead_ids, write_ratio, deadline, totals, lock):
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        rng = random.Random()
+        connection = connections[alias]
+        try:
+            while time.monotonic() < deadline:
+                # Each iteration stands in for one request: Django checks
+                # CONN_MAX_AGE at request boundaries the same way.
+                connection.close_if_unusable_or_obsolete()
+                try:
+                    if rng.random() < write_ratio:
+                        self.write(alias, owner_id, rng.choice(lead_ids))
+                        counts["writes"] += 1
+                    else:
+                        self.read(alias, owner_id)
+                        counts["reads"] += 1
+                except OperationalError:
+                    counts["errors"] += 1
+                if not connection.settings_dict["CONN_MAX_AGE"]:
+                    connection.close()
+        finally:
+            connection.close()
+            with lock:
+                for key, value in counts.items():
+                    totals[key] += value
+
+    def read(self, alias, owner_id):
+        leads = Lead.objects.using(alias).filter(owner_id=owner_id).order_by("-created_at", "-id")
+        list(leads.values_list("id", "name", "industry")[:100])
+
+    def write(self, alias, owner_id, lead_id):
+        # Shaped like an unlock: flip a lead flag and move the balance.
+        with transaction.atomic(using=alias):
+            Lead.objects.using(alias).filter(id=lead_id).update(
+                email_unlocked=~F("email_unlocked"), updated_at=timezone.now()
+            )
+            User.objects.using(alias).filter(id=owner_id).update(credits=F("credits") + 1)
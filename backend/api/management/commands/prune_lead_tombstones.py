@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.changes import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "Delete lead tombstones older than the retention window. Run it from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.LEAD_TOMBSTONE_RETENTION_DAYS,
+            help="Keep tombstones from the last N days (defaults to LEAD_TOMBSTONE_RETENTION_DAYS).",
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones(days=max(0, options["days"]))
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} tombstone(s)"))
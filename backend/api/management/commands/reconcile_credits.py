@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.credits import iter_ledger_mismatches
+
+
+class Command(BaseCommand):
+    help = "Check every user's credits against opening balance + ledger in one streaming pass."
+
+    def handle(self, *args, **options):
+        mismatches = 0
+        for user_id, email, credits, ledger_balance in iter_ledger_mismatches():
+            mismatches += 1
+            self.stdout.write(f"{user_id}\t{email}\tcredits={credits}\tledger={ledger_balance}")
+        if mismatches:
+            raise CommandError(f"{mismatches} user(s) do not match the ledger")
+        self.stdout.write(self.style.SUCCESS("All balances match the ledger"))
@@ -0,0 +1,98 @@
+import multiprocessing
+import time
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api.jobs import claim_jobs, fail_stale_jobs, run_import_job
+
+
+def _init_process():
+    # Spawned children start from scratch; forked ones must not reuse the
+    # parent's database sockets.
+    django.setup()
+    connections.close_all()
+
+
+def _run_in_process(job_id):
+    try:
+        return run_import_job(job_id)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Process queued lead imports. The database is the queue: pending ImportJob rows are "
+        "claimed with a conditional UPDATE and run across a pool of worker processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=multiprocessing.cpu_count(),
+            help="Worker processes; 0 runs jobs inline in this process.",
+        )
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=600,
+            help="Fail running jobs that have not reported progress for this many seconds.",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is drained.")
+
+    def handle(self, *args, **options):
+        processes = max(0, options["processes"])
+        stale = fail_stale_jobs(options["stale_after"])
+        if stale:
+            self.stdout.write(self.style.WARNING(f"Marked {stale} stale job(s) as failed"))
+        if processes == 0:
+            self.run_inline(options)
+        else:
+            self.run_pool(processes, options)
+
+    def run_inline(self, options):
+        while True:
+            claimed = claim_jobs(1)
+            for job_id in claimed:
+                self.run_job(job_id)
+            if not claimed:
+                if options["once"]:
+                    return
+                time.sleep(options["poll_interval"])
+
+    def run_job(self, job_id):
+        try:
+            run_import_job(job_id)
+        except Exception as exc:
+            self.stderr.write(f"Import job {job_id} failed: {exc}")
+        else:
+            self.stdout.write(f"Import job {job_id} finished")
+
+    def run_pool(self, processes, options):
+        # Close our connections before forking so no child inherits them.
+        connections.close_all()
+        in_flight = {}
+        with multiprocessing.Pool(processes=processes, initializer=_init_process) as pool:
+            while True:
+                for job_id, result in list(in_flight.items()):
+                    if result.ready():
+                        del in_flight[job_id]
+                        try:
+                            result.get()
+                        except Exception as exc:
+                            self.stderr.write(f"Import job {job_id} failed: {exc}")
+                        else:
+                            self.stdout.write(f"Import job {job_id} finished")
+
+                free = processes - len(in_flight)
+                claimed = claim_jobs(free) if free else []
+                for job_id in claimed:
+                    in_flight[job_id] = pool.apply_async(_run_in_process, (job_id,))
+
+                if options["once"] and not in_flight and not claimed:
+                    return
+                time.sleep(options["poll_interval"])
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from api.credits import take_snapshots
+
+
+class Command(BaseCommand):
+    help = "Record ledger balance snapshots for users with new credit transactions. Run it from cron."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-transactions",
+            type=int,
+            default=100,
+            help="Only snapshot users with at least this many transactions since their last snapshot.",
+        )
+
+    def handle(self, *args, **options):
+        written = take_snapshots(min_transactions=max(1, options["min_transactions"]))
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} snapshot(s)"))
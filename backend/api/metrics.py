@@ -0,0 +1,164 @@
+"""
+Opt-in per-view request metrics, exposed as Prometheus text.
+
+``RequestMetricsMiddleware`` (enabled with ``API_METRICS_ENABLED``) records,
+for every request, under the resolved view name and HTTP method:
+
+* the number of SQL queries and the time spent in them, counted with a
+  database execute wrapper so it works with ``DEBUG`` off;
+* the time spent rendering the response body;
+* the total time spent in Django.
+
+Observations go into in-process histograms; ``/api/_metrics/`` renders them.
+A streaming response's body is produced after the middleware returns, so
+its queries are not counted. Every process keeps its own numbers.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.db import connections
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+METRICS = (
+    # (name, help, buckets, key in the per-request observation)
+    ("api_request_duration_seconds", "Time spent in Django per request.", LATENCY_BUCKETS, "duration"),
+    ("api_request_sql_queries", "SQL queries executed per request.", QUERY_COUNT_BUCKETS, "queries"),
+    ("api_request_sql_seconds", "Time spent in SQL per request.", LATENCY_BUCKETS, "sql"),
+    (
+        "api_request_serialization_seconds",
+        "Time spent rendering the response body per request.",
+        LATENCY_BUCKETS,
+        "serialization",
+    ),
+)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense; not thread-safe on its own."""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            yield bound, total
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, view, method, observation):
+        with self._lock:
+            series = self._series.get((view, method))
+            if series is None:
+                series = {key: Histogram(buckets) for _, _, buckets, key in METRICS}
+                self._series[(view, method)] = series
+            for key, value in observation.items():
+                series[key].observe(value)
+
+    def snapshot(self, view, method):
+        """``{metric key: (count, sum)}`` for one series, or None; handy in tests."""
+        with self._lock:
+            series = self._series.get((view, method))
+            if series is None:
+                return None
+            return {key: (histogram.count, histogram.sum) for key, histogram in series.items()}
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, help_text, _, key in METRICS:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (view, method), series in sorted(self._series.items()):
+                    histogram = series[key]
+                    labels = f'view="{_escape(view)}",method="{_escape(method)}"'
+                    for bound, total in histogram.cumulative():
+                        le = "+Inf" if bound == float("inf") else repr(float(bound))
+                        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {total}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum!r}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+class QueryRecorder:
+    """Database execute wrapper that counts and times the queries it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        request._metrics_render_seconds = 0.0
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = getattr(request, "resolver_match", None)
+        view = (match.view_name or match.route) if match else "unmatched"
+        registry.observe(
+            view,
+            request.method,
+            {
+                "duration": duration,
+                "queries": recorder.count,
+                "sql": recorder.seconds,
+                "serialization": request._metrics_render_seconds,
+            },
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses render right after this hook; time it to the post-render callback.
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._metrics_render_seconds = time.perf_counter() - started
+
+        response.add_post_render_callback(rendered)
+        return response
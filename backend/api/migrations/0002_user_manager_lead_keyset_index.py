@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:18
+
+import api.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", api.models.UserManager()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                fields=["owner", "created_at", "id"], name="lead_owner_created_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,78 @@
+from django.db import migrations
+
+# The index as it stood at this migration. Later migrations that rebuild
+# api_lead on SQLite (which drops its triggers) reinstall it from here, so
+# this SQL must never change; a new index layout gets a new migration.
+FTS_TABLE = "api_lead_fts"
+
+SQLITE_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON api_lead BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, industry, location, website)
+        VALUES (new.id, new.name, new.industry, new.location, new.website);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON api_lead BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, industry, location, website)
+        VALUES ('delete', old.id, old.name, old.industry, old.location, old.website);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, industry, location, website ON api_lead BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, industry, location, website)
+        VALUES ('delete', old.id, old.name, old.industry, old.location, old.website);
+        INSERT INTO {FTS_TABLE}(rowid, name, industry, location, website)
+        VALUES (new.id, new.name, new.industry, new.location, new.website);
+    END
+    """,
+)
+
+PG_VECTOR = (
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(industry, '') || ' ' "
+    "|| coalesce(location, '') || ' ' || coalesce(website, ''))"
+)
+
+
+def install_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            "name, industry, location, website, content='api_lead', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        )
+        for statement in SQLITE_TRIGGERS:
+            schema_editor.execute(statement)
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    elif vendor == "postgresql":
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS api_lead_search_gin ON api_lead USING GIN ({PG_VECTOR})")
+
+
+def drop_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for suffix in ("ai", "ad", "au"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS api_lead_search_gin")
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    drop_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_lead_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:31
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_import_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CreditSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("balance", models.IntegerField()),
+                ("last_transaction_id", models.BigIntegerField()),
+                ("as_of", models.DateTimeField()),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="credittransaction",
+            index=models.Index(
+                fields=["owner", "created_at", "id"],
+                name="credittx_owner_created_id_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="creditsnapshot",
+            name="owner",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="credit_snapshots",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="creditsnapshot",
+            index=models.Index(
+                fields=["owner", "as_of"], name="creditsnap_owner_as_of_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_credit_ledger_snapshots"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="data_version",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
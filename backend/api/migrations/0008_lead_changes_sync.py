@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:38
+
+from importlib import import_module
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+# The FTS layout of 0004, frozen there; not the live api.search module.
+install_search_index = import_module("api.migrations.0004_lead_search_index").install_search_index
+
+
+def backfill_updated_at(apps, schema_editor):
+    Lead = apps.get_model("api", "Lead")
+    Lead.objects.using(schema_editor.connection.alias).update(
+        updated_at=F("created_at")
+    )
+
+
+def reinstall_search_index(apps, schema_editor):
+    # Adding the column rebuilds api_lead on SQLite, which drops the FTS triggers.
+    install_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0007_user_data_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeadTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("lead_id", models.BigIntegerField()),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="lead",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                fields=["owner", "updated_at", "id"], name="lead_owner_updated_id_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="leadtombstone",
+            name="owner",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="lead_tombstones",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="leadtombstone",
+            index=models.Index(
+                fields=["owner", "deleted_at", "id"], name="tombstone_owner_deleted_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:48
+
+import re
+from importlib import import_module
+
+from django.db import migrations, models
+
+# The FTS layout of 0004, frozen there; not the live api.search module.
+install_search_index = import_module("api.migrations.0004_lead_search_index").install_search_index
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+def lead_dedup_key(email, phone):
+    # A copy of api.models.lead_dedup_key as of this migration.
+    email = (email or "").strip().lower()
+    if email:
+        return f"email:{email}"
+    digits = _NON_DIGITS.sub("", phone or "")
+    return f"phone:{digits}" if digits else ""
+
+
+def backfill_dedup_key(apps, schema_editor):
+    Lead = apps.get_model("api", "Lead")
+    leads = Lead.objects.using(schema_editor.connection.alias)
+    batch = []
+    for lead in leads.only("id", "email", "phone").iterator(chunk_size=2000):
+        lead.dedup_key = lead_dedup_key(lead.email, lead.phone)
+        batch.append(lead)
+        if len(batch) >= 2000:
+            leads.bulk_update(batch, ["dedup_key"])
+            batch = []
+    if batch:
+        leads.bulk_update(batch, ["dedup_key"])
+
+
+def reinstall_search_index(apps, schema_editor):
+    # Adding the column rebuilds api_lead on SQLite, which drops the FTS triggers.
+    install_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0008_lead_changes_sync"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="duplicate_rows",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="mode",
+            field=models.CharField(
+                choices=[
+                    ("skip", "Skip duplicates"),
+                    ("update", "Update duplicates"),
+                    ("insert", "Insert anyway"),
+                ],
+                default="skip",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="updated_rows",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="lead",
+            name="dedup_key",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.RunPython(backfill_dedup_key, migrations.RunPython.noop),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                fields=["owner", "dedup_key"], name="lead_owner_dedup_key_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,77 @@
+from importlib import import_module
+
+from django.db import migrations
+
+# Rebuilds the SQLite FTS table with the owner as its first, indexed column,
+# so a search intersects the caller's owner token inside FTS5 instead of
+# matching (and ranking) every tenant's rows before filtering on owner_id.
+# Postgres keeps its expression index; the owner_id filter there uses the
+# existing owner indexes. Frozen like 0004: a new layout gets a new migration.
+FTS_TABLE = "api_lead_fts"
+COLUMNS = "owner_id, name, industry, location, website"
+NEW_VALUES = "new.id, new.owner_id, new.name, new.industry, new.location, new.website"
+OLD_VALUES = "old.id, old.owner_id, old.name, old.industry, old.location, old.website"
+
+SQLITE_TRIGGERS = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON api_lead BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS}) VALUES ({NEW_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON api_lead BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS}) VALUES ('delete', {OLD_VALUES});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF owner_id, name, industry, location, website ON api_lead BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {COLUMNS}) VALUES ('delete', {OLD_VALUES});
+        INSERT INTO {FTS_TABLE}(rowid, {COLUMNS}) VALUES ({NEW_VALUES});
+    END
+    """,
+)
+
+previous = import_module("api.migrations.0004_lead_search_index")
+
+
+def drop_sqlite_index(schema_editor):
+    for suffix in ("ai", "ad", "au"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def install_search_index(schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    drop_sqlite_index(schema_editor)
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+        f"{COLUMNS}, content='api_lead', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    for statement in SQLITE_TRIGGERS:
+        schema_editor.execute(statement)
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor)
+
+
+def restore_previous(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    drop_sqlite_index(schema_editor)
+    previous.install_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0010_stripe_event"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, restore_previous),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_lead_search_owner"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="credittransaction",
+            index=models.Index(fields=["owner", "id"], name="credittx_owner_id_idx"),
+        ),
+    ]
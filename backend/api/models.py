@@ -1,16 +1,63 @@
-from django.contrib.auth.models import AbstractUser
+import re
+
+from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
 from django.utils import timezone
 
+_NON_DIGITS = re.compile(r"\D")
+
+
+def lead_dedup_key(email, phone):
+    """
+    Normalized identity of a lead within one owner's book.
+
+    The lower-cased email when there is one, otherwise the phone number's
+    digits; an empty key never matches anything.
+    """
+    email = (email or "").strip().lower()
+    if email:
+        return f"email:{email}"
+    digits = _NON_DIGITS.sub("", phone or "")
+    return f"phone:{digits}" if digits else ""
+
+
+class UserManager(BaseUserManager):
+    """Manager for the email-only user model (there is no username column)."""
+
+    use_in_migrations = True
+
+    def _create_user(self, email, password, **extra_fields):
+        if not email:
+            raise ValueError("The email address must be set")
+        user = self.model(email=self.normalize_email(email), **extra_fields)
+        user.set_password(password)
+        user.save(using=self._db)
+        return user
+
+    def create_user(self, email, password=None, **extra_fields):
+        extra_fields.setdefault("is_staff", False)
+        extra_fields.setdefault("is_superuser", False)
+        return self._create_user(email, password, **extra_fields)
+
+    def create_superuser(self, email, password=None, **extra_fields):
+        extra_fields.setdefault("is_staff", True)
+        extra_fields.setdefault("is_superuser", True)
+        return self._create_user(email, password, **extra_fields)
+
 
 class User(AbstractUser):
     username = None
     email = models.EmailField(unique=True)
     credits = models.PositiveIntegerField(default=25)
+    # Bumped on every write to the user's leads, lists or filters; the ETag
+    # of those endpoints is derived from it (see api.versioning).
+    data_version = models.PositiveBigIntegerField(default=0)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS: list[str] = []
 
+    objects = UserManager()
+
     def __str__(self) -> str:
         return self.email
 
@@ -27,11 +74,52 @@ class Lead(models.Model):
     email_unlocked = models.BooleanField(default=False)
     phone_unlocked = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now)
+    # QuerySet.update() bypasses auto_now; bulk updates must set it explicitly.
+    updated_at = models.DateTimeField(auto_now=True)
+    # Derived from email/phone by save(); bulk writers set it with lead_dedup_key().
+    dedup_key = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        indexes = [
+            # Backs keyset pagination: the list endpoint walks
+            # (created_at, id) descending within a single owner.
+            models.Index(fields=["owner", "created_at", "id"], name="lead_owner_created_id_idx"),
+            # Backs /api/leads/changes/, which walks (updated_at, id) ascending.
+            models.Index(fields=["owner", "updated_at", "id"], name="lead_owner_updated_id_idx"),
+            # Server-side filters (api.filters) always scope by owner first.
+            models.Index(fields=["owner", "industry"], name="lead_owner_industry_idx"),
+            models.Index(fields=["owner", "location"], name="lead_owner_location_idx"),
+            # Duplicate detection on import looks keys up per batch with IN (...).
+            models.Index(fields=["owner", "dedup_key"], name="lead_owner_dedup_key_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.dedup_key = lead_dedup_key(self.email, self.phone)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"email", "phone"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "dedup_key"}
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return f"{self.name} ({self.owner.email})"
 
 
+class LeadTombstone(models.Model):
+    """Records a deleted lead so delta sync clients can drop it (see api.changes)."""
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="lead_tombstones")
+    lead_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "deleted_at", "id"], name="tombstone_owner_deleted_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Lead {self.lead_id} deleted {self.deleted_at:%Y-%m-%d}"
+
+
 class SavedList(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="saved_lists")
     name = models.CharField(max_length=255)
@@ -58,5 +146,117 @@ class CreditTransaction(models.Model):
     description = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "created_at", "id"], name="credittx_owner_created_id_idx"),
+            # take_snapshots reads each owner's entries after their last snapshot.
+            models.Index(fields=["owner", "id"], name="credittx_owner_id_idx"),
+        ]
+
     def __str__(self) -> str:
         return f"{self.owner.email}: {self.amount}"
+
+
+class CreditSnapshot(models.Model):
+    """
+    Ledger balance of one user after a given CreditTransaction.
+
+    ``balance`` is the opening balance plus every transaction up to and
+    including ``last_transaction_id``. A historical balance is then the
+    nearest snapshot plus the few transactions after it, with no need to
+    replay the whole log.
+    """
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="credit_snapshots")
+    balance = models.IntegerField()
+    last_transaction_id = models.BigIntegerField()
+    as_of = models.DateTimeField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "as_of"], name="creditsnap_owner_as_of_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.owner_id} @ {self.as_of}: {self.balance}"
+
+
+class StripeEvent(models.Model):
+    """
+    A Stripe webhook event that has been processed (api.webhooks).
+
+    ``event_id`` is unique, so a redelivered event is recognised and skipped.
+    ``session_id`` is set only on events that applied credits. It is unique
+    too, so two different events for one Checkout Session (``completed`` and
+    ``async_payment_succeeded``) cannot both credit it.
+    """
+
+    event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    session_id = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    owner = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="stripe_events")
+    credits = models.PositiveIntegerField(default=0)
+    processed_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self) -> str:
+        return f"{self.event_type} {self.event_id}"
+
+
+class ImportJob(models.Model):
+    """
+    A lead import queued for ``manage.py run_import_worker``.
+
+    The database is the queue: workers claim pending rows with a conditional
+    UPDATE and write progress back after every batch.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    FORMAT_CSV = "csv"
+    FORMAT_NDJSON = "ndjson"
+    FORMAT_CHOICES = [(FORMAT_CSV, "CSV"), (FORMAT_NDJSON, "Newline-delimited JSON")]
+
+    # How rows matching an existing lead's dedup key are handled (api.importers).
+    MODE_SKIP = "skip"
+    MODE_UPDATE = "update"
+    MODE_INSERT = "insert"
+    MODE_CHOICES = [(MODE_SKIP, "Skip duplicates"), (MODE_UPDATE, "Update duplicates"), (MODE_INSERT, "Insert anyway")]
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="import_jobs")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    input_format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    input_path = models.CharField(max_length=1024)
+    delete_input = models.BooleanField(default=True)
+    row_defaults = models.JSONField(default=dict, blank=True)
+    mode = models.CharField(max_length=10, choices=MODE_CHOICES, default=MODE_SKIP)
+    total_bytes = models.PositiveBigIntegerField(default=0)
+    bytes_read = models.PositiveBigIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_rows = models.PositiveIntegerField(default=0)
+    updated_rows = models.PositiveIntegerField(default=0)
+    duplicate_rows = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    detail = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="importjob_status_created_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Import {self.pk} ({self.status})"
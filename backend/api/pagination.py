@@ -0,0 +1,152 @@
+import base64
+import binascii
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset pagination over ``(created_at, id)`` in descending order.
+
+    Instead of ``OFFSET`` the next page is selected with
+    ``WHERE (created_at, id) < (last_created_at, last_id)``, which an index on
+    ``(owner, created_at, id)`` answers in constant time no matter how deep
+    the client has paged. With ``opt_in`` set, requests that send neither
+    ``cursor`` nor ``page_size`` get the unpaginated list so existing callers
+    keep working.
+    """
+
+    opt_in = True
+    ordering_field = "created_at"
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self):
+        self.page_size = settings.API_PAGE_SIZE
+        self.max_page_size = settings.API_MAX_PAGE_SIZE
+        self.limit = self.page_size
+        self.next_position = None
+        self.base_url = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        return self.take_page(list(self.page_queryset(queryset, request)))
+
+    def is_requested(self, request):
+        params = request.query_params
+        return not self.opt_in or self.cursor_query_param in params or self.page_size_query_param in params
+
+    def page_queryset(self, queryset, request):
+        """
+        The unevaluated query for one page plus one extra row.
+
+        Split from :meth:`paginate_queryset` so async views can evaluate it
+        with the async ORM and hand the rows to :meth:`take_page`.
+        """
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        if position is not None:
+            value, pk = position
+            queryset = queryset.filter(
+                Q(**{f"{self.ordering_field}__lt": value}) | Q(**{self.ordering_field: value, "id__lt": pk})
+            )
+        queryset = queryset.order_by(f"-{self.ordering_field}", "-id")
+        # Fetch one extra row to learn whether another page exists without a COUNT(*).
+        return queryset[: self.limit + 1]
+
+    def take_page(self, rows):
+        page = rows[: self.limit]
+        if len(rows) > self.limit:
+            self.next_position = self.get_position(page[-1])
+        return page
+
+    def get_position(self, row):
+        # Rows are model instances, or dicts when the view pages a values() queryset.
+        if isinstance(row, dict):
+            return row[self.ordering_field], row["id"]
+        return getattr(row, self.ordering_field), row.pk
+
+    def get_page_size(self, request):
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.page_size
+        try:
+            size = int(raw)
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            decoded = base64.urlsafe_b64decode(padded.encode("ascii")).decode("ascii")
+            raw_value, raw_pk = decoded.rsplit("|", 1)
+            return datetime.fromisoformat(raw_value), int(raw_pk)
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def encode_cursor(position):
+        value, pk = position
+        raw = f"{value.isoformat()}|{pk}".encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def get_next_cursor(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_next_link(self):
+        cursor = self.get_next_cursor()
+        if cursor is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "next_cursor": self.get_next_cursor(),
+            "results": data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "next_cursor": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+
+class LeadPagination(KeysetPagination):
+    """Keyset pagination for ``/api/leads/``; see :class:`KeysetPagination`."""
+
+
+class CreditTransactionPagination(KeysetPagination):
+    """Always-on keyset pagination for the credit ledger, which only grows."""
+
+    opt_in = False
+
+
+class ListMemberPagination(KeysetPagination):
+    """Always-on keyset pagination over the leads in one saved list."""
+
+    opt_in = False
@@ -0,0 +1,79 @@
+"""
+Stripe Checkout sessions for credit top-ups.
+
+The synchronous view goes through stripe's module-level API. The async view
+awaits the same request on an httpx client, so an ASGI worker is not tied
+up while Stripe answers. An httpx connection pool belongs to the event loop
+that created it, so each loop gets its own client. Without httpx installed
+the blocking call runs in a worker thread instead.
+"""
+
+import asyncio
+import weakref
+
+import stripe
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+try:
+    import httpx
+except ImportError:  # optional; only makes the async checkout non-blocking
+    httpx = None
+
+
+def checkout_session_params(user_id, amount, credits):
+    # Apple Pay is enabled by Stripe automatically when using card-based
+    # payment methods and a verified domain. Using automatic payment
+    # methods keeps the configuration minimal for the beginner-friendly
+    # setup requested by the user.
+    return {
+        "mode": "payment",
+        "automatic_payment_methods": {"enabled": True},
+        "line_items": [
+            {
+                "price_data": {
+                    "currency": "usd",
+                    "unit_amount": amount,
+                    "product_data": {"name": f"Credit top-up ({credits} credits)"},
+                },
+                "quantity": 1,
+            }
+        ],
+        "success_url": f"{settings.PAYMENT_SUCCESS_URL}?session_id={{CHECKOUT_SESSION_ID}}&credits={credits}",
+        "cancel_url": settings.PAYMENT_CANCEL_URL,
+        "automatic_tax": {"enabled": False},
+        # Read back by the webhook (api.webhooks) to credit the right account.
+        "client_reference_id": str(user_id),
+        "metadata": {"credits": str(credits)},
+    }
+
+
+def create_checkout_session(user_id, amount, credits):
+    stripe.api_key = settings.STRIPE_SECRET_KEY
+    stripe.api_base = settings.STRIPE_API_BASE
+    return stripe.checkout.Session.create(**checkout_session_params(user_id, amount, credits))
+
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _async_client():
+    loop = asyncio.get_running_loop()
+    config = (settings.STRIPE_SECRET_KEY, settings.STRIPE_API_BASE)
+    entry = _async_clients.get(loop)
+    if entry is None or entry[0] != config:
+        client = stripe.StripeClient(
+            settings.STRIPE_SECRET_KEY,
+            base_addresses={"api": settings.STRIPE_API_BASE},
+            http_client=stripe.HTTPXClient(),
+        )
+        entry = _async_clients[loop] = (config, client)
+    return entry[1]
+
+
+async def acreate_checkout_session(user_id, amount, credits):
+    """Async :func:`create_checkout_session`."""
+    if httpx is None:
+        return await sync_to_async(create_checkout_session, thread_sensitive=False)(user_id, amount, credits)
+    params = checkout_session_params(user_id, amount, credits)
+    return await _async_client().v1.checkout.sessions.create_async(params=params)
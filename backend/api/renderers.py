@@ -0,0 +1,69 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+from .columnar import to_columnar
+
+try:
+    import msgpack
+except ImportError:  # optional: only needed for ?format=msgpack
+    msgpack = None
+
+
+class PassthroughRenderer(BaseRenderer):
+    """
+    Lets DRF content negotiation accept a format (``?format=`` or ``Accept``)
+    whose body the view streams itself via ``StreamingHttpResponse``.
+
+    Only errors raised before streaming starts (authentication, a bad
+    filter or ``fields=``) reach this renderer; they are sent as JSON.
+    """
+
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        response = (renderer_context or {}).get("response")
+        if response is not None:
+            response["Content-Type"] = "application/json"
+        return JSONRenderer().render(data)
+
+
+class CSVRenderer(PassthroughRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class NDJSONRenderer(PassthroughRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    """Lead lists as one JSON array per field; see :mod:`api.columnar`."""
+
+    media_type = "application/vnd.leads.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(to_columnar(data), accepted_media_type, renderer_context)
+
+
+class MessagePackColumnarRenderer(BaseRenderer):
+    """The columnar layout encoded as MessagePack. Needs the optional ``msgpack`` package."""
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(to_columnar(data), use_bin_type=True)
+
+
+def columnar_renderers():
+    """The columnar renderers available in this install (MessagePack only with ``msgpack``)."""
+    if msgpack is None:
+        return [ColumnarJSONRenderer]
+    return [ColumnarJSONRenderer, MessagePackColumnarRenderer]
@@ -0,0 +1,92 @@
+"""
+Read-only fast path for lead lists and exports.
+
+``LeadSerializer(many=True)`` builds a model instance per row and calls
+every field's ``to_representation``; for read-only listing that machinery
+costs far more than the query. These helpers take ``values()`` rows straight
+from the cursor and only touch the datetime columns, which are the one
+place where the serializer's output differs from the database value. The
+output is identical to ``LeadSerializer`` (see ``LeadRepresentationTests``).
+"""
+
+from django.db import models
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import Lead
+from .serializers import LeadSerializer
+
+LEAD_FIELDS = tuple(LeadSerializer.Meta.fields)
+DATETIME_FIELDS = frozenset(
+    name for name in LEAD_FIELDS if isinstance(Lead._meta.get_field(name), models.DateTimeField)
+)
+
+
+def output_timezone():
+    """The zone DRF renders datetimes in, or None when values can be rendered as stored (UTC)."""
+    current = timezone.get_current_timezone()
+    return None if timezone.get_current_timezone_name() == "UTC" else current
+
+
+def format_datetime(value, tz=None):
+    # Same output as DRF's DateTimeField with the default settings.
+    if value is None:
+        return None
+    if tz is not None:
+        value = value.astimezone(tz)
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+def get_requested_fields(request, default=LEAD_FIELDS):
+    """
+    Parse ``?fields=id,name,...`` (comma separated, repeatable) into a tuple.
+
+    Names keep the order they were asked for; without the param the full
+    ``default`` set is returned. Unknown names are a 400.
+    """
+    names = []
+    for value in request.query_params.getlist("fields"):
+        for name in value.split(","):
+            name = name.strip()
+            if name and name not in names:
+                names.append(name)
+    if not names:
+        return tuple(default)
+    unknown = [name for name in names if name not in LEAD_FIELDS]
+    if unknown:
+        raise ValidationError({"fields": f"Unknown field(s): {', '.join(unknown)}."})
+    return tuple(names)
+
+
+def lead_values(queryset, fields=LEAD_FIELDS, extra=()):
+    """``values()`` over ``fields`` plus any ``extra`` columns the caller needs, such as a cursor key."""
+    return queryset.values(*fields, *[field for field in extra if field not in fields])
+
+
+def represent_leads(rows, fields=LEAD_FIELDS):
+    """
+    Turn ``values()`` dicts into ``LeadSerializer`` output, in place.
+
+    Formatting runs column by column, so the per-row work is one dict
+    assignment per datetime field. Keys outside ``fields`` (``extra``
+    columns) are dropped.
+    """
+    rows = rows if isinstance(rows, list) else list(rows)
+    tz = output_timezone()
+    for field in DATETIME_FIELDS.intersection(fields):
+        for row in rows:
+            row[field] = format_datetime(row[field], tz)
+    if rows:
+        extra = [key for key in rows[0] if key not in fields]
+        for row in rows:
+            for key in extra:
+                del row[key]
+    return rows
+
+
+def serialize_leads(queryset, fields=LEAD_FIELDS):
+    """Shortcut for ``represent_leads(lead_values(queryset))``."""
+    return represent_leads(lead_values(queryset, fields), fields)
@@ -0,0 +1,92 @@
+"""
+Full-text search over leads.
+
+SQLite gets an external-content FTS5 table (``api_lead_fts``) that triggers
+keep in step with every write to ``api_lead``, including ``bulk_create``,
+``QuerySet.update()`` and cascaded deletes. Its first column is the owner, so
+the owner filter is one more term of the FTS query and a search only visits
+the caller's rows. Postgres gets a GIN index on a ``to_tsvector`` expression,
+which the database maintains by itself. Any other backend falls back to
+``icontains`` so the endpoint still answers.
+
+The index itself is created by migrations (0004, and 0011 for the owner
+column), which keep frozen copies of its SQL. A migration that rebuilds
+``api_lead`` on SQLite drops the triggers and must reinstall the latest one.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Lead
+from .representations import LEAD_FIELDS, lead_values
+
+SEARCH_FIELDS = ("name", "industry", "location", "website")
+FTS_TABLE = "api_lead_fts"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_FTS_TEXT_COLUMNS = "{" + " ".join(SEARCH_FIELDS) + "}"
+
+# The search query must repeat this expression verbatim for Postgres to use the index.
+_PG_VECTOR = (
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(industry, '') || ' ' "
+    "|| coalesce(location, '') || ' ' || coalesce(website, ''))"
+)
+
+
+def tokenize(query):
+    return [token.lower() for token in _TOKEN_RE.findall(query or "")]
+
+
+def _sqlite_ids(owner_id, tokens, limit):
+    # Each token is quoted and prefix-matched and ANDed with the others, over
+    # the text columns only; the owner is an exact term of its own column.
+    terms = " ".join(f'"{token}"*' for token in tokens)
+    match = f'owner_id : "{int(owner_id)}" AND {_FTS_TEXT_COLUMNS} : ({terms})'
+    # The owner column carries no weight in the ranking.
+    rank = f"bm25({FTS_TABLE}, 0, 1, 1, 1, 1)"
+    sql = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY {rank}, rowid DESC LIMIT %s"
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _postgres_ids(owner_id, tokens, limit):
+    tsquery = " & ".join(f"{token}:*" for token in tokens)
+    sql = (
+        f"SELECT id FROM api_lead WHERE owner_id = %s AND {_PG_VECTOR} @@ to_tsquery('simple', %s) "
+        f"ORDER BY ts_rank({_PG_VECTOR}, to_tsquery('simple', %s)) DESC, id DESC LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [owner_id, tsquery, tsquery, limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _fallback_ids(owner_id, tokens, limit):
+    queryset = Lead.objects.filter(owner_id=owner_id)
+    for token in tokens:
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f"{field}__icontains": token})
+        queryset = queryset.filter(condition)
+    return list(queryset.order_by("-created_at", "-id").values_list("id", flat=True)[:limit])
+
+
+def search_lead_ids(owner_id, query, limit):
+    """Return up to ``limit`` lead ids owned by ``owner_id``, best match first."""
+    tokens = tokenize(query)
+    if not tokens:
+        return []
+    if connection.vendor == "sqlite":
+        return _sqlite_ids(owner_id, tokens, limit)
+    if connection.vendor == "postgresql":
+        return _postgres_ids(owner_id, tokens, limit)
+    return _fallback_ids(owner_id, tokens, limit)
+
+
+def search_lead_values(owner_id, query, limit, fields=LEAD_FIELDS):
+    """Like :func:`search_lead_ids` but returns ``values()`` dicts of ``fields`` (plus ``id``), best match first."""
+    ids = search_lead_ids(owner_id, query, limit)
+    by_id = {row["id"]: row for row in lead_values(Lead.objects.filter(id__in=ids), fields, extra=("id",))}
+    return [by_id[lead_id] for lead_id in ids if lead_id in by_id]
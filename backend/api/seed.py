@@ -0,0 +1,133 @@
+"""
+The seed dataset behind ``POST /api/import/seed/``, parsed and validated once.
+
+Every account seeds from the same ``SEED_CSV_PATH``, so the rows are read
+with :func:`api.importers.iter_csv_rows` and validated through
+``LeadSerializer`` once per version of the file instead of once per request.
+The result is pickled to ``SEED_CACHE_DIR`` under the SHA-256 of the file,
+so other worker processes, and restarts, load it instead of validating
+again, and is kept in memory per process until the file's mtime or size
+changes. Seeding an account is then one duplicate lookup and one
+``bulk_create`` per import batch.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+from .importers import LeadImporter, batched, iter_csv_rows
+
+# Bump when the cached layout or the validation rules change, so stale
+# pickles are ignored rather than loaded.
+CACHE_VERSION = 1
+SEED_DEFAULTS = {"source": "seed"}
+
+_datasets = {}
+_lock = threading.Lock()
+
+
+class SeedDataset:
+    """Validated seed rows plus the errors found in the file, as the importer reports them."""
+
+    def __init__(self, rows, row_count, error_count, errors):
+        self.rows = rows
+        self.row_count = row_count
+        self.error_count = error_count
+        self.errors = errors
+
+    @classmethod
+    def parse(cls, path):
+        validator = LeadImporter(owner=None)
+        rows = []
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            for index, row in enumerate(iter_csv_rows(f, defaults=SEED_DEFAULTS)):
+                data = validator.validate_row(index, row)
+                if data is not None:
+                    rows.append(dict(data))
+                validator.processed += 1
+        return cls(tuple(rows), validator.processed, validator.error_count, validator.errors)
+
+    def import_into(self, importer):
+        """Write the rows for ``importer.owner``; the caller owns the transaction."""
+        created = []
+        for batch in batched(self.rows, importer.batch_size):
+            # write_rows keeps the dicts it is given: hand it copies.
+            created.extend(importer.write_rows([dict(row) for row in batch]))
+        importer.processed += self.row_count
+        importer.error_count += self.error_count
+        importer.errors.extend(self.errors[: max(importer.max_reported_errors - len(importer.errors), 0)])
+        return created
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(digest):
+    return Path(settings.SEED_CACHE_DIR) / f"seed-v{CACHE_VERSION}-{digest}.pickle"
+
+
+def _load_cached(path):
+    try:
+        with open(path, "rb") as f:
+            dataset = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    return dataset if isinstance(dataset, SeedDataset) else None
+
+
+def _store(dataset, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so a concurrent reader never sees a partial pickle.
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".seed-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(dataset, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def load_seed_dataset(path=None):
+    """
+    The validated rows of ``path`` (default ``SEED_CSV_PATH``).
+
+    Raises ``FileNotFoundError`` when the file does not exist.
+    """
+    path = Path(path or settings.SEED_CSV_PATH).resolve()
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+    entry = _datasets.get(path)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    with _lock:
+        entry = _datasets.get(path)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+        pickled = cache_path(file_digest(path))
+        dataset = _load_cached(pickled)
+        if dataset is None:
+            dataset = SeedDataset.parse(path)
+            try:
+                _store(dataset, pickled)
+            except OSError:
+                # An unwritable cache dir costs other processes a parse, nothing more.
+                pass
+        _datasets[path] = (version, dataset)
+        return dataset
+
+
+def clear_seed_cache():
+    """Forget the in-process copies; the pickles on disk are left alone."""
+    with _lock:
+        _datasets.clear()
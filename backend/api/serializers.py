@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
-from .models import Lead, SavedList, SavedFilter, CreditTransaction
+from rest_framework.relations import MANY_RELATION_KWARGS
+from .models import Lead, SavedList, SavedFilter, CreditTransaction, CreditSnapshot, ImportJob
 
 User = get_user_model()
 
@@ -41,8 +44,45 @@ class LeadSerializer(serializers.ModelSerializer):
             "email_unlocked",
             "phone_unlocked",
             "created_at",
+            "updated_at",
         ]
-        read_only_fields = ["id", "created_at", "email_unlocked", "phone_unlocked"]
+        read_only_fields = ["id", "created_at", "updated_at", "email_unlocked", "phone_unlocked"]
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """Resolve every submitted primary key with one ``IN`` query instead of one query per key."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pks = []
+        for item in data:
+            if isinstance(item, bool):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+            try:
+                pks.append(queryset.model._meta.pk.to_python(item))
+            except (DjangoValidationError, TypeError, ValueError):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+        found = queryset.in_bulk(pks)
+        for pk in pks:
+            if pk not in found:
+                child.fail("does_not_exist", pk_value=pk)
+        return [found[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
 
 
 class SavedListSerializer(serializers.ModelSerializer):
@@ -52,7 +92,7 @@ class SavedListSerializer(serializers.ModelSerializer):
     payload compact while preventing cross-user access.
     """
 
-    leads = serializers.PrimaryKeyRelatedField(queryset=Lead.objects.none(), many=True)
+    leads = BulkPrimaryKeyRelatedField(queryset=Lead.objects.none(), many=True)
 
     class Meta:
         model = SavedList
@@ -64,8 +104,35 @@ class SavedListSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         if request:
             # Limit selectable leads to those owned by the requester so a user
-            # cannot attach another user's lead IDs.
-            self.fields["leads"].queryset = Lead.objects.filter(owner=request.user)
+            # cannot attach another user's lead IDs. With many=True the field is
+            # a wrapper, so the queryset goes on its child relation.
+            self.fields["leads"].child_relation.queryset = Lead.objects.filter(owner=request.user)
+
+
+class SavedListSummarySerializer(serializers.ModelSerializer):
+    """List-view shape of a saved list: a member count instead of every member id."""
+
+    lead_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = SavedList
+        fields = ["id", "name", "lead_count", "created_at"]
+        read_only_fields = fields
+
+
+class ListMembershipDeltaSerializer(serializers.Serializer):
+    add = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    remove = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+
+    def validate(self, attrs):
+        attrs["add"] = list(dict.fromkeys(attrs["add"]))
+        attrs["remove"] = list(dict.fromkeys(attrs["remove"]))
+        total = len(attrs["add"]) + len(attrs["remove"])
+        if total > settings.LIST_MEMBERS_MAX_DELTA:
+            raise serializers.ValidationError(f"At most {settings.LIST_MEMBERS_MAX_DELTA} ids per request")
+        if set(attrs["add"]) & set(attrs["remove"]):
+            raise serializers.ValidationError("An id cannot be both added and removed")
+        return attrs
 
 
 class SavedFilterSerializer(serializers.ModelSerializer):
@@ -80,3 +147,54 @@ class CreditTransactionSerializer(serializers.ModelSerializer):
         model = CreditTransaction
         fields = ["id", "amount", "description", "created_at"]
         read_only_fields = ["id", "created_at"]
+
+
+class CreditSnapshotSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CreditSnapshot
+        fields = ["balance", "last_transaction_id", "as_of"]
+        read_only_fields = fields
+
+
+class ImportJobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+    rows_per_second = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "status",
+            "input_format",
+            "mode",
+            "processed_rows",
+            "created_rows",
+            "updated_rows",
+            "duplicate_rows",
+            "error_count",
+            "errors",
+            "detail",
+            "progress",
+            "rows_per_second",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+    def get_progress(self, job):
+        # Share of the input file consumed so far; row totals are unknown for a stream.
+        if job.status == ImportJob.STATUS_SUCCEEDED:
+            return 1.0
+        if not job.total_bytes:
+            return 0.0
+        return round(min(job.bytes_read / job.total_bytes, 1.0), 4)
+
+    def get_rows_per_second(self, job):
+        if job.started_at is None:
+            return None
+        end = job.finished_at or job.updated_at
+        elapsed = (end - job.started_at).total_seconds()
+        if elapsed <= 0:
+            return None
+        return round(job.processed_rows / elapsed, 1)
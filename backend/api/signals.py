@@ -0,0 +1,47 @@
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+from .models import Lead, LeadTombstone, SavedFilter, SavedList, User
+from .versioning import bump_data_version, leads_changed
+
+
+# Bulk paths (bulk_create, QuerySet.update, through-table writes) send no
+# signals; they call the invalidation helpers themselves.
+@receiver(post_save, sender=Lead)
+@receiver(post_delete, sender=Lead)
+def lead_changed(sender, instance, **kwargs):
+    leads_changed(instance.owner_id)
+
+
+@receiver(post_delete, sender=Lead)
+def record_lead_tombstone(sender, instance, origin=None, **kwargs):
+    # Leads cascading away with their owner need no tombstone, and one would
+    # point at the user row being deleted.
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if issubclass(origin_model, User):
+        return
+    LeadTombstone.objects.create(owner_id=instance.owner_id, lead_id=instance.id)
+
+
+@receiver(post_save, sender=SavedList)
+@receiver(post_delete, sender=SavedList)
+@receiver(post_save, sender=SavedFilter)
+@receiver(post_delete, sender=SavedFilter)
+def owner_data_changed(sender, instance, **kwargs):
+    bump_data_version(instance.owner_id)
+
+
+@receiver(m2m_changed, sender=SavedList.leads.through)
+def list_members_changed(sender, instance, action, **kwargs):
+    # Fires for SavedList.leads.set()/add()/remove() and the reverse Lead.lists side.
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_data_version(instance.owner_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Credits, password and account state all live on the row the auth cache holds.
+    invalidate_cached_user(instance.pk)
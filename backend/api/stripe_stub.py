@@ -0,0 +1,110 @@
+"""
+A local stand-in for Stripe, for benchmarks and tests.
+
+``FakeStripeServer`` answers ``POST /v1/checkout/sessions`` with a
+Checkout Session shaped like Stripe's after an optional delay, on a loopback
+port, one thread per connection. Point ``STRIPE_API_BASE`` at ``base_url``.
+
+:func:`checkout_event` and :func:`sign_payload` build webhook deliveries
+the way Stripe sends them to ``/api/credits/webhook/``.
+"""
+
+import hashlib
+import hmac
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def checkout_event(
+    session_id, user_id, credits, event_type="checkout.session.completed", payment_status="paid", event_id=None
+):
+    """A Checkout Session event as Stripe would deliver it."""
+    return {
+        "id": event_id or f"evt_{uuid.uuid4().hex}",
+        "object": "event",
+        "type": event_type,
+        "created": int(time.time()),
+        "livemode": False,
+        "data": {
+            "object": {
+                "id": session_id,
+                "object": "checkout.session",
+                "mode": "payment",
+                "status": "complete",
+                "payment_status": payment_status,
+                "client_reference_id": str(user_id),
+                "metadata": {"credits": str(credits)},
+            }
+        },
+    }
+
+
+def sign_payload(payload, secret, timestamp=None):
+    """The ``Stripe-Signature`` header for ``payload`` signed with the endpoint ``secret``."""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f"{timestamp}.{payload}".encode(), hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+class FakeStripeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path.rstrip("/") != "/v1/checkout/sessions":
+            return self.reply(404, {"error": {"type": "invalid_request_error", "message": "Unrecognized request URL"}})
+        time.sleep(self.server.delay)
+        session_id = f"cs_test_{uuid.uuid4().hex}"
+        with self.server.lock:
+            self.server.sessions += 1
+        self.reply(
+            200,
+            {
+                "id": session_id,
+                "object": "checkout.session",
+                "mode": "payment",
+                "status": "open",
+                "url": f"https://checkout.stripe.com/c/pay/{session_id}",
+            },
+        )
+
+    def reply(self, status_code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeStripeServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+    def __init__(self, delay=0.0):
+        super().__init__(("127.0.0.1", 0), FakeStripeHandler)
+        self.delay = delay
+        self.sessions = 0
+        self.lock = threading.Lock()
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+        self.thread.join()
@@ -0,0 +1,25 @@
+"""Test helpers shared by the API test suite."""
+
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    ``assertQueryBudget(n)`` fails when the block runs more than ``n`` queries.
+
+    Unlike ``assertNumQueries`` it is an upper bound, so an endpoint can get
+    cheaper without breaking its test, while an N+1 regression still fails
+    with every query listed.
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, budget, using="default"):
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+        executed = len(context.captured_queries)
+        if executed > budget:
+            queries = "\n".join(f"{n}. {query['sql']}" for n, query in enumerate(context.captured_queries, 1))
+            self.fail(f"{executed} queries executed, budget is {budget}:\n{queries}")
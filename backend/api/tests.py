@@ -1,12 +1,77 @@
+import asyncio
+import csv
+import json
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock, skipUnless
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import F
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from config.dbprofiles import SQLITE_TUNED, apply_profile
 
-from .models import Lead
+from .authentication import UserCache, user_cache
+from .changes import encode_change_cursor
+from .credits import balance_at, debit_credits, take_snapshots
+from .importers import LeadImporter
+from .jobs import claim_jobs
+from .loadbench import SCENARIOS, compare_results, percentile, run_suite, seed
+from .metrics import registry as metrics_registry
+from .renderers import msgpack
+from .seed import SeedDataset, cache_path, clear_seed_cache, file_digest, load_seed_dataset
+from .stripe_stub import FakeStripeServer, checkout_event, sign_payload
+from .models import (
+    CreditSnapshot,
+    CreditTransaction,
+    ImportJob,
+    Lead,
+    LeadTombstone,
+    SavedFilter,
+    SavedList,
+    StripeEvent,
+)
+from .representations import serialize_leads
+from .serializers import LeadSerializer
+from .testing import QueryBudgetMixin
+from .versioning import current_data_version
 
 User = get_user_model()
 
 
+def create_leads(owner, count, prefix="Lead", **fields):
+    """
+    Create ``count`` leads named ``"<prefix> <index>"`` with unique emails.
+
+    ``fields`` override the defaults; a callable value is called with the index.
+    """
+    leads = []
+    for index in range(count):
+        values = {"industry": "Tech", "location": "NY", "email": f"{prefix.lower()}{index}@example.com", "phone": "555"}
+        values.update((name, value(index) if callable(value) else value) for name, value in fields.items())
+        leads.append(Lead.objects.create(owner=owner, name=f"{prefix} {index}", **values))
+    return leads
+
+
 class AuthTests(APITestCase):
     def test_register_sets_initial_credits_and_returns_tokens(self):
         response = self.client.post(
@@ -141,3 +206,1316 @@ class LeadFlowTests(AuthenticatedTestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("Stripe secret key", response.json().get("detail", ""))
+
+
+class LeadPaginationTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        base = timezone.now()
+        # Two leads share a timestamp so the id tiebreak is exercised.
+        self.leads = create_leads(self.user, 5, created_at=lambda index: base - timedelta(minutes=min(index, 3)))
+
+    def test_list_is_unpaginated_without_cursor_params(self):
+        response = self.auth_client.get("/api/leads/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 5)
+
+    def test_cursor_walks_every_lead_once_in_order(self):
+        seen = []
+        response = self.auth_client.get("/api/leads/", {"page_size": 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            body = response.json()
+            seen.extend(lead["id"] for lead in body["results"])
+            if not body["next_cursor"]:
+                break
+            response = self.auth_client.get("/api/leads/", {"page_size": 2, "cursor": body["next_cursor"]})
+        expected = list(Lead.objects.filter(owner=self.user).order_by("-created_at", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.auth_client.get("/api/leads/", {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class LeadFilterTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        rows = [
+            ("Ann", "Technology", "United States", "import", True),
+            ("Ben", "Finance", "India", "seed", False),
+            ("Cal", "Technology", "India", "seed", False),
+        ]
+        for name, industry, location, source, email_unlocked in rows:
+            Lead.objects.create(
+                owner=self.user,
+                name=name,
+                industry=industry,
+                location=location,
+                email=f"{name.lower()}@example.com",
+                phone="000",
+                source=source,
+                email_unlocked=email_unlocked,
+            )
+
+    def names(self, params):
+        response = self.auth_client.get("/api/leads/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(lead["name"] for lead in response.json())
+
+    def test_ad_hoc_params_are_anded(self):
+        self.assertEqual(self.names({"industry": "Technology"}), ["Ann", "Cal"])
+        self.assertEqual(self.names({"industry": "Technology", "location": "India"}), ["Cal"])
+        self.assertEqual(self.names({"source": "seed", "email_unlocked": "false"}), ["Ben", "Cal"])
+
+    def test_created_range_filters(self):
+        Lead.objects.filter(name="Ann").update(created_at=timezone.now() - timedelta(days=10))
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        self.assertEqual(self.names({"created_after": since}), ["Ben", "Cal"])
+
+    def test_saved_filter_criteria_run_server_side(self):
+        saved = SavedFilter.objects.create(
+            owner=self.user,
+            name="India tech",
+            criteria={"countries": ["India"], "industries": ["Technology"], "tags": ["hot"]},
+        )
+        self.assertEqual(self.names({"filter": saved.id}), ["Cal"])
+
+    def test_foreign_saved_filter_is_not_found(self):
+        other = User.objects.create_user(email="other@example.com", password="pass1234")
+        saved = SavedFilter.objects.create(owner=other, name="Theirs", criteria={})
+        response = self.auth_client.get("/api/leads/", {"filter": saved.id})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_boolean_is_rejected(self):
+        response = self.auth_client.get("/api/leads/", {"phone_unlocked": "maybe"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LeadSearchTests(AuthenticatedTestCase):
+    def create_lead(self, owner, name, industry="Technology", location="United States", website=""):
+        return Lead.objects.create(
+            owner=owner,
+            name=name,
+            industry=industry,
+            location=location,
+            email=f"{name.split()[0].lower()}@example.com",
+            phone="000",
+            website=website,
+        )
+
+    def search(self, query):
+        response = self.auth_client.get("/api/leads/search/", {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [lead["name"] for lead in response.json()]
+
+    def test_prefix_match_across_fields(self):
+        self.create_lead(self.user, "Alice Johnson", website="johnsonlabs.io")
+        self.create_lead(self.user, "Ravi Kumar", industry="Finance", location="India")
+        self.assertEqual(self.search("joh"), ["Alice Johnson"])
+        self.assertEqual(self.search("fin ind"), ["Ravi Kumar"])
+        self.assertEqual(self.search("johnsonl"), ["Alice Johnson"])
+
+    def test_index_follows_updates_and_deletes(self):
+        lead = self.create_lead(self.user, "Alice Johnson")
+        Lead.objects.filter(id=lead.id).update(name="Alicia Keys")
+        self.assertEqual(self.search("johnson"), [])
+        self.assertEqual(self.search("keys"), ["Alicia Keys"])
+        lead.delete()
+        self.assertEqual(self.search("keys"), [])
+
+    def test_results_are_scoped_to_owner(self):
+        other = User.objects.create_user(email="other@example.com", password="pass1234")
+        self.create_lead(other, "Alice Johnson")
+        self.assertEqual(self.search("alice"), [])
+
+    def test_owner_filter_runs_inside_the_fts_query(self):
+        other = User.objects.create_user(email="other@example.com", password="pass1234")
+        self.create_lead(self.user, "Alice Johnson")
+        self.create_lead(other, f"Alice {self.user.id}")
+        # Owner ids are not searchable text, and moving a lead re-indexes its owner.
+        self.assertEqual(self.search(str(self.user.id)), [])
+        Lead.objects.filter(owner=other).update(owner=self.user)
+        self.assertEqual(sorted(self.search("alice")), sorted(["Alice Johnson", f"Alice {self.user.id}"]))
+        with CaptureQueriesContext(connection) as queries:
+            self.search("alice")
+        fts = [query["sql"] for query in queries if "MATCH" in query["sql"]]
+        self.assertEqual(len(fts), 1)
+        self.assertNotIn("JOIN", fts[0])
+
+    def test_query_is_required(self):
+        response = self.auth_client.get("/api/leads/search/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkImportTests(AuthenticatedTestCase):
+    def row(self, index, **overrides):
+        row = {
+            "name": f"Lead {index}",
+            "industry": "Tech",
+            "location": "NY",
+            "email": f"lead{index}@example.com",
+            "phone": "123",
+        }
+        row.update(overrides)
+        return row
+
+    @override_settings(IMPORT_BATCH_SIZE=2)
+    def test_import_reports_summary_and_row_errors(self):
+        rows = [self.row(0), self.row(1, email="not-an-email"), self.row(2), "junk", self.row(4)]
+        response = self.auth_client.post("/api/leads/import/", {"leads": rows}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body["processed"], 5)
+        self.assertEqual(body["created"], 3)
+        self.assertEqual(body["error_count"], 2)
+        self.assertEqual([error["index"] for error in body["errors"]], [1, 3])
+        self.assertIn("email", body["errors"][0]["errors"])
+        self.assertEqual(Lead.objects.filter(owner=self.user).count(), 3)
+
+    def test_import_rejects_non_list_payload(self):
+        response = self.auth_client.post("/api/leads/import/", {"leads": {"name": "x"}}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CSVImportTests(AuthenticatedTestCase):
+    def upload(self, content, name="leads.csv"):
+        upload = SimpleUploadedFile(name, content.encode("utf-8"), content_type="text/csv")
+        return self.auth_client.post("/api/leads/import/csv/", {"file": upload}, format="multipart")
+
+    @override_settings(IMPORT_BATCH_SIZE=2)
+    def test_csv_upload_imports_in_batches(self):
+        lines = ["Name,Industry,Location,Email,Phone,Website,Ignored"]
+        lines += [f"Lead {i},Tech,NY,lead{i}@example.com,555,lead{i}.io,x" for i in range(5)]
+        lines.append("Broken,Tech,NY,,555,,x")
+        response = self.upload("\ufeff" + "\r\n".join(lines) + "\r\n")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body["created"], 5)
+        self.assertEqual(body["errors"][0]["index"], 5)
+        self.assertIn("email", body["errors"][0]["errors"])
+        self.assertEqual(Lead.objects.filter(owner=self.user, industry="Tech").count(), 5)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=64)
+    def test_csv_upload_spooled_to_disk_is_parsed(self):
+        lines = ["name,industry,location,email,phone"]
+        lines += [f"Lead {i},Tech,NY,lead{i}@example.com,555" for i in range(50)]
+        response = self.upload("\n".join(lines))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["created"], 50)
+
+    def test_csv_upload_requires_file(self):
+        response = self.auth_client.post("/api/leads/import/csv/", {}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ImportJobTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        spool = tempfile.TemporaryDirectory()
+        self.addCleanup(spool.cleanup)
+        self.spool_dir = Path(spool.name)
+        override = override_settings(IMPORT_JOB_DIR=spool.name, IMPORT_BATCH_SIZE=2)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def run_worker(self):
+        call_command("run_import_worker", processes=0, once=True, stdout=StringIO(), stderr=StringIO())
+
+    def test_async_json_import_is_queued_then_processed(self):
+        rows = [
+            {"name": f"Lead {i}", "industry": "Tech", "location": "NY", "email": f"l{i}@example.com", "phone": "1"}
+            for i in range(3)
+        ]
+        rows.append({"name": "Broken"})
+        response = self.auth_client.post("/api/leads/import/?async=1", {"leads": rows}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_id = response.json()["id"]
+        self.assertEqual(response.json()["status"], "pending")
+        self.assertEqual(Lead.objects.filter(owner=self.user).count(), 0)
+
+        self.run_worker()
+
+        job = self.auth_client.get(f"/api/import/jobs/{job_id}/").json()
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["processed_rows"], 4)
+        self.assertEqual(job["created_rows"], 3)
+        self.assertEqual(job["errors"][0]["index"], 3)
+        self.assertEqual(job["progress"], 1.0)
+        self.assertEqual(Lead.objects.filter(owner=self.user).count(), 3)
+        self.assertEqual(list(self.spool_dir.iterdir()), [])
+
+    def test_async_seed_import_keeps_seed_file(self):
+        response = self.auth_client.post("/api/import/seed/?async=1")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.run_worker()
+        self.assertTrue(Path(settings.SEED_CSV_PATH).exists())
+        leads = Lead.objects.filter(owner=self.user)
+        self.assertGreaterEqual(leads.count(), 1)
+        self.assertFalse(leads.exclude(source="seed").exists())
+
+    def test_jobs_are_claimed_once(self):
+        job = ImportJob.objects.create(owner=self.user, input_format="csv", input_path="unused.csv")
+        self.assertEqual(claim_jobs(5), [job.id])
+        self.assertEqual(claim_jobs(5), [])
+
+    def test_jobs_are_scoped_to_owner(self):
+        other = User.objects.create_user(email="other@example.com", password="pass1234")
+        job = ImportJob.objects.create(owner=other, input_format="csv", input_path="unused.csv")
+        response = self.auth_client.get(f"/api/import/jobs/{job.id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class StreamingExportTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        for name, industry in (("Ann", "Technology"), ("Ben", "Finance")):
+            Lead.objects.create(
+                owner=self.user,
+                name=name,
+                industry=industry,
+                location="NY",
+                email=f"{name.lower()}@example.com",
+                phone="555",
+                website=f"{name.lower()}.io",
+            )
+
+    def test_csv_export_streams_rows(self):
+        response = self.auth_client.get("/api/leads/export/", {"format": "csv"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        body = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual(sorted(row["name"] for row in rows), ["Ann", "Ben"])
+        self.assertEqual(rows[0]["email_unlocked"], "False")
+
+    def test_ndjson_export_matches_serializer_and_filters(self):
+        response = self.auth_client.get("/api/leads/export/", {"format": "ndjson", "industry": "Finance"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        expected = LeadSerializer(Lead.objects.get(name="Ben")).data
+        self.assertEqual(json.loads(lines[0]), json.loads(json.dumps(expected)))
+
+    def test_errors_before_streaming_are_json(self):
+        for format_type in ("csv", "ndjson"):
+            with self.subTest(format=format_type):
+                anonymous = self.client.get("/api/leads/export/", {"format": format_type})
+                self.assertEqual(anonymous.status_code, status.HTTP_401_UNAUTHORIZED)
+                self.assertEqual(anonymous["Content-Type"], "application/json")
+                self.assertIn("detail", json.loads(anonymous.content))
+
+                bad_fields = self.auth_client.get("/api/leads/export/", {"format": format_type, "fields": "bogus"})
+                self.assertEqual(bad_fields.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("fields", json.loads(bad_fields.content))
+
+
+class ConcurrentUnlockTests(TransactionTestCase):
+    """Hammer the unlock endpoint from threads; every request gets its own DB connection."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="race@example.com", password="pass1234")
+        self.user.credits = 10
+        self.user.save(update_fields=["credits"])
+        self.leads = create_leads(self.user, 20)
+
+    def unlock_concurrently(self, lead_ids, unlock_type="email"):
+        barrier = threading.Barrier(len(lead_ids))
+
+        def unlock(lead_id):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            barrier.wait()
+            try:
+                return client.post("/api/leads/unlock/", {"lead_id": lead_id, "type": unlock_type}, format="json")
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(lead_ids)) as pool:
+            return [response.status_code for response in pool.map(unlock, lead_ids)]
+
+    def test_concurrent_unlocks_never_overspend(self):
+        codes = self.unlock_concurrently([lead.id for lead in self.leads])
+        self.assertEqual(codes.count(status.HTTP_200_OK), 10)
+        self.assertEqual(codes.count(status.HTTP_400_BAD_REQUEST), 10)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.credits, 0)
+        self.assertEqual(Lead.objects.filter(owner=self.user, email_unlocked=True).count(), 10)
+        self.assertEqual(CreditTransaction.objects.filter(owner=self.user).count(), 10)
+
+    def test_concurrent_unlocks_of_one_field_charge_once(self):
+        lead = self.leads[0]
+        codes = self.unlock_concurrently([lead.id] * 8, unlock_type="phone")
+        self.assertEqual(codes, [status.HTTP_200_OK] * 8)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.credits, 8)
+        self.assertEqual(CreditTransaction.objects.filter(owner=self.user).count(), 1)
+
+
+class BatchUnlockTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.leads = create_leads(self.user, 4)
+        self.ids = [lead.id for lead in self.leads]
+
+    def set_credits(self, credits):
+        self.user.credits = credits
+        self.user.save(update_fields=["credits"])
+
+    def unlock(self, ids, **extra):
+        payload = {"lead_ids": ids, "type": "phone", **extra}
+        return self.auth_client.post("/api/leads/unlock/batch/", payload, format="json")
+
+    def test_batch_debits_once_and_writes_one_ledger_entry(self):
+        self.set_credits(10)
+        Lead.objects.filter(id=self.ids[0]).update(phone_unlocked=True)
+        response = self.unlock(self.ids)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body["charged"], 6)
+        self.assertEqual(body["credits"], 4)
+        self.assertEqual(body["already_unlocked"], self.ids[:1])
+        self.assertTrue(all(lead["phone_unlocked"] for lead in body["leads"]))
+        entries = CreditTransaction.objects.filter(owner=self.user)
+        self.assertEqual([entry.amount for entry in entries], [-6])
+
+    def test_all_mode_is_all_or_nothing(self):
+        self.set_credits(5)
+        response = self.unlock(self.ids)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Lead.objects.filter(phone_unlocked=True).exists())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.credits, 5)
+
+    def test_partial_mode_unlocks_what_the_balance_covers(self):
+        self.set_credits(5)
+        response = self.unlock(self.ids, mode="partial")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body["unlocked"], self.ids[:2])
+        self.assertEqual(body["skipped"], self.ids[2:])
+        self.assertEqual(body["credits"], 1)
+
+    def test_leads_unlocked_concurrently_are_not_charged(self):
+        self.set_credits(10)
+        raced = self.ids[1]
+
+        def unlock_after_state_read(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if '"api_lead"."phone_unlocked" AS' in sql:
+                # A single /unlock/ landing between the read and the update.
+                Lead.objects.filter(id=raced).update(phone_unlocked=True)
+            return result
+
+        with connection.execute_wrapper(unlock_after_state_read):
+            response = self.unlock(self.ids)
+        body = response.json()
+        self.assertEqual(body["unlocked"], [lead_id for lead_id in self.ids if lead_id != raced])
+        self.assertEqual(body["already_unlocked"], [raced])
+        self.assertEqual(body["charged"], 6)
+        self.assertEqual(body["credits"], 4)
+
+    def test_nothing_to_unlock_leaves_the_data_version_alone(self):
+        self.set_credits(10)
+        Lead.objects.filter(id__in=self.ids).update(phone_unlocked=True)
+        version = current_data_version(self.user.id)
+        body = self.unlock(self.ids).json()
+        self.assertEqual(body["charged"], 0)
+        self.assertEqual(body["unlocked"], [])
+        self.assertEqual(current_data_version(self.user.id), version)
+
+    def test_foreign_leads_are_not_found(self):
+        other = User.objects.create_user(email="other@example.com", password="pass1234")
+        foreign = Lead.objects.create(
+            owner=other, name="X", industry="Tech", location="NY", email="x@example.com", phone="1"
+        )
+        response = self.unlock([self.ids[0], foreign.id])
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json()["not_found"], [foreign.id])
+        self.assertFalse(Lead.objects.filter(phone_unlocked=True).exists())
+
+
+class CreditLedgerTests(AuthenticatedTestCase):
+    def record(self, amount, when):
+        return CreditTransaction.objects.create(owner=self.user, amount=amount, created_at=when)
+
+    def test_history_is_keyset_paginated(self):
+        base = timezone.now()
+        for offset in range(3):
+            self.record(-1, base - timedelta(minutes=offset))
+        first = self.auth_client.get("/api/credits/transactions/", {"page_size": 2}).json()
+        self.assertEqual(len(first["results"]), 2)
+        second = self.auth_client.get(
+            "/api/credits/transactions/", {"page_size": 2, "cursor": first["next_cursor"]}
+        ).json()
+        self.assertEqual(len(second["results"]), 1)
+        self.assertIsNone(second["next_cursor"])
+
+    def test_historical_balance_uses_nearest_snapshot(self):
+        base = timezone.now() - timedelta(days=3)
+        self.record(-5, base)
+        self.record(10, base + timedelta(days=1))
+        self.assertEqual(take_snapshots(), 1)
+        self.record(-3, base + timedelta(days=2))
+
+        snapshot = CreditSnapshot.objects.get(owner=self.user)
+        self.assertEqual(snapshot.balance, 25 - 5 + 10)
+
+        response = self.auth_client.get("/api/credits/balance/")
+        self.assertEqual(response.json()["balance"], 27)
+        self.assertEqual(response.json()["snapshot"]["balance"], 30)
+        # Before the snapshot the balance is rebuilt from the opening balance.
+        balance, used = balance_at(self.user.id, base + timedelta(hours=1))
+        self.assertEqual((balance, used), (20, None))
+
+        self.assertEqual(take_snapshots(min_transactions=2), 0)
+        self.assertEqual(take_snapshots(), 1)
+        self.assertEqual(CreditSnapshot.objects.filter(owner=self.user).latest("as_of").balance, 27)
+
+    def test_snapshots_only_read_transactions_after_each_owners_last_snapshot(self):
+        other = User.objects.create_user(email="ledger@example.com", password="pass1234")
+        now = timezone.now()
+        for amount in (1, 2, 3):
+            self.record(amount, now)
+        CreditTransaction.objects.create(owner=other, amount=-4, created_at=now)
+        self.assertEqual(take_snapshots(), 2)
+        latest = self.record(5, now)
+
+        User.objects.create_user(email="idle@example.com", password="pass1234")
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(take_snapshots(), 1)
+        # The grouped tail read, the as_of lookup and one bulk insert,
+        # however many users there are.
+        self.assertEqual(len(queries), 3)
+        self.assertIn('LEFT OUTER JOIN "api_credittransaction"', queries[0]["sql"])
+        self.assertIn('"id" > (COALESCE((SELECT', queries[0]["sql"])
+        snapshot = CreditSnapshot.objects.filter(owner=self.user).order_by("-last_transaction_id").first()
+        self.assertEqual(snapshot.last_transaction_id, latest.id)
+        balances = dict(CreditSnapshot.objects.order_by("id").values_list("owner_id", "balance"))
+        self.assertEqual(balances, {self.user.id: 25 + 1 + 2 + 3 + 5, other.id: 25 - 4})
+
+    def test_reconcile_reports_drift(self):
+        lead = Lead.objects.create(owner=self.user, name="A", industry="T", location="N", email="a@x.io", phone="1")
+        self.auth_client.post("/api/leads/unlock/", {"lead_id": lead.id, "type": "email"}, format="json")
+        call_command("reconcile_credits", stdout=StringIO())
+        User.objects.filter(id=self.user.id).update(credits=99)
+        with self.assertRaises(CommandError):
+            call_command("reconcile_credits", stdout=StringIO())
+
+
+class SavedListMembersTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.leads = create_leads(self.user, 5)
+        self.saved_list = SavedList.objects.create(owner=self.user, name="Hot")
+        self.saved_list.leads.add(*self.leads[:3])
+        self.url = f"/api/lists/{self.saved_list.id}/members/"
+
+    def member_ids(self):
+        return set(self.saved_list.leads.values_list("id", flat=True))
+
+    def test_delta_adds_and_removes_members(self):
+        ids = [lead.id for lead in self.leads]
+        response = self.auth_client.post(self.url, {"add": [ids[3], ids[4], ids[0]], "remove": [ids[1]]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"added": 2, "removed": 1, "lead_count": 4})
+        self.assertEqual(self.member_ids(), {ids[0], ids[2], ids[3], ids[4]})
+
+    def test_delta_rejects_foreign_leads(self):
+        other = User.objects.create_user(email="other@example.com", password="pass1234")
+        foreign = Lead.objects.create(owner=other, name="X", industry="T", location="N", email="x@x.io", phone="1")
+        response = self.auth_client.post(self.url, {"add": [foreign.id]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.json()["invalid"], [foreign.id])
+        self.assertNotIn(foreign.id, self.member_ids())
+
+    def test_create_accepts_owned_leads_and_resolves_them_in_one_query(self):
+        ids = [lead.id for lead in self.leads]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.auth_client.post("/api/lists/", {"name": "All", "leads": ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertCountEqual(response.data["leads"], ids)
+        # Validation is one IN lookup, not one query per submitted id.
+        lookups = [query["sql"] for query in queries if 'FROM "api_lead" WHERE' in query["sql"]]
+        self.assertEqual(len(lookups), 1)
+        self.assertIn('"api_lead"."id" IN', lookups[0])
+
+    def test_create_rejects_foreign_and_malformed_lead_ids(self):
+        other = User.objects.create_user(email="other@example.com", password="pass1234")
+        foreign = Lead.objects.create(owner=other, name="X", industry="T", location="N", email="x@x.io", phone="1")
+        for leads, message in (([self.leads[0].id, foreign.id], "does not exist"), (["abc"], "Incorrect type")):
+            with self.subTest(leads=leads):
+                response = self.auth_client.post("/api/lists/", {"name": "Bad", "leads": leads}, format="json")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn(message, response.json()["leads"][0])
+        self.assertFalse(SavedList.objects.filter(name="Bad").exists())
+
+    def test_members_are_paginated(self):
+        first = self.auth_client.get(self.url, {"page_size": 2}).json()
+        self.assertEqual(len(first["results"]), 2)
+        rest = self.auth_client.get(self.url, {"page_size": 2, "cursor": first["next_cursor"]}).json()
+        returned = {lead["id"] for lead in first["results"] + rest["results"]}
+        self.assertEqual(returned, self.member_ids())
+
+    def test_list_view_returns_counts_not_member_ids(self):
+        response = self.auth_client.get("/api/lists/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [
+            {
+                "id": self.saved_list.id,
+                "name": "Hot",
+                "lead_count": 3,
+                "created_at": response.json()[0]["created_at"],
+            }
+        ])
+
+
+class LeadFacetsTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        rows = [("Technology", "India", "seed"), ("Technology", "Canada", "seed"), ("Finance", "India", "import")]
+        for index, (industry, location, source) in enumerate(rows):
+            Lead.objects.create(
+                owner=self.user,
+                name=f"Lead {index}",
+                industry=industry,
+                location=location,
+                email=f"facet{index}@example.com",
+                phone="555",
+                source=source,
+                email_unlocked=index == 0,
+            )
+
+    def facets(self):
+        response = self.auth_client.get("/api/leads/facets/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_counts_by_dimension(self):
+        facets = self.facets()
+        self.assertEqual(facets["industry"], [{"value": "Technology", "count": 2}, {"value": "Finance", "count": 1}])
+        self.assertEqual(facets["location"][0], {"value": "India", "count": 2})
+        self.assertEqual(facets["total"], 3)
+        self.assertEqual(facets["unlocked"], {"email": 1, "phone": 0})
+
+    def test_second_read_is_served_from_cache(self):
+        self.facets()
+        # The user comes from the auth cache; only the data version is read.
+        with self.assertNumQueries(1):
+            self.facets()
+
+    def test_writes_from_other_processes_are_not_served_stale(self):
+        self.facets()
+        # As another worker would: write and bump the version, with no chance
+        # to clear this process's cache.
+        Lead.objects.bulk_create([Lead(owner=self.user, name="Elsewhere", industry="Retail", location="Peru")])
+        User.objects.filter(id=self.user.id).update(data_version=F("data_version") + 1)
+        self.assertEqual(self.facets()["total"], 4)
+
+    def test_writes_invalidate_the_cache(self):
+        self.facets()
+        rows = [{"name": "New", "industry": "Retail", "location": "India", "email": "new@example.com", "phone": "1"}]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.auth_client.post("/api/leads/import/", {"leads": rows}, format="json")
+        self.assertEqual(self.facets()["total"], 4)
+
+        lead = Lead.objects.get(name="Lead 1")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.auth_client.post("/api/leads/unlock/", {"lead_id": lead.id, "type": "phone"}, format="json")
+        self.assertEqual(self.facets()["unlocked"]["phone"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.auth_client.delete(f"/api/leads/{lead.id}/")
+        self.assertEqual(self.facets()["total"], 3)
+
+
+class ConditionalGetTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        self.lead = Lead.objects.create(
+            owner=self.user, name="Tagged", industry="Tech", location="India", email="t@example.com", phone="1"
+        )
+
+    def revalidate(self, url, etag):
+        return self.auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_matching_etag_returns_304_after_one_version_lookup(self):
+        for url in ("/api/leads/", "/api/lists/", "/api/filters/", f"/api/leads/{self.lead.id}/"):
+            etag = self.auth_client.get(url)["ETag"]
+            # The user comes from the auth cache, but the data version is read
+            # from the database: another worker's cached user may predate a write.
+            with self.assertNumQueries(1):
+                response = self.revalidate(url, etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response["ETag"], etag)
+
+    def test_etag_varies_with_query_string(self):
+        etag = self.auth_client.get("/api/leads/")["ETag"]
+        response = self.revalidate("/api/leads/?industry=Tech", etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_writes_change_the_etag(self):
+        etag = self.auth_client.get("/api/leads/")["ETag"]
+        rows = [{"name": "New", "industry": "Retail", "location": "India", "email": "n@example.com", "phone": "1"}]
+        self.auth_client.post("/api/leads/import/", {"leads": rows}, format="json")
+        response = self.revalidate("/api/leads/", etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()), 2)
+
+        etag = response["ETag"]
+        self.auth_client.post("/api/leads/unlock/", {"lead_id": self.lead.id, "type": "email"}, format="json")
+        self.assertEqual(self.revalidate("/api/leads/", etag).status_code, status.HTTP_200_OK)
+
+    def test_list_membership_changes_the_etag(self):
+        saved = SavedList.objects.create(owner=self.user, name="Mine")
+        etag = self.auth_client.get("/api/lists/")["ETag"]
+        self.auth_client.post(f"/api/lists/{saved.id}/members/", {"add": [self.lead.id]}, format="json")
+        response = self.revalidate("/api/lists/", etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()[0]["lead_count"], 1)
+
+        etag = response["ETag"]
+        saved.leads.clear()
+        self.assertEqual(self.revalidate("/api/lists/", etag).status_code, status.HTTP_200_OK)
+
+    def test_other_users_writes_keep_the_etag(self):
+        etag = self.auth_client.get("/api/filters/")["ETag"]
+        other = User.objects.create_user(email="other@example.com", password="pass1234")
+        SavedFilter.objects.create(owner=other, name="Theirs", criteria={})
+        self.assertEqual(self.revalidate("/api/filters/", etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+@override_settings(LEAD_CHANGES_SETTLE_SECONDS=0)
+class LeadChangesTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        create_leads(self.user, 3, prefix="Sync", location="India")
+
+    def changes(self, since=None, **params):
+        if since:
+            params["since"] = since
+        response = self.auth_client.get("/api/leads/changes/", params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_steady_state_returns_only_changes(self):
+        initial = self.changes()
+        self.assertEqual(len(initial["changed"]), 3)
+        self.assertEqual(initial["deleted"], [])
+        self.assertEqual(self.changes(initial["cursor"])["changed"], [])
+
+        lead = Lead.objects.get(name="Sync 1")
+        self.auth_client.patch(f"/api/leads/{lead.id}/", {"name": "Renamed"}, format="json")
+        self.auth_client.post("/api/leads/unlock/", {"lead_id": lead.id, "type": "email"}, format="json")
+        gone = Lead.objects.get(name="Sync 2")
+        self.auth_client.delete(f"/api/leads/{gone.id}/")
+
+        delta = self.changes(initial["cursor"])
+        self.assertEqual([row["name"] for row in delta["changed"]], ["Renamed"])
+        self.assertTrue(delta["changed"][0]["email_unlocked"])
+        self.assertEqual(delta["deleted"], [gone.id])
+        caught_up = self.changes(delta["cursor"])
+        self.assertEqual((caught_up["changed"], caught_up["deleted"]), ([], []))
+
+    def test_backlog_is_drained_in_pages(self):
+        seen = []
+        page = self.changes(limit=2)
+        seen += page["changed"]
+        self.assertTrue(page["has_more"])
+        page = self.changes(page["cursor"], limit=2)
+        seen += page["changed"]
+        self.assertFalse(page["has_more"])
+        self.assertEqual(sorted(row["name"] for row in seen), ["Sync 0", "Sync 1", "Sync 2"])
+
+    @override_settings(LEAD_CHANGES_SETTLE_SECONDS=60)
+    def test_recent_writes_wait_for_the_settle_window(self):
+        self.assertEqual(self.changes()["changed"], [])
+
+    def test_bad_and_expired_cursors(self):
+        response = self.auth_client.get("/api/leads/changes/", {"since": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        old = timezone.now() - timedelta(days=settings.LEAD_TOMBSTONE_RETENTION_DAYS + 1)
+        since = encode_change_cursor((old, 0), (old, 0))
+        response = self.auth_client.get("/api/leads/changes/", {"since": since})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_owner_deletion_leaves_no_tombstones(self):
+        Lead.objects.filter(name="Sync 0").delete()
+        self.assertEqual(LeadTombstone.objects.filter(owner=self.user).count(), 1)
+        self.user.delete()
+        self.assertFalse(LeadTombstone.objects.exists())
+
+
+class LeadRepresentationTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        create_leads(
+            self.user,
+            4,
+            prefix="Rep",
+            location="India",
+            website=lambda index: "" if index % 2 else f"rep{index}.io",
+            source=lambda index: "seed" if index % 2 else "import",
+            email_unlocked=lambda index: index == 1,
+            phone_unlocked=lambda index: index == 2,
+        )
+        self.leads = Lead.objects.filter(owner=self.user).order_by("-created_at", "-id")
+
+    def expected(self):
+        return json.loads(json.dumps(LeadSerializer(self.leads, many=True).data))
+
+    def test_fast_path_matches_serializer(self):
+        self.assertEqual(serialize_leads(self.leads), self.expected())
+
+    def test_fast_path_matches_serializer_outside_utc(self):
+        with timezone.override("Asia/Kolkata"):
+            rows = serialize_leads(self.leads)
+            self.assertEqual(rows, self.expected())
+        self.assertTrue(rows[0]["created_at"].endswith("+05:30"))
+
+    def test_list_and_export_use_the_same_shape(self):
+        expected = self.expected()
+        self.assertEqual(self.auth_client.get("/api/leads/").json(), expected)
+        self.assertEqual(self.auth_client.get("/api/leads/?page_size=3").json()["results"], expected[:3])
+        self.assertEqual(self.auth_client.get("/api/leads/export/").json(), expected)
+
+
+class SparseFieldsetTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        create_leads(self.user, 3, prefix="Narrow", location="India")
+
+    def test_list_returns_and_selects_only_requested_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.auth_client.get("/api/leads/", {"fields": "name,industry"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.json()[0]), {"name", "industry"})
+        lead_query = next(query["sql"] for query in queries if 'FROM "api_lead"' in query["sql"])
+        self.assertNotIn('"email"', lead_query)
+
+    def test_paging_still_works_without_cursor_columns(self):
+        first = self.auth_client.get("/api/leads/", {"fields": "name", "page_size": 2}).json()
+        self.assertEqual(first["results"], [{"name": "Narrow 2"}, {"name": "Narrow 1"}])
+        second = self.auth_client.get("/api/leads/", {"fields": "name", "cursor": first["next_cursor"]}).json()
+        self.assertEqual(second["results"], [{"name": "Narrow 0"}])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.auth_client.get("/api/leads/", {"fields": "name,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("password", response.json()["fields"])
+
+    def test_search_and_export_accept_fields(self):
+        response = self.auth_client.get("/api/leads/search/", {"q": "narrow", "fields": "id,name"})
+        self.assertEqual({tuple(row) for row in response.json()}, {("id", "name")})
+
+        response = self.auth_client.get("/api/leads/export/", {"format": "csv", "fields": "email,created_at"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "email,created_at")
+        self.assertTrue(lines[1].startswith("narrow2@example.com,") and lines[1].endswith("Z"))
+
+        response = self.auth_client.get("/api/leads/export/", {"format": "ndjson", "fields": "location"})
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(rows, [{"location": "India"}] * 3)
+
+
+def decode_columns(payload):
+    """Rebuild row dicts from a columnar payload."""
+    columns = []
+    for field in payload["fields"]:
+        column = payload["columns"][field]
+        if isinstance(column, dict):
+            column = [column["dictionary"][code] for code in column["codes"]]
+        columns.append(column)
+    return [dict(zip(payload["fields"], values)) for values in zip(*columns)]
+
+
+class ColumnarFormatTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        industries = ("Tech", "Finance")
+        create_leads(self.user, 4, prefix="Column", location="India", industry=lambda index: industries[index % 2])
+
+    def test_list_columns_round_trip_to_json(self):
+        expected = self.auth_client.get("/api/leads/").json()
+        payload = self.auth_client.get("/api/leads/", {"format": "columnar"}).json()
+        self.assertEqual(payload["count"], 4)
+        self.assertEqual(payload["columns"]["industry"], {"dictionary": ["Finance", "Tech"], "codes": [0, 1, 0, 1]})
+        self.assertEqual(decode_columns(payload), expected)
+
+    def test_paged_columns_keep_the_cursor(self):
+        response = self.auth_client.get(
+            "/api/leads/", {"page_size": 3, "fields": "id,name"}, HTTP_ACCEPT="application/vnd.leads.columnar+json"
+        )
+        self.assertEqual(response["Content-Type"], "application/vnd.leads.columnar+json")
+        payload = response.json()
+        self.assertEqual(payload["fields"], ["id", "name"])
+        self.assertIsNotNone(payload["next_cursor"])
+        self.assertEqual(payload["count"], 3)
+
+    def test_export_columns_match_json_export(self):
+        expected = self.auth_client.get("/api/leads/export/").json()
+        payload = self.auth_client.get("/api/leads/export/", {"format": "columnar"}).json()
+        self.assertEqual(decode_columns(payload), expected)
+
+    @skipUnless(msgpack, "msgpack is not installed")
+    def test_msgpack_export(self):
+        response = self.auth_client.get("/api/leads/export/", {"format": "msgpack", "fields": "name,location"})
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        payload = msgpack.unpackb(response.content)
+        self.assertEqual(payload["columns"]["location"], {"dictionary": ["India"], "codes": [0, 0, 0, 0]})
+
+
+class DuplicateImportTests(AuthenticatedTestCase):
+    def rows(self, count, name="Dup", mailbox="Dup"):
+        return [
+            {
+                "name": f"{name} {index}",
+                "industry": "Tech",
+                "location": "India",
+                "email": f"{mailbox}{index}@Example.com",
+                "phone": "555 0100",
+            }
+            for index in range(count)
+        ]
+
+    def import_rows(self, rows, mode=None):
+        url = "/api/leads/import/" + (f"?mode={mode}" if mode else "")
+        response = self.auth_client.post(url, {"leads": rows}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_reimport_skips_duplicates_by_default(self):
+        self.import_rows(self.rows(3))
+        rows = self.rows(3)
+        for row in rows:
+            row["email"] = row["email"].lower()
+        summary = self.import_rows(rows)
+        self.assertEqual((summary["created"], summary["duplicates"], summary["updated"]), (0, 3, 0))
+        self.assertEqual(Lead.objects.filter(owner=self.user).count(), 3)
+
+    def test_update_mode_merges_into_existing_leads(self):
+        self.import_rows(self.rows(2))
+        lead = Lead.objects.get(name="Dup 0")
+        Lead.objects.filter(id=lead.id).update(email_unlocked=True)
+        summary = self.import_rows(self.rows(2, name="Fresh"), mode="update")
+        self.assertEqual((summary["created"], summary["updated"], summary["duplicates"]), (0, 2, 2))
+        lead.refresh_from_db()
+        self.assertEqual(lead.name, "Fresh 0")
+        self.assertTrue(lead.email_unlocked)
+
+    def test_insert_mode_keeps_duplicates(self):
+        self.import_rows(self.rows(2))
+        summary = self.import_rows(self.rows(2), mode="insert")
+        self.assertEqual((summary["created"], summary["duplicates"]), (2, 0))
+        self.assertEqual(Lead.objects.filter(owner=self.user).count(), 4)
+
+    def test_duplicates_within_a_file_and_lookup_per_batch(self):
+        rows = self.rows(5) + self.rows(5)
+        summary = self.import_rows(rows)
+        self.assertEqual((summary["created"], summary["duplicates"]), (5, 5))
+
+        # One dedup lookup per batch, however many rows or collisions it has.
+        importer = LeadImporter(self.user)
+        with CaptureQueriesContext(connection) as small:
+            importer.import_rows(self.rows(2, mailbox="small") * 2)
+        with CaptureQueriesContext(connection) as large:
+            importer.import_rows(self.rows(40, mailbox="large") * 2)
+        self.assertEqual(len(small), len(large))
+
+    def test_bad_mode_and_seed_reimport(self):
+        response = self.auth_client.post("/api/leads/import/?mode=merge", {"leads": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        first = self.auth_client.post("/api/import/seed/").json()
+        second = self.auth_client.post("/api/import/seed/").json()
+        self.assertEqual(second["created"], [])
+        self.assertEqual(second["duplicates"], len(first["created"]))
+
+
+class CachedAuthenticationTests(AuthenticatedTestCase):
+    def test_repeat_requests_skip_the_user_query(self):
+        self.auth_client.get("/api/credits/transactions/")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.auth_client.get("/api/credits/transactions/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"api_user"', queries[0]["sql"])
+
+    def test_credit_changes_invalidate_the_cached_user(self):
+        self.auth_client.get("/api/auth/me/")
+        self.assertIsNotNone(user_cache.get(str(self.user.id), self.cached_version()))
+        with self.captureOnCommitCallbacks(execute=True):
+            debit_credits(self.user.id, 1)
+        self.assertIsNone(user_cache.get(str(self.user.id), self.cached_version()))
+        self.assertEqual(self.auth_client.get("/api/auth/me/").json()["credits"], 24)
+
+    def test_password_change_revokes_cached_tokens(self):
+        # override_settings cannot reach the api_settings simplejwt's modules imported.
+        with mock.patch.object(jwt_settings, "CHECK_REVOKE_TOKEN", True):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+            self.assertEqual(client.get("/api/auth/me/").status_code, status.HTTP_200_OK)
+            self.user.set_password("changed-pass")
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.save()
+            self.assertEqual(client.get("/api/auth/me/").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoke_check_is_off_by_default(self):
+        self.assertFalse(jwt_settings.CHECK_REVOKE_TOKEN)
+        self.assertNotIn("hash_password", AccessToken(self.token))
+
+    def test_lru_eviction_and_ttl(self):
+        users = UserCache(max_size=2, timeout=60)
+        users.set("1", "v", "one")
+        users.set("2", "v", "two")
+        users.get("1", "v")
+        users.set("3", "v", "three")
+        self.assertEqual((users.get("1", "v"), users.get("2", "v")), ("one", None))
+        self.assertIsNone(users.get("1", "other-version"))
+
+        expired = UserCache(max_size=2, timeout=0.01)
+        expired.set("1", "v", "one")
+        time.sleep(0.02)
+        self.assertIsNone(expired.get("1", "v"))
+
+    def cached_version(self):
+        return AccessToken(self.token).get("hash_password")
+
+
+class DatabaseProfileTests(SimpleTestCase):
+    def test_tuned_profile_sets_pragmas_and_persistent_connections(self):
+        with tempfile.TemporaryDirectory() as scratch:
+            database = apply_profile({**connection.settings_dict, "NAME": f"{scratch}/tuned.sqlite3"}, SQLITE_TUNED)
+            self.assertEqual(database["CONN_MAX_AGE"], 600)
+            self.assertEqual(database["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+            wrapper = SQLiteDatabaseWrapper(database, alias="tuned")
+            try:
+                with wrapper.cursor() as cursor:
+                    pragmas = {}
+                    for name in ("journal_mode", "synchronous", "busy_timeout"):
+                        cursor.execute(f"PRAGMA {name}")
+                        pragmas[name] = cursor.fetchone()[0]
+            finally:
+                wrapper.close()
+        self.assertEqual(pragmas, {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 5000})
+
+    def test_default_profile_is_unchanged_and_unknown_is_rejected(self):
+        self.assertEqual(apply_profile(connection.settings_dict, "default"), connection.settings_dict)
+        with self.assertRaises(ValueError):
+            apply_profile(connection.settings_dict, "turbo")
+
+
+METRICS_MIDDLEWARE = ["api.metrics.RequestMetricsMiddleware", *settings.MIDDLEWARE]
+
+
+@override_settings(API_METRICS_ENABLED=True, API_METRICS_TOKEN="", MIDDLEWARE=METRICS_MIDDLEWARE)
+class RequestMetricsTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        metrics_registry.reset()
+        Lead.objects.create(owner=self.user, name="Metered", industry="SaaS", location="Berlin", source="Seed")
+
+    def test_records_queries_and_timings_per_view(self):
+        self.auth_client.get("/api/leads/")
+        self.auth_client.get("/api/leads/")
+        observed = metrics_registry.snapshot("lead-list", "GET")
+        self.assertEqual(observed["duration"][0], 2)
+        self.assertGreaterEqual(observed["queries"][1], 2)
+        self.assertGreater(observed["sql"][1], 0)
+        self.assertGreater(observed["serialization"][1], 0)
+        self.assertLessEqual(observed["serialization"][1], observed["duration"][1])
+
+    def test_metrics_endpoint_renders_prometheus_text(self):
+        self.auth_client.get("/api/leads/")
+        response = self.client.get("/api/_metrics/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn("# TYPE api_request_sql_queries histogram", body)
+        self.assertIn('api_request_duration_seconds_count{view="lead-list",method="GET"} 1', body)
+        self.assertIn('api_request_sql_queries_bucket{view="lead-list",method="GET",le="+Inf"} 1', body)
+
+    def test_metrics_endpoint_is_off_by_default_and_honours_token(self):
+        with override_settings(API_METRICS_ENABLED=False):
+            self.assertEqual(self.client.get("/api/_metrics/").status_code, status.HTTP_404_NOT_FOUND)
+        with override_settings(API_METRICS_TOKEN="scrape"):
+            self.assertEqual(self.client.get("/api/_metrics/").status_code, status.HTTP_403_FORBIDDEN)
+            response = self.client.get("/api/_metrics/", HTTP_AUTHORIZATION="Bearer scrape")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class QueryBudgetTests(QueryBudgetMixin, AuthenticatedTestCase):
+    # Queries per request once the authenticated user is cached; these do not
+    # grow with the number of rows returned.
+    QUERY_BUDGETS = {
+        "/api/leads/": 2,
+        "/api/leads/?page_size=5": 2,
+        "/api/leads/search/?q=lead": 2,
+        # Data version plus three GROUP BYs and the totals, when uncached.
+        "/api/leads/facets/": 5,
+        "/api/leads/changes/": 3,
+        "/api/lists/": 2,
+        "/api/filters/": 2,
+        "/api/credits/transactions/": 1,
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.leads = Lead.objects.bulk_create(
+            Lead(owner=self.user, name=f"Lead {n}", industry="SaaS", location="Berlin", source="Seed")
+            for n in range(20)
+        )
+        self.saved_list = SavedList.objects.create(owner=self.user, name="Budgeted")
+        self.saved_list.leads.set(self.leads)
+        self.auth_client.get("/api/auth/me/")
+
+    def test_read_endpoints_stay_within_budget(self):
+        budgets = {**self.QUERY_BUDGETS, f"/api/lists/{self.saved_list.id}/members/": 3}
+        for url, budget in budgets.items():
+            with self.subTest(url=url), self.assertQueryBudget(budget):
+                response = self.auth_client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+
+    def test_over_budget_fails_with_the_queries_listed(self):
+        with self.assertRaisesMessage(AssertionError, "1 queries executed, budget is 0"):
+            with self.assertQueryBudget(0):
+                list(Lead.objects.filter(owner=self.user)[:1])
+
+
+class LoadBenchmarkTests(TransactionTestCase):
+    def test_suite_covers_every_scenario_over_both_in_process_transports(self):
+        data = seed(users=2, leads_per_user=20, import_rows=5)
+        report = run_suite(data, requests=4, warmup=1)
+        self.assertEqual(report["parameters"]["users"], 2)
+        measured = {(row["transport"], row["scenario"]) for row in report["results"]}
+        expected = {(transport, scenario) for transport in ("client", "asgi") for scenario in SCENARIOS}
+        self.assertEqual(measured, expected)
+        for row in report["results"]:
+            self.assertEqual((row["requests"], row["errors"]), (4, 0), row)
+            self.assertLessEqual(row["p50_ms"], row["p99_ms"])
+        # Unlocks and imports did real work rather than repeating no-ops.
+        self.assertEqual(Lead.objects.filter(email_unlocked=True).count(), 2 * (4 + 1))
+        self.assertEqual(Lead.objects.count(), 40 + 10 * 5)
+        json.dumps(report)
+
+    def test_percentile_and_regression_check(self):
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2)
+        self.assertEqual(percentile([1, 2, 3, 4], 99), 4)
+        baseline = {"results": [{"transport": "client", "scenario": "list", "p50_ms": 10.0, "p99_ms": 20.0}]}
+        current = {"results": [{"transport": "client", "scenario": "list", "p50_ms": 11.0, "p99_ms": 30.0}]}
+        self.assertEqual(compare_results(current, baseline, 0.2), ["client/list p99_ms: 20.000 -> 30.000 (+50%)"])
+        self.assertEqual(compare_results(current, baseline, 0.6), [])
+
+
+class AsyncViewTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        create_leads(self.user, 3, prefix="Async", industry="SaaS", location="Berlin", source="Seed")
+        self.headers = {"Authorization": f"Bearer {self.token}"}
+
+    async def test_list_matches_the_sync_endpoint_and_revalidates(self):
+        query = "?page_size=2&fields=id,name,created_at"
+        expected = await sync_to_async(lambda: self.auth_client.get(f"/api/leads/{query}").json())()
+        response = await self.async_client.get(f"/api/async/leads/{query}", headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(body["results"], expected["results"])
+        self.assertEqual(body["next_cursor"], expected["next_cursor"])
+
+        cached = await self.async_client.get(
+            f"/api/async/leads/{query}", headers={**self.headers, "If-None-Match": response["ETag"]}
+        )
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_export_streams_the_same_csv(self):
+        response = await self.async_client.get("/api/async/leads/export/?format=csv", headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual([row["name"] for row in rows], ["Async 2", "Async 1", "Async 0"])
+
+        unauthenticated = await self.async_client.get("/api/async/leads/export/")
+        self.assertEqual(unauthenticated.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_checkout_requests_overlap_on_one_event_loop(self):
+        delay = 0.3
+        with FakeStripeServer(delay=delay) as fake, override_settings(
+            STRIPE_SECRET_KEY="sk_test_async", STRIPE_API_BASE=fake.base_url
+        ):
+            started = time.perf_counter()
+            responses = await asyncio.gather(
+                *(
+                    self.async_client.post(
+                        "/api/async/credits/checkout/",
+                        {"amount": 100, "credits": 10},
+                        content_type="application/json",
+                        headers=self.headers,
+                    )
+                    for _ in range(8)
+                )
+            )
+            elapsed = time.perf_counter() - started
+        self.assertEqual([response.status_code for response in responses], [status.HTTP_200_OK] * 8)
+        self.assertTrue(responses[0].json()["id"].startswith("cs_test_"))
+        self.assertEqual(fake.sessions, 8)
+        # Serially this would take 8 x delay.
+        self.assertLess(elapsed, 4 * delay)
+
+    async def test_checkout_rejects_non_numeric_amounts(self):
+        for payload in ({"amount": "ten", "credits": 10}, {"amount": 100, "credits": None}):
+            response = await self.async_client.post(
+                "/api/async/credits/checkout/", payload, content_type="application/json", headers=self.headers
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET="whsec_test")
+class StripeWebhookTests(AuthenticatedTestCase):
+    def deliver(self, event, secret="whsec_test"):
+        payload = json.dumps(event)
+        return self.client.post(
+            "/api/credits/webhook/",
+            payload,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=sign_payload(payload, secret),
+        )
+
+    def test_paid_session_credits_once_across_redeliveries(self):
+        event = checkout_event("cs_test_once", self.user.id, 40)
+        first = self.deliver(event)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertTrue(first.json()["credited"])
+        # A redelivery and a second event for the same session are acknowledged but not credited.
+        self.assertFalse(self.deliver(event).json()["credited"])
+        followup = checkout_event(
+            "cs_test_once", self.user.id, 40, event_type="checkout.session.async_payment_succeeded"
+        )
+        self.assertFalse(self.deliver(followup).json()["credited"])
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.credits, 25 + 40)
+        self.assertEqual(CreditTransaction.objects.filter(owner=self.user, amount=40).count(), 1)
+        self.assertEqual(StripeEvent.objects.count(), 1)
+
+    def test_rejects_bad_signatures_and_skips_unpaid_sessions(self):
+        event = checkout_event("cs_test_forged", self.user.id, 1000)
+        self.assertEqual(self.deliver(event, secret="whsec_wrong").status_code, status.HTTP_400_BAD_REQUEST)
+        unsigned = self.client.post("/api/credits/webhook/", json.dumps(event), content_type="application/json")
+        self.assertEqual(unsigned.status_code, status.HTTP_400_BAD_REQUEST)
+
+        garbage = b"\xff\xfe{not utf-8"
+        response = self.client.post(
+            "/api/credits/webhook/",
+            garbage,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=sign_payload(garbage.decode("latin-1"), "whsec_test"),
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        unpaid = checkout_event("cs_test_unpaid", self.user.id, 30, payment_status="unpaid")
+        self.assertFalse(self.deliver(unpaid).json()["credited"])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.credits, 25)
+
+    def test_confirm_reports_webhook_credit_without_trusting_the_client(self):
+        confirm = {"session_id": "cs_test_confirm", "credits": 500}
+        pending = self.auth_client.post("/api/credits/confirm/", confirm, format="json").json()
+        self.assertEqual(pending, {"credited": False, "added": 0, "credits": 25})
+
+        self.deliver(checkout_event("cs_test_confirm", self.user.id, 20))
+        done = self.auth_client.post("/api/credits/confirm/", confirm, format="json").json()
+        self.assertEqual(done, {"credited": True, "added": 20, "credits": 45})
+
+
+class ConcurrentStripeWebhookTests(TransactionTestCase):
+    @override_settings(STRIPE_WEBHOOK_SECRET="whsec_test")
+    def test_concurrent_duplicate_deliveries_credit_once(self):
+        user = User.objects.create_user(email="webhook@example.com", password="pass1234")
+        payload = json.dumps(checkout_event("cs_test_race", user.id, 10))
+
+        def deliver(_):
+            try:
+                return APIClient().post(
+                    "/api/credits/webhook/",
+                    payload,
+                    content_type="application/json",
+                    HTTP_STRIPE_SIGNATURE=sign_payload(payload, "whsec_test"),
+                ).json()["credited"]
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            credited = list(pool.map(deliver, range(8)))
+
+        self.assertEqual(credited.count(True), 1)
+        user.refresh_from_db()
+        self.assertEqual(user.credits, 25 + 10)
+        self.assertEqual(StripeEvent.objects.count(), 1)
+
+
+class SeedDatasetTests(AuthenticatedTestCase):
+    def setUp(self):
+        super().setUp()
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        self.seed_path = Path(scratch.name) / "seed.csv"
+        self.write_seed(
+            [
+                "Ada,Technology,UK,ada@example.com,555-0001",
+                "Bob,Finance,US,bob@example.com,555-0002",
+                "Ada again,Technology,UK,ada@example.com,555-0001",
+                ",Retail,US,nameless@example.com,555-0003",
+            ]
+        )
+        override = override_settings(
+            SEED_CSV_PATH=str(self.seed_path), SEED_CACHE_DIR=str(Path(scratch.name) / "cache")
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        clear_seed_cache()
+        self.addCleanup(clear_seed_cache)
+
+    def write_seed(self, lines):
+        self.seed_path.write_text("\n".join(["name,industry,location,email,phone", *lines]) + "\n")
+
+    def test_seed_rows_are_validated_once_and_reused(self):
+        dataset = load_seed_dataset()
+        self.assertEqual(dataset.row_count, 4)
+        self.assertEqual([row["name"] for row in dataset.rows], ["Ada", "Bob", "Ada again"])
+        self.assertEqual(dataset.error_count, 1)
+        self.assertIs(load_seed_dataset(), dataset)
+
+        response = self.auth_client.post("/api/import/seed/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual([lead["name"] for lead in data["created"]], ["Ada", "Bob"])
+        self.assertEqual((data["processed"], data["duplicates"], data["error_count"]), (4, 1, 1))
+        self.assertEqual(data["errors"][0]["index"], 3)
+        self.assertIn("name", data["errors"][0]["errors"])
+        self.assertEqual(set(Lead.objects.filter(owner=self.user).values_list("source", flat=True)), {"seed"})
+
+    def test_new_account_is_seeded_with_one_insert(self):
+        load_seed_dataset()
+        with CaptureQueriesContext(connection) as queries:
+            self.auth_client.post("/api/import/seed/")
+        inserts = [query["sql"] for query in queries if query["sql"].startswith('INSERT INTO "api_lead"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(Lead.objects.filter(owner=self.user).count(), 2)
+
+    def test_other_processes_load_the_pickle_and_edits_invalidate_it(self):
+        load_seed_dataset()
+        pickled = cache_path(file_digest(self.seed_path))
+        self.assertTrue(pickled.exists())
+
+        # A fresh process finds the pickle by the file's hash instead of parsing again.
+        with pickled.open("wb") as f:
+            pickle.dump(SeedDataset(({"name": "From disk", "industry": "X", "location": "Y"},), 1, 0, []), f)
+        clear_seed_cache()
+        self.assertEqual(load_seed_dataset().rows[0]["name"], "From disk")
+
+        self.write_seed(["Cy,Health,FR,cy@example.com,555-0004"])
+        self.assertEqual([row["name"] for row in load_seed_dataset().rows], ["Cy"])
@@ -1,15 +1,45 @@
 from rest_framework import routers
 from django.urls import path, include
-from .views import LeadViewSet, SavedListViewSet, SavedFilterViewSet, UnlockView, ImportLeadsView, ExportLeadsView
+from .async_views import AsyncExportLeadsView, AsyncLeadListView
+from .views import (
+    BatchUnlockView,
+    CreditBalanceView,
+    CreditTransactionViewSet,
+    ExportLeadsView,
+    ImportJobViewSet,
+    ImportLeadsCSVView,
+    ImportLeadsView,
+    LeadChangesView,
+    LeadFacetsView,
+    LeadSearchView,
+    LeadViewSet,
+    MetricsView,
+    SavedFilterViewSet,
+    SavedListViewSet,
+    UnlockView,
+)
 
 router = routers.DefaultRouter()
 router.register(r"leads", LeadViewSet, basename="lead")
 router.register(r"lists", SavedListViewSet, basename="savedlist")
 router.register(r"filters", SavedFilterViewSet, basename="savedfilter")
+router.register(r"import/jobs", ImportJobViewSet, basename="importjob")
+router.register(r"credits/transactions", CreditTransactionViewSet, basename="credittransaction")
 
+# Explicit routes go before the router so "leads/<pk>/" does not swallow them.
 urlpatterns = [
-    path("", include(router.urls)),
     path("leads/unlock/", UnlockView.as_view(), name="unlock"),
+    path("leads/unlock/batch/", BatchUnlockView.as_view(), name="unlock_batch"),
     path("leads/import/", ImportLeadsView.as_view(), name="import"),
+    path("leads/import/csv/", ImportLeadsCSVView.as_view(), name="import_csv"),
     path("leads/export/", ExportLeadsView.as_view(), name="export"),
+    path("leads/search/", LeadSearchView.as_view(), name="lead_search"),
+    path("leads/facets/", LeadFacetsView.as_view(), name="lead_facets"),
+    path("leads/changes/", LeadChangesView.as_view(), name="lead_changes"),
+    path("credits/balance/", CreditBalanceView.as_view(), name="credit_balance"),
+    path("_metrics/", MetricsView.as_view(), name="metrics"),
+    # Async variants for ASGI deployments; see api.async_views.
+    path("async/leads/", AsyncLeadListView.as_view(), name="async_lead_list"),
+    path("async/leads/export/", AsyncExportLeadsView.as_view(), name="async_export"),
+    path("", include(router.urls)),
 ]
@@ -0,0 +1,75 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from rest_framework import status
+from rest_framework.response import Response
+
+User = get_user_model()
+
+
+def bump_data_version(owner_id):
+    """Invalidate every ETag derived from the owner's data; call inside the writing transaction."""
+    User.objects.filter(id=owner_id).update(data_version=F("data_version") + 1)
+
+
+def leads_changed(owner_id):
+    """Everything that has to happen after the owner's leads were written."""
+    # Facet counts and ETags are both keyed on the version.
+    bump_data_version(owner_id)
+
+
+def current_data_version(owner_id):
+    return User.objects.filter(pk=owner_id).values_list("data_version", flat=True).get()
+
+
+def owner_etag(request):
+    """
+    Weak ETag for ``request`` from the requesting user's data version.
+
+    The version is read with one primary-key lookup rather than taken from
+    ``request.user``, which may come from another process's auth cache
+    (api.authentication). The path, query string and Accept header are
+    folded in because they change the representation.
+    """
+    version = current_data_version(request.user.pk)
+    variant = "|".join([request.get_full_path(), request.META.get("HTTP_ACCEPT", "")])
+    digest = hashlib.sha1(variant.encode("utf-8")).hexdigest()[:16]
+    return f'W/"{request.user.pk}.{version}.{digest}"'
+
+
+def etag_matches(request, etag):
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class OwnerETagMixin:
+    """
+    Conditional GET for owner-scoped viewsets.
+
+    A matching ``If-None-Match`` returns 304 before the queryset or the
+    serializer runs.
+    """
+
+    def finalize_etag(self, response, etag):
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    def conditional(self, request, render):
+        etag = owner_etag(request)
+        if etag_matches(request, etag):
+            return self.finalize_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+        response = render()
+        if response.status_code == status.HTTP_200_OK:
+            self.finalize_etag(response, etag)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(request, lambda: super(OwnerETagMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(request, lambda: super(OwnerETagMixin, self).retrieve(request, *args, **kwargs))
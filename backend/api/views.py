@@ -1,25 +1,51 @@
-import csv
-from io import StringIO
 from pathlib import Path
 
-import stripe
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.http import HttpResponse
+from django.db.models import Count
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import Lead, SavedList, SavedFilter, CreditTransaction
+from .changes import get_lead_changes
+from .credits import UNLOCK_COSTS, UNLOCK_FIELDS, balance_at, current_credits, debit_credits
+from .columnar import encode_columns
+from .exports import CSV_FIELDS, iter_formatted_rows, streaming_csv_response, streaming_ndjson_response
+from .facets import get_lead_facets
+from .filters import filter_leads
+from .importers import LeadImporter, get_import_mode, iter_csv_rows, open_text_upload
+from .jobs import enqueue_csv_file, enqueue_rows, enqueue_upload, wants_background
+from .metrics import registry as metrics_registry
+from .models import Lead, SavedList, SavedFilter, CreditTransaction, ImportJob, StripeEvent
+from .pagination import CreditTransactionPagination, LeadPagination, ListMemberPagination
+from .payments import create_checkout_session
+from .renderers import CSVRenderer, NDJSONRenderer, columnar_renderers
+from .representations import get_requested_fields, lead_values, represent_leads, serialize_leads
+from .search import search_lead_values
+from .seed import SEED_DEFAULTS, load_seed_dataset
 from .serializers import (
+    CreditSnapshotSerializer,
+    CreditTransactionSerializer,
+    ImportJobSerializer,
     LeadSerializer,
+    ListMembershipDeltaSerializer,
     SavedFilterSerializer,
     SavedListSerializer,
+    SavedListSummarySerializer,
     RegisterSerializer,
     UserSerializer,
 )
+from .versioning import OwnerETagMixin, bump_data_version, leads_changed
+from .webhooks import InvalidWebhook, parse_event, process_event
 
 User = get_user_model()
 
@@ -44,24 +70,133 @@ class RegisterView(APIView):
 
 class ProfileView(APIView):
     def get(self, request):
+        # request.user may come from the auth cache; credits must be current.
+        request.user.refresh_from_db(fields=["credits"])
         return Response(UserSerializer(request.user).data)
 
 
-class LeadViewSet(viewsets.ModelViewSet):
+class LeadViewSet(OwnerETagMixin, viewsets.ModelViewSet):
     serializer_class = LeadSerializer
+    pagination_class = LeadPagination
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, *columnar_renderers()]
 
     def get_queryset(self):
-        return Lead.objects.filter(owner=self.request.user).order_by("-created_at")
+        queryset = Lead.objects.filter(owner=self.request.user).order_by("-created_at", "-id")
+        if self.action == "list":
+            queryset = filter_leads(queryset, self.request)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(request, lambda: self.list_values(request))
+
+    def list_values(self, request):
+        # Read-only fast path: values() rows shaped like LeadSerializer output,
+        # narrowed to ?fields= (the cursor columns are always read).
+        fields = get_requested_fields(request)
+        queryset = lead_values(self.filter_queryset(self.get_queryset()), fields, extra=("created_at", "id"))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(represent_leads(page, fields))
+        return Response(represent_leads(queryset, fields))
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
 
-class SavedListViewSet(viewsets.ModelViewSet):
+class LeadSearchView(APIView):
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"detail": "Query parameter q is required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(request.query_params.get("limit", settings.API_PAGE_SIZE))
+        except ValueError:
+            return Response({"detail": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+        fields = get_requested_fields(request)
+        rows = search_lead_values(request.user.id, query, limit, fields)
+        return Response(represent_leads(rows, fields))
+
+
+class LeadFacetsView(APIView):
+    """Counts by industry, location, source and unlock state for the filter sidebar."""
+
+    def get(self, request):
+        return Response(get_lead_facets(request.user.id))
+
+
+class LeadChangesView(APIView):
+    """
+    Delta sync: leads written and ids deleted since ``?since=<cursor>``.
+
+    Send the returned ``cursor`` on the next poll; while ``has_more`` is true
+    there is a backlog to drain. See :mod:`api.changes`.
+    """
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", settings.API_PAGE_SIZE))
+        except ValueError:
+            return Response({"detail": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, settings.API_MAX_PAGE_SIZE))
+        changes = get_lead_changes(request.user.id, request.query_params.get("since"), limit)
+        changes["changed"] = LeadSerializer(changes["changed"], many=True).data
+        return Response(changes)
+
+
+class SavedListViewSet(OwnerETagMixin, viewsets.ModelViewSet):
     serializer_class = SavedListSerializer
 
     def get_queryset(self):
-        return SavedList.objects.filter(owner=self.request.user).prefetch_related("leads")
+        queryset = SavedList.objects.filter(owner=self.request.user)
+        if self.action == "list":
+            # Count members in SQL instead of loading every member id.
+            queryset = queryset.annotate(lead_count=Count("leads")).order_by("created_at", "id")
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return SavedListSummarySerializer
+        return super().get_serializer_class()
+
+    @action(detail=True, methods=["get", "post"])
+    def members(self, request, pk=None):
+        """
+        GET pages through the list's leads; POST applies ``{add, remove}``.
+
+        A delta validates only the ids being added, with one ``IN`` query
+        against the user's leads, and touches only the affected through rows.
+        """
+        saved_list = self.get_object()
+        if request.method == "GET":
+            paginator = ListMemberPagination()
+            members = Lead.objects.filter(lists=saved_list)
+            page = paginator.paginate_queryset(members, request, view=self)
+            return paginator.get_paginated_response(LeadSerializer(page, many=True).data)
+
+        serializer = ListMembershipDeltaSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        add = serializer.validated_data["add"]
+        remove = serializer.validated_data["remove"]
+
+        owned = set(Lead.objects.filter(owner=request.user, id__in=add).values_list("id", flat=True))
+        invalid = [lead_id for lead_id in add if lead_id not in owned]
+        if invalid:
+            return Response({"add": ["Invalid lead ids"], "invalid": invalid}, status=status.HTTP_400_BAD_REQUEST)
+
+        membership = SavedList.leads.through.objects.filter(savedlist_id=saved_list.id)
+        with transaction.atomic():
+            removed = membership.filter(lead_id__in=remove).delete()[0] if remove else 0
+            existing = set(membership.filter(lead_id__in=add).values_list("lead_id", flat=True))
+            new_rows = [
+                SavedList.leads.through(savedlist_id=saved_list.id, lead_id=lead_id)
+                for lead_id in add
+                if lead_id not in existing
+            ]
+            SavedList.leads.through.objects.bulk_create(new_rows, batch_size=settings.IMPORT_BATCH_SIZE)
+            if removed or new_rows:
+                bump_data_version(request.user.id)
+        return Response({"added": len(new_rows), "removed": removed, "lead_count": membership.count()})
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -70,7 +205,7 @@ class SavedListViewSet(viewsets.ModelViewSet):
         serializer.save(owner=self.request.user)
 
 
-class SavedFilterViewSet(viewsets.ModelViewSet):
+class SavedFilterViewSet(OwnerETagMixin, viewsets.ModelViewSet):
     serializer_class = SavedFilterSerializer
 
     def get_queryset(self):
@@ -87,46 +222,171 @@ class UnlockView(APIView):
     def post(self, request):
         lead_id = request.data.get("lead_id")
         unlock_type = request.data.get("type")
-        cost_map = {"email": 1, "phone": 2}
-        if unlock_type not in cost_map:
+        if unlock_type not in UNLOCK_COSTS:
             return Response({"detail": "Invalid unlock type"}, status=status.HTTP_400_BAD_REQUEST)
 
+        leads = Lead.objects.filter(owner=request.user)
         try:
-            lead = Lead.objects.get(id=lead_id, owner=request.user)
-        except Lead.DoesNotExist:
+            lead = leads.get(id=lead_id)
+        except (Lead.DoesNotExist, ValueError, TypeError):
             return Response({"detail": "Lead not found"}, status=status.HTTP_404_NOT_FOUND)
 
+        user = request.user
+        cost = UNLOCK_COSTS[unlock_type]
+        field = UNLOCK_FIELDS[unlock_type]
         with transaction.atomic():
-            user = request.user
-            cost = cost_map[unlock_type]
-            if user.credits < cost:
-                return Response({"detail": "Insufficient credits"}, status=status.HTTP_400_BAD_REQUEST)
+            # Flip the flag only if it is still locked: of several concurrent
+            # requests for the same field exactly one sees a row updated, and
+            # only that one pays. Re-unlocking is free.
+            flipped = leads.filter(id=lead.id, **{field: False}).update(
+                **{field: True}, updated_at=timezone.now()
+            )
+            if flipped:
+                leads_changed(user.id)
+                if not debit_credits(user.id, cost):
+                    transaction.set_rollback(True)
+                    return Response({"detail": "Insufficient credits"}, status=status.HTTP_400_BAD_REQUEST)
+                CreditTransaction.objects.create(owner=user, amount=-cost, description=f"Unlock {unlock_type}")
+
+        lead.refresh_from_db()
+        user.credits = current_credits(user.id)
+        return Response({
+            "lead": LeadSerializer(lead).data,
+            "credits": user.credits,
+        })
+
+
+class BatchUnlockView(APIView):
+    """
+    Unlock one field on many leads with a single debit and ledger entry.
+
+    ``mode=all`` (default) unlocks everything or nothing; ``mode=partial``
+    unlocks as many leads as the balance covers, in request order. Leads that
+    are already unlocked are returned but not charged.
+    """
+
+    def post(self, request):
+        unlock_type = request.data.get("type")
+        lead_ids = request.data.get("lead_ids")
+        mode = request.data.get("mode", "all")
+        if unlock_type not in UNLOCK_COSTS:
+            return Response({"detail": "Invalid unlock type"}, status=status.HTTP_400_BAD_REQUEST)
+        if mode not in ("all", "partial"):
+            return Response({"detail": "mode must be all or partial"}, status=status.HTTP_400_BAD_REQUEST)
+        if not isinstance(lead_ids, list) or not lead_ids:
+            return Response({"detail": "lead_ids must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(lead_ids) > settings.UNLOCK_BATCH_MAX_SIZE:
+            return Response(
+                {"detail": f"At most {settings.UNLOCK_BATCH_MAX_SIZE} leads per batch"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            lead_ids = list(dict.fromkeys(int(lead_id) for lead_id in lead_ids))
+        except (TypeError, ValueError):
+            return Response({"detail": "lead_ids must be integers"}, status=status.HTTP_400_BAD_REQUEST)
 
-            user.credits -= cost
-            user.save(update_fields=["credits"])
-            if unlock_type == "email":
-                lead.email_unlocked = True
-            else:
-                lead.phone_unlocked = True
-            lead.save(update_fields=["email_unlocked", "phone_unlocked"])
-            CreditTransaction.objects.create(owner=user, amount=-cost, description=f"Unlock {unlock_type}")
+        user = request.user
+        unit_cost = UNLOCK_COSTS[unlock_type]
+        field = UNLOCK_FIELDS[unlock_type]
+        leads = Lead.objects.filter(owner=user)
 
+        with transaction.atomic():
+            # Serialize batch unlocks per user (a row lock on Postgres; SQLite
+            # runs one write transaction at a time).
+            balance = User.objects.select_for_update().values_list("credits", flat=True).get(id=user.id)
+            state = dict(leads.filter(id__in=lead_ids).values_list("id", field))
+            not_found = [lead_id for lead_id in lead_ids if lead_id not in state]
+            if not_found and mode == "all":
+                return Response(
+                    {"detail": "Lead not found", "not_found": not_found}, status=status.HTTP_404_NOT_FOUND
+                )
+            locked = [lead_id for lead_id in lead_ids if state.get(lead_id) is False]
+            already_unlocked = [lead_id for lead_id in lead_ids if state.get(lead_id) is True]
+
+            if mode == "all" and len(locked) * unit_cost > balance:
+                return Response({"detail": "Insufficient credits"}, status=status.HTTP_400_BAD_REQUEST)
+            chosen = locked[: balance // unit_cost]
+            skipped = locked[len(chosen):]
+
+            unlocked = []
+            if chosen:
+                # Lock and flip only the rows still locked now: a concurrent
+                # /unlock/ may have flipped some since the read above, and
+                # those are reported as already unlocked rather than charged.
+                still_locked = set(
+                    leads.select_for_update()
+                    .filter(id__in=chosen, **{field: False})
+                    .values_list("id", flat=True)
+                )
+                unlocked = [lead_id for lead_id in chosen if lead_id in still_locked]
+                already_unlocked += [lead_id for lead_id in chosen if lead_id not in still_locked]
+            if unlocked:
+                leads.filter(id__in=unlocked).update(**{field: True}, updated_at=timezone.now())
+                leads_changed(user.id)
+            charged = len(unlocked) * unit_cost
+            if charged:
+                if not debit_credits(user.id, charged):
+                    transaction.set_rollback(True)
+                    return Response({"detail": "Insufficient credits"}, status=status.HTTP_400_BAD_REQUEST)
+                CreditTransaction.objects.create(
+                    owner=user, amount=-charged, description=f"Unlock {unlock_type} x{len(unlocked)}"
+                )
+
+        user.credits = current_credits(user.id)
         return Response({
-            "lead": LeadSerializer(lead).data,
+            "leads": LeadSerializer(leads.filter(id__in=lead_ids).order_by("id"), many=True).data,
             "credits": user.credits,
+            "charged": charged,
+            "unlocked": unlocked,
+            "already_unlocked": already_unlocked,
+            "skipped": skipped,
+            "not_found": not_found,
         })
 
 
 class ImportLeadsView(APIView):
     def post(self, request):
         leads_data = request.data.get("leads", [])
-        created = []
-        for lead in leads_data:
-            serializer = LeadSerializer(data=lead)
-            serializer.is_valid(raise_exception=True)
-            serializer.save(owner=request.user)
-            created.append(serializer.data)
-        return Response({"created": created})
+        if not isinstance(leads_data, list):
+            return Response({"detail": "leads must be a list"}, status=status.HTTP_400_BAD_REQUEST)
+        mode = get_import_mode(request)
+        if wants_background(request):
+            job = enqueue_rows(request.user, leads_data, mode=mode)
+            return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+        importer = LeadImporter(request.user, mode=mode)
+        with transaction.atomic():
+            summary = importer.import_rows(leads_data)
+        return Response(summary)
+
+
+class ImportLeadsCSVView(APIView):
+    """
+    Multipart CSV import that never holds the file in memory.
+
+    Django spools large uploads to a temporary file; the rows are then parsed
+    with ``csv.reader`` straight off that file and written in
+    ``IMPORT_BATCH_SIZE`` batches, each committed as it completes.
+    """
+
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response({"detail": "Upload a CSV file in the file field"}, status=status.HTTP_400_BAD_REQUEST)
+        mode = get_import_mode(request)
+        if wants_background(request):
+            job = enqueue_upload(request.user, upload, mode=mode)
+            return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+        importer = LeadImporter(request.user, mode=mode)
+        stream = open_text_upload(upload)
+        try:
+            summary = importer.import_rows(iter_csv_rows(stream), atomic_batches=True)
+        finally:
+            stream.detach()
+        return Response(summary)
 
 
 class SeedImportView(APIView):
@@ -134,42 +394,105 @@ class SeedImportView(APIView):
         seed_path = Path(settings.SEED_CSV_PATH)
         if not seed_path.exists():
             return Response({"detail": "Seed CSV not found"}, status=status.HTTP_404_NOT_FOUND)
+        mode = get_import_mode(request)
+        if wants_background(request):
+            job = enqueue_csv_file(request.user, seed_path, row_defaults=SEED_DEFAULTS, mode=mode)
+            return Response(ImportJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+        # Parsed and validated once per version of the file (api.seed).
+        dataset = load_seed_dataset(seed_path)
+        importer = LeadImporter(request.user, mode=mode)
+        with transaction.atomic():
+            created = dataset.import_into(importer)
+        summary = importer.summary()
+        # "created" stays the list of new leads, as the client expects.
+        summary["created"] = LeadSerializer(created, many=True).data
+        return Response(summary)
+
 
-        with seed_path.open() as f:
-            reader = csv.DictReader(f)
-            created = []
-            for row in reader:
-                payload = {
-                    "name": row.get("name", ""),
-                    "industry": row.get("industry", ""),
-                    "location": row.get("location", ""),
-                    "email": row.get("email", ""),
-                    "phone": row.get("phone", ""),
-                    "website": row.get("website", ""),
-                    "source": row.get("source", "seed"),
-                }
-                serializer = LeadSerializer(data=payload)
-                serializer.is_valid(raise_exception=True)
-                serializer.save(owner=request.user)
-                created.append(serializer.data)
-        return Response({"created": created})
+class ImportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Progress of queued imports; POST any import with ``?async=1`` to create one."""
+
+    serializer_class = ImportJobSerializer
+
+    def get_queryset(self):
+        return ImportJob.objects.filter(owner=self.request.user).order_by("-created_at", "-id")
 
 
 class ExportLeadsView(APIView):
+    """
+    Export the user's leads, narrowed by the same filter params as the list.
+
+    ``format=csv`` and ``format=ndjson`` stream rows from a server-side
+    iterator, so memory stays flat however many leads the user has.
+    ``format=columnar`` (and ``format=msgpack`` when installed) send one array
+    per field, built straight from row tuples.
+    """
+
+    renderer_classes = [
+        *api_settings.DEFAULT_RENDERER_CLASSES,
+        CSVRenderer,
+        NDJSONRenderer,
+        *columnar_renderers(),
+    ]
+
     def get(self, request):
-        leads = Lead.objects.filter(owner=request.user)
-        serializer = LeadSerializer(leads, many=True)
-        format_type = request.query_params.get("format", "json")
+        leads = filter_leads(Lead.objects.filter(owner=request.user), request).order_by("-created_at", "-id")
+        format_type = request.accepted_renderer.format
         if format_type == "csv":
-            output = StringIO()
-            writer = csv.DictWriter(output, fieldnames=["name", "industry", "location", "email", "phone", "website", "source", "email_unlocked", "phone_unlocked"])
-            writer.writeheader()
-            for lead in serializer.data:
-                writer.writerow(lead)
-            response = HttpResponse(output.getvalue(), content_type="text/csv")
-            response["Content-Disposition"] = "attachment; filename=leads.csv"
-            return response
-        return Response(serializer.data)
+            return streaming_csv_response(leads, get_requested_fields(request, default=CSV_FIELDS))
+        if format_type == "ndjson":
+            return streaming_ndjson_response(leads, get_requested_fields(request))
+        fields = get_requested_fields(request)
+        if format_type in ("columnar", "msgpack"):
+            return Response(encode_columns(iter_formatted_rows(leads, fields), fields))
+        return Response(serialize_leads(leads, fields))
+
+
+class CreditTransactionViewSet(viewsets.ReadOnlyModelViewSet):
+    """The user's credit ledger, newest first, in keyset pages."""
+
+    serializer_class = CreditTransactionSerializer
+    pagination_class = CreditTransactionPagination
+
+    def get_queryset(self):
+        return CreditTransaction.objects.filter(owner=self.request.user).order_by("-created_at", "-id")
+
+
+class CreditBalanceView(APIView):
+    """Ledger balance now or at ``?at=<ISO datetime>``, rebuilt from the nearest snapshot."""
+
+    def get(self, request):
+        at = request.query_params.get("at")
+        when = None
+        if at:
+            when = parse_datetime(at)
+            if when is None:
+                return Response({"detail": "at must be an ISO 8601 datetime"}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(when):
+                when = timezone.make_aware(when)
+        balance, snapshot = balance_at(request.user.id, when)
+        return Response({
+            "balance": balance,
+            "at": when or timezone.now(),
+            "snapshot": CreditSnapshotSerializer(snapshot).data if snapshot else None,
+        })
+
+
+class MetricsView(APIView):
+    """Prometheus text for the request metrics; 404 unless ``API_METRICS_ENABLED``."""
+
+    # Scrapers authenticate with API_METRICS_TOKEN, not a user JWT.
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        if not settings.API_METRICS_ENABLED:
+            raise Http404
+        token = settings.API_METRICS_TOKEN
+        if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return Response({"detail": "Invalid metrics token"}, status=status.HTTP_403_FORBIDDEN)
+        return HttpResponse(metrics_registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 class StripeCheckoutView(APIView):
@@ -181,42 +504,44 @@ class StripeCheckoutView(APIView):
         if not settings.STRIPE_SECRET_KEY:
             return Response({"detail": "Stripe secret key missing"}, status=status.HTTP_400_BAD_REQUEST)
 
-        stripe.api_key = settings.STRIPE_SECRET_KEY
-        # Apple Pay is enabled by Stripe automatically when using card-based
-        # payment methods and a verified domain. Using automatic payment
-        # methods keeps the configuration minimal for the beginner-friendly
-        # setup requested by the user.
-        session = stripe.checkout.Session.create(
-            mode="payment",
-            automatic_payment_methods={"enabled": True},
-            line_items=[
-                {
-                    "price_data": {
-                        "currency": "usd",
-                        "unit_amount": amount,
-                        "product_data": {"name": f"Credit top-up ({credits} credits)"},
-                    },
-                    "quantity": 1,
-                }
-            ],
-            success_url=f"{settings.PAYMENT_SUCCESS_URL}?session_id={{CHECKOUT_SESSION_ID}}&credits={credits}",
-            cancel_url=settings.PAYMENT_CANCEL_URL,
-            automatic_tax={"enabled": False},
-        )
+        session = create_checkout_session(request.user.id, amount, credits)
         return Response({"id": session.id, "url": session.url})
 
 
 class StripeConfirmView(APIView):
+    """
+    Report whether a Checkout Session has been credited yet.
+
+    Credits are only added by the signed webhook (:class:`StripeWebhookView`);
+    the client polls this after Stripe redirects back. The ``credits`` the
+    client sends are ignored.
+    """
+
     def post(self, request):
-        credits = int(request.data.get("credits", 0))
         session_id = request.data.get("session_id")
-        if credits <= 0 or not session_id:
-            return Response({"detail": "Missing session or credits"}, status=status.HTTP_400_BAD_REQUEST)
+        if not session_id:
+            return Response({"detail": "Missing session"}, status=status.HTTP_400_BAD_REQUEST)
+        event = StripeEvent.objects.filter(session_id=session_id, owner=request.user).only("credits").first()
+        return Response({
+            "credited": event is not None,
+            "added": event.credits if event else 0,
+            "credits": current_credits(request.user.id),
+        })
 
-        # In lieu of webhooks, we trust the client in this minimal setup.
-        with transaction.atomic():
-            user = request.user
-            user.credits += credits
-            user.save(update_fields=["credits"])
-            CreditTransaction.objects.create(owner=user, amount=credits, description=f"Top-up via session {session_id}")
-        return Response({"credits": user.credits})
+
+class StripeWebhookView(APIView):
+    """Stripe's webhook endpoint; see :mod:`api.webhooks`."""
+
+    # Stripe signs the payload instead of sending a user JWT.
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        if not settings.STRIPE_WEBHOOK_SECRET:
+            return Response({"detail": "Stripe webhook secret missing"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            event = parse_event(request.body, request.headers.get("Stripe-Signature"))
+        except InvalidWebhook as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        # Duplicates are acknowledged too, or Stripe keeps retrying them.
+        return Response({"received": True, "credited": process_event(event)})
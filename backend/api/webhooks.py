@@ -0,0 +1,98 @@
+"""
+Stripe webhooks: the only path that adds purchased credits.
+
+Every delivery is verified against ``STRIPE_WEBHOOK_SECRET`` before it is
+read. A paid Checkout Session credits the user named in its
+``client_reference_id`` with the ``credits`` in its metadata; both are set
+server-side when the session is created (api.payments).
+
+Stripe delivers at least once and may retry concurrently, so credits are
+applied in the same transaction as the insert into ``StripeEvent``, whose
+unique ``event_id`` and ``session_id`` make a duplicate fail before
+anything is credited.
+"""
+
+import json
+
+import stripe
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+
+from .credits import add_credits
+from .models import CreditTransaction, StripeEvent
+
+User = get_user_model()
+
+CREDIT_EVENTS = {"checkout.session.completed", "checkout.session.async_payment_succeeded"}
+
+
+class InvalidWebhook(Exception):
+    pass
+
+
+def parse_event(payload, signature):
+    """Verify the ``Stripe-Signature`` header and return the event as a dict."""
+    try:
+        # UnicodeDecodeError is a ValueError: a non-UTF-8 body is an invalid payload.
+        text = payload.decode("utf-8") if isinstance(payload, bytes) else payload
+        stripe.WebhookSignature.verify_header(text, signature, settings.STRIPE_WEBHOOK_SECRET)
+        event = json.loads(text)
+    except stripe.SignatureVerificationError:
+        raise InvalidWebhook("Invalid signature")
+    except ValueError:
+        raise InvalidWebhook("Invalid payload")
+    if not isinstance(event, dict) or not event.get("id") or not event.get("type"):
+        raise InvalidWebhook("Invalid payload")
+    return event
+
+
+def credit_for(event):
+    """``(user id, credits, session id)`` when ``event`` pays for credits, else None."""
+    if event["type"] not in CREDIT_EVENTS:
+        return None
+    session = (event.get("data") or {}).get("object") or {}
+    if session.get("payment_status") != "paid":
+        # Delayed methods complete unpaid; async_payment_succeeded follows.
+        return None
+    try:
+        user_id = int(session.get("client_reference_id"))
+        credits = int((session.get("metadata") or {}).get("credits"))
+    except (TypeError, ValueError):
+        return None
+    if credits <= 0 or not session.get("id"):
+        return None
+    return user_id, credits, session["id"]
+
+
+def process_event(event):
+    """
+    Record ``event`` and apply its credits, exactly once.
+
+    Returns True when this call credited the account, False for events that
+    carry no credits and for duplicates.
+    """
+    credit = credit_for(event)
+    if credit is not None and not User.objects.filter(id=credit[0]).exists():
+        credit = None
+    try:
+        with transaction.atomic():
+            if credit is None:
+                StripeEvent.objects.create(event_id=event["id"], event_type=event["type"])
+                return False
+            user_id, credits, session_id = credit
+            StripeEvent.objects.create(
+                event_id=event["id"],
+                event_type=event["type"],
+                session_id=session_id,
+                owner_id=user_id,
+                credits=credits,
+            )
+            add_credits(user_id, credits)
+            CreditTransaction.objects.create(
+                owner_id=user_id, amount=credits, description=f"Top-up via session {session_id}"
+            )
+            return True
+    except IntegrityError:
+        # Already processed: this event id, or another event for the session.
+        return False
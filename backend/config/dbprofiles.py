@@ -0,0 +1,58 @@
+"""
+Database profiles selected with ``DATABASE_PROFILE``.
+
+``sqlite-tuned`` is the opt-in production profile for SQLite. On every new
+connection it runs:
+
+* ``journal_mode=WAL``, so readers keep going while the single writer
+  commits;
+* ``synchronous=NORMAL``, which in WAL mode survives application crashes
+  and only risks the last commits on power loss;
+* a memory-mapped window and a bigger page cache;
+* a busy timeout, so writers queue instead of failing with "database is
+  locked".
+
+Transactions also begin ``IMMEDIATE``: they take the write lock at BEGIN, so
+concurrent writers (import workers) wait on the busy timeout instead of
+failing when a deferred transaction upgrades to a write.
+
+Connections persist for ``DB_CONN_MAX_AGE`` seconds, so the pragmas and the
+warm cache outlive a single request.
+"""
+
+import copy
+import os
+
+DEFAULT = "default"
+SQLITE_TUNED = "sqlite-tuned"
+PROFILES = (DEFAULT, SQLITE_TUNED)
+
+
+def sqlite_tuned_pragmas():
+    mmap_size = int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    cache_kib = int(os.environ.get("SQLITE_CACHE_SIZE_KIB", "65536"))
+    busy_timeout_ms = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    return [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={mmap_size}",
+        # Negative cache_size is in KiB rather than pages.
+        f"PRAGMA cache_size=-{cache_kib}",
+        f"PRAGMA busy_timeout={busy_timeout_ms}",
+    ]
+
+
+def apply_profile(database, profile):
+    """Return a copy of a ``DATABASES`` entry with ``profile`` applied."""
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown DATABASE_PROFILE {profile!r}; expected one of {', '.join(PROFILES)}")
+    database = copy.deepcopy(database)
+    if profile == SQLITE_TUNED:
+        if database["ENGINE"] != "django.db.backends.sqlite3":
+            raise ValueError(f"{SQLITE_TUNED} only applies to the sqlite3 backend")
+        options = database.setdefault("OPTIONS", {})
+        options["init_command"] = ";".join(sqlite_tuned_pragmas())
+        options["transaction_mode"] = "IMMEDIATE"
+        database["CONN_MAX_AGE"] = int(os.environ.get("DB_CONN_MAX_AGE", "600"))
+        database["CONN_HEALTH_CHECKS"] = True
+    return database
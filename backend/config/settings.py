@@ -2,6 +2,8 @@ import os
 from datetime import timedelta
 from pathlib import Path
 
+from .dbprofiles import apply_profile
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY", "change-me-in-production")
@@ -57,6 +59,9 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # A file rather than shared-cache memory, so threaded concurrency
+        # tests get real connections that wait on the busy timeout.
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
     }
 }
 
@@ -76,7 +81,7 @@ AUTH_USER_MODEL = "api.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -89,11 +94,79 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # When on, tokens carry a hash of the password: changing it revokes them,
+    # and the claim is the token version api.authentication caches users
+    # under. Off by default because turning it on rejects every token issued
+    # without the claim, logging out all existing sessions once; set
+    # JWT_CHECK_REVOKE_TOKEN=true at a planned cutover.
+    "CHECK_REVOKE_TOKEN": os.environ.get("JWT_CHECK_REVOKE_TOKEN", "false").lower() == "true",
 }
 
 STRIPE_SECRET_KEY = os.environ.get("STRIPE_SECRET_KEY")
 STRIPE_PUBLISHABLE_KEY = os.environ.get("STRIPE_PUBLISHABLE_KEY")
+# Signing secret of the webhook endpoint (whsec_...); /api/credits/webhook/
+# rejects every delivery while it is unset.
+STRIPE_WEBHOOK_SECRET = os.environ.get("STRIPE_WEBHOOK_SECRET")
+# Only changed to point at a local fake (see bench_async_checkout).
+STRIPE_API_BASE = os.environ.get("STRIPE_API_BASE", "https://api.stripe.com")
 PAYMENT_SUCCESS_URL = os.environ.get("PAYMENT_SUCCESS_URL", "http://localhost:5173/?payment=success")
 PAYMENT_CANCEL_URL = os.environ.get("PAYMENT_CANCEL_URL", "http://localhost:5173/?payment=cancel")
 
 SEED_CSV_PATH = os.environ.get("SEED_CSV_PATH", str(BASE_DIR / "data" / "seed_leads.csv"))
+# The validated seed rows are pickled here, one file per version of the
+# seed CSV, and shared by every worker process (api.seed).
+SEED_CACHE_DIR = os.environ.get("SEED_CACHE_DIR", str(BASE_DIR / "data" / "seed_cache"))
+
+# Keyset pagination is opt-in per request (?page_size= or ?cursor=); these
+# bound the page a client can ask for.
+API_PAGE_SIZE = int(os.environ.get("API_PAGE_SIZE", "100"))
+API_MAX_PAGE_SIZE = int(os.environ.get("API_MAX_PAGE_SIZE", "1000"))
+
+# Lead imports validate and bulk insert this many rows at a time, and report
+# at most IMPORT_MAX_REPORTED_ERRORS row errors back to the client.
+IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_REPORTED_ERRORS = int(os.environ.get("IMPORT_MAX_REPORTED_ERRORS", "100"))
+
+# Queued imports (?async=1) spool their input here until run_import_worker
+# has processed it.
+IMPORT_JOB_DIR = os.environ.get("IMPORT_JOB_DIR", str(BASE_DIR / "data" / "import_jobs"))
+
+# Rows fetched per round trip when exports stream from the database.
+EXPORT_CHUNK_SIZE = int(os.environ.get("EXPORT_CHUNK_SIZE", "2000"))
+
+# Upper bound on lead ids accepted by /api/leads/unlock/batch/.
+UNLOCK_BATCH_MAX_SIZE = int(os.environ.get("UNLOCK_BATCH_MAX_SIZE", "1000"))
+
+# Most lead ids one /api/lists/<id>/members/ delta may add plus remove.
+LIST_MEMBERS_MAX_DELTA = int(os.environ.get("LIST_MEMBERS_MAX_DELTA", "5000"))
+
+# /api/leads/facets/ counts are cached per owner under the data version that
+# lead writes bump, so no process serves counts from before a write; the
+# timeout only bounds how long superseded entries stay in memory.
+FACET_CACHE_TIMEOUT = int(os.environ.get("FACET_CACHE_TIMEOUT", "300"))
+FACET_MAX_VALUES = int(os.environ.get("FACET_MAX_VALUES", "100"))
+
+# /api/leads/changes/ only serves rows at least this old, so a write that
+# commits after a concurrent, later-stamped one is not skipped by a cursor.
+LEAD_CHANGES_SETTLE_SECONDS = int(os.environ.get("LEAD_CHANGES_SETTLE_SECONDS", "2"))
+# Tombstones older than this are pruned; change cursors older than it get
+# 410 and the client has to resync from scratch.
+LEAD_TOMBSTONE_RETENTION_DAYS = int(os.environ.get("LEAD_TOMBSTONE_RETENTION_DAYS", "30"))
+
+# api.authentication keeps up to AUTH_USER_CACHE_SIZE users per process for
+# AUTH_USER_CACHE_TIMEOUT seconds (0 disables the cache).
+AUTH_USER_CACHE_SIZE = int(os.environ.get("AUTH_USER_CACHE_SIZE", "1024"))
+AUTH_USER_CACHE_TIMEOUT = int(os.environ.get("AUTH_USER_CACHE_TIMEOUT", "60"))
+
+# Opt-in SQLite production profile (WAL, pragmas, persistent connections);
+# see config/dbprofiles.py. Set DATABASE_PROFILE=sqlite-tuned to enable it.
+DATABASE_PROFILE = os.environ.get("DATABASE_PROFILE", "default")
+DATABASES["default"] = apply_profile(DATABASES["default"], DATABASE_PROFILE)
+
+# Opt-in per-view request metrics (query count, SQL time, render time and
+# latency histograms), scraped as Prometheus text from /api/_metrics/. When
+# API_METRICS_TOKEN is set the scrape must send "Authorization: Bearer <token>".
+API_METRICS_ENABLED = os.environ.get("API_METRICS_ENABLED", "false").lower() == "true"
+API_METRICS_TOKEN = os.environ.get("API_METRICS_TOKEN", "")
+if API_METRICS_ENABLED:
+    MIDDLEWARE.insert(0, "api.metrics.RequestMetricsMiddleware")
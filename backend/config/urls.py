@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.urls import include, path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from api.views import RegisterView, ProfileView, StripeCheckoutView, StripeConfirmView, SeedImportView
+from api.async_views import AsyncStripeCheckoutView
+from api.views import RegisterView, ProfileView, StripeCheckoutView, StripeConfirmView, StripeWebhookView, SeedImportView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -10,7 +11,9 @@ urlpatterns = [
     path("api/auth/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/auth/me/", ProfileView.as_view(), name="profile"),
     path("api/credits/checkout/", StripeCheckoutView.as_view(), name="stripe_checkout"),
+    path("api/async/credits/checkout/", AsyncStripeCheckoutView.as_view(), name="async_stripe_checkout"),
     path("api/credits/confirm/", StripeConfirmView.as_view(), name="stripe_confirm"),
+    path("api/credits/webhook/", StripeWebhookView.as_view(), name="stripe_webhook"),
     path("api/import/seed/", SeedImportView.as_view(), name="import_seed"),
     path("api/", include("api.urls")),
 ]
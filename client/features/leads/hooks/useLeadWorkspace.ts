@@ -14,6 +14,13 @@ const SAMPLE_LOCATIONS = ["United States", "India", "United Kingdom", "Canada",
 
 const PAGE_SIZE = 10;
 
+// Imports skip rows that match an existing lead, so report those too;
+// otherwise a lower created count looks like lost rows.
+const describeImport = (created: number, duplicates: number) =>
+  duplicates
+    ? `Imported ${created} leads, skipped ${duplicates} duplicates`
+    : `Imported ${created} leads`;
+
 export interface LeadWorkspaceState {
   leads: Lead[];
   paginatedLeads: Lead[];
@@ -176,15 +183,16 @@ export const useLeadWorkspace = (
 
   const importSeed = useCallback(async () => {
     if (!accessToken) return;
-    await api.importSeed(accessToken);
+    const summary = await api.importSeed(accessToken);
     await syncLeadsFromApi();
+    toast.success(describeImport(summary.created.length, summary.duplicates));
   }, [accessToken, syncLeadsFromApi]);
 
   const importLeads = useCallback(async (rows: Partial<Lead>[]) => {
     if (!accessToken) return;
-    await api.importLeads(accessToken, rows);
+    const summary = await api.importLeads(accessToken, rows);
     await syncLeadsFromApi();
-    toast.success("Leads imported");
+    toast.success(describeImport(summary.created, summary.duplicates));
   }, [accessToken, syncLeadsFromApi]);
 
   const exportLeads = useCallback(async () => {
@@ -200,12 +208,39 @@ export const useLeadWorkspace = (
     toast.success("List saved");
   }, [accessToken]);
 
+  const loadListMembers = useCallback(async (id: string | number): Promise<number[]> => {
+    if (!accessToken) return [];
+    const existing = savedLists.find((l) => l.id === id);
+    if (existing?.membersLoaded) return existing.leads;
+    const memberIds = await api.listMemberIds(accessToken, id);
+    setSavedLists((prev) =>
+      prev.map((l) => (l.id === id ? { ...l, leads: memberIds, leadCount: memberIds.length, membersLoaded: true } : l))
+    );
+    return memberIds;
+  }, [accessToken, savedLists]);
+
   const updateList = useCallback(async (id: string | number, name: string, leadIds: number[]) => {
     if (!accessToken) return;
-    const updated = await api.updateSavedList(accessToken, id, { name, leads: leadIds });
-    setSavedLists((prev) => prev.map((l) => (l.id === id ? updated : l)));
+    // Send only the membership delta instead of re-posting every member id.
+    const current = await loadListMembers(id);
+    const currentSet = new Set(current);
+    const nextSet = new Set(leadIds);
+    const add = leadIds.filter((leadId) => !currentSet.has(leadId));
+    const remove = current.filter((leadId) => !nextSet.has(leadId));
+    const existing = savedLists.find((l) => l.id === id);
+    if (existing && existing.name !== name) {
+      await api.renameSavedList(accessToken, id, name);
+    }
+    if (add.length || remove.length) {
+      await api.updateListMembers(accessToken, id, { add, remove });
+    }
+    setSavedLists((prev) =>
+      prev.map((l) =>
+        l.id === id ? { ...l, name, leads: leadIds, leadCount: leadIds.length, membersLoaded: true } : l
+      )
+    );
     toast.success("List updated");
-  }, [accessToken]);
+  }, [accessToken, loadListMembers, savedLists]);
 
   const deleteList = useCallback(async (id: string | number) => {
     if (!accessToken) return;
@@ -221,7 +256,10 @@ export const useLeadWorkspace = (
     setActiveListId(id);
     selection.clear();
     setCurrentPage(1);
-  }, [selection]);
+    if (id !== null) {
+      loadListMembers(id).catch(() => toast.error("Unable to load list members"));
+    }
+  }, [loadListMembers, selection]);
 
   const createFilter = useCallback(async (name: string, criteria: FilterCriteria) => {
     if (!accessToken) return;
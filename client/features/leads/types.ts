@@ -20,6 +20,8 @@ export interface SavedList {
   id: string | number;
   name: string;
   leads: number[]; // store only lead IDs for backend alignment
+  leadCount?: number;
+  membersLoaded?: boolean; // list views send only a count; members load on demand
   createdAt?: number;
 }
 
@@ -21,12 +21,58 @@ type LeadResponse = {
   phone_unlocked: boolean;
 };
 
+type LeadPageResponse = {
+  next: string | null;
+  next_cursor: string | null;
+  results: LeadResponse[];
+};
+
+export type LeadPage = { leads: Lead[]; nextCursor: string | null };
+
+type LeadChangesResponse = {
+  changed: LeadResponse[];
+  deleted: number[];
+  cursor: string;
+  has_more: boolean;
+};
+
+export type LeadChanges = { changed: Lead[]; deleted: number[]; cursor: string; hasMore: boolean };
+
+const LEAD_PAGE_SIZE = 500;
+
+export type ImportJob = {
+  id: number;
+  status: "pending" | "running" | "succeeded" | "failed";
+  mode: "skip" | "update" | "insert";
+  processed_rows: number;
+  created_rows: number;
+  updated_rows: number;
+  duplicate_rows: number;
+  error_count: number;
+  progress: number;
+  rows_per_second: number | null;
+  detail: string;
+};
+
+export type FacetValue = { value: string; count: number };
+
+export type LeadFacets = {
+  industry: FacetValue[];
+  location: FacetValue[];
+  source: FacetValue[];
+  total: number;
+  unlocked: { email: number; phone: number };
+};
+
 type SavedListResponse = {
   id: number;
   name: string;
-  leads: number[];
+  leads?: number[];
+  lead_count?: number;
 };
 
+type ListMembersDelta = { add?: number[]; remove?: number[] };
+
 type SavedFilterResponse = {
   id: number;
   name: string;
@@ -34,11 +80,25 @@ type SavedFilterResponse = {
 };
 
 type CheckoutSession = { id: string; url: string };
+type CreditConfirmation = { credited: boolean; added: number; credits: number };
+
+export type ImportSummary = {
+  processed: number;
+  created: number;
+  updated: number;
+  duplicates: number;
+  error_count: number;
+  errors: { index: number; errors: Record<string, string[]> }[];
+};
+
+// The seed import returns the new leads themselves under "created".
+type SeedImportSummary = Omit<ImportSummary, "created"> & { created: LeadResponse[] };
 
 async function request<T>(path: string, { method = "GET", body, token }: RequestOptions = {}): Promise<T> {
-  const headers: Record<string, string> = {
-    "Content-Type": "application/json",
-  };
+  const isForm = body instanceof FormData;
+  const headers: Record<string, string> = {};
+  // The browser sets the multipart boundary itself for FormData bodies.
+  if (!isForm) headers["Content-Type"] = "application/json";
   if (token) {
     headers.Authorization = `Bearer ${token}`;
   }
@@ -48,7 +108,7 @@ async function request<T>(path: string, { method = "GET", body, token }: Request
     response = await fetch(`${API_BASE_URL}${path}`, {
       method,
       headers,
-      body: body ? JSON.stringify(body) : undefined,
+      body: isForm ? body : body ? JSON.stringify(body) : undefined,
     });
   } catch (networkError) {
     const reason =
@@ -96,7 +156,9 @@ const mapLead = (lead: LeadResponse): Lead => ({
 const mapList = (list: SavedListResponse): SavedList => ({
   id: list.id,
   name: list.name,
-  leads: list.leads,
+  leads: list.leads ?? [],
+  leadCount: list.lead_count ?? list.leads?.length ?? 0,
+  membersLoaded: list.leads !== undefined,
 });
 
 const mapFilter = (filter: SavedFilterResponse): SavedFilter => ({
@@ -105,6 +167,18 @@ const mapFilter = (filter: SavedFilterResponse): SavedFilter => ({
   filters: filter.criteria,
 });
 
+// Keyset-paginated read of the lead book; pass the previous page's
+// nextCursor to continue, until it comes back null.
+const listLeads = async (
+  token: string,
+  { cursor, pageSize = LEAD_PAGE_SIZE }: { cursor?: string | null; pageSize?: number } = {}
+): Promise<LeadPage> => {
+  const params = new URLSearchParams({ page_size: String(pageSize) });
+  if (cursor) params.set("cursor", cursor);
+  const page = await request<LeadPageResponse>(`/api/leads/?${params.toString()}`, { token });
+  return { leads: page.results.map(mapLead), nextCursor: page.next_cursor };
+};
+
 export const api = {
   signup: (payload: { email: string; password: string }) =>
     request<{ user: { email: string; credits: number }; access: string; refresh: string }>("/api/auth/register/", {
@@ -114,10 +188,36 @@ export const api = {
   login: (payload: { email: string; password: string }) =>
     request<{ access: string; refresh: string }>("/api/auth/login/", { method: "POST", body: payload }),
   profile: (token: string) => request<{ id: number; email: string; credits: number }>("/api/auth/me/", { token }),
+  listLeads,
   fetchLeads: async (token: string): Promise<Lead[]> => {
-    const response = await request<LeadResponse[]>("/api/leads/", { token });
+    const leads: Lead[] = [];
+    let cursor: string | null = null;
+    do {
+      const page: LeadPage = await listLeads(token, { cursor });
+      leads.push(...page.leads);
+      cursor = page.nextCursor;
+    } while (cursor);
+    return leads;
+  },
+  searchLeads: async (token: string, query: string, limit = LEAD_PAGE_SIZE): Promise<Lead[]> => {
+    const params = new URLSearchParams({ q: query, limit: String(limit) });
+    const response = await request<LeadResponse[]>(`/api/leads/search/?${params.toString()}`, { token });
     return response.map(mapLead);
   },
+  // Delta sync: pass the previous cursor to get only what changed since;
+  // keep calling while hasMore is true.
+  leadChanges: async (token: string, since?: string | null): Promise<LeadChanges> => {
+    const params = new URLSearchParams({ limit: String(LEAD_PAGE_SIZE) });
+    if (since) params.set("since", since);
+    const response = await request<LeadChangesResponse>(`/api/leads/changes/?${params.toString()}`, { token });
+    return {
+      changed: response.changed.map(mapLead),
+      deleted: response.deleted,
+      cursor: response.cursor,
+      hasMore: response.has_more,
+    };
+  },
+  leadFacets: (token: string) => request<LeadFacets>("/api/leads/facets/", { token }),
   listSavedLists: async (token: string): Promise<SavedList[]> => {
     const lists = await request<SavedListResponse[]>("/api/lists/", { token });
     return lists.map(mapList);
@@ -130,6 +230,30 @@ export const api = {
     const updated = await request<SavedListResponse>(`/api/lists/${id}/`, { method: "PUT", token, body: payload });
     return mapList(updated);
   },
+  renameSavedList: async (token: string, id: string | number, name: string): Promise<SavedList> => {
+    const updated = await request<SavedListResponse>(`/api/lists/${id}/`, { method: "PATCH", token, body: { name } });
+    return mapList(updated);
+  },
+  listMemberIds: async (token: string, id: string | number): Promise<number[]> => {
+    const ids: number[] = [];
+    let cursor: string | null = null;
+    do {
+      const params = new URLSearchParams({ page_size: String(LEAD_PAGE_SIZE) });
+      if (cursor) params.set("cursor", cursor);
+      const page: LeadPageResponse = await request<LeadPageResponse>(`/api/lists/${id}/members/?${params.toString()}`, {
+        token,
+      });
+      ids.push(...page.results.map((lead) => lead.id));
+      cursor = page.next_cursor;
+    } while (cursor);
+    return ids;
+  },
+  updateListMembers: (token: string, id: string | number, delta: ListMembersDelta) =>
+    request<{ added: number; removed: number; lead_count: number }>(`/api/lists/${id}/members/`, {
+      method: "POST",
+      token,
+      body: delta,
+    }),
   deleteSavedList: (token: string, id: string | number) => request(`/api/lists/${id}/`, { method: "DELETE", token }),
   listSavedFilters: async (token: string): Promise<SavedFilter[]> => {
     const filters = await request<SavedFilterResponse[]>("/api/filters/", { token });
@@ -151,15 +275,32 @@ export const api = {
       body: { lead_id: leadId, type },
     });
   },
-  importSeed: (token: string) => request<{ created: LeadResponse[] }>("/api/import/seed/", { method: "POST", token }),
+  unlockBatch: (token: string, leadIds: number[], type: "email" | "phone", mode: "all" | "partial" = "all") =>
+    request<{
+      leads: LeadResponse[];
+      credits: number;
+      charged: number;
+      unlocked: number[];
+      already_unlocked: number[];
+      skipped: number[];
+      not_found: number[];
+    }>("/api/leads/unlock/batch/", { method: "POST", token, body: { lead_ids: leadIds, type, mode } }),
+  importSeed: (token: string) => request<SeedImportSummary>("/api/import/seed/", { method: "POST", token }),
   importLeads: (token: string, leads: Partial<Lead>[]) =>
-    request<{ created: LeadResponse[] }>("/api/leads/import/", { method: "POST", token, body: { leads } }),
+    request<ImportSummary>("/api/leads/import/", { method: "POST", token, body: { leads } }),
+  importLeadsCsv: (token: string, file: File) => {
+    const form = new FormData();
+    form.append("file", file);
+    return request<ImportSummary>("/api/leads/import/csv/", { method: "POST", token, body: form });
+  },
+  importJob: (token: string, id: number) => request<ImportJob>(`/api/import/jobs/${id}/`, { token }),
   exportLeads: async (token: string): Promise<Lead[]> => {
     const response = await request<LeadResponse[]>("/api/leads/export/", { token });
     return response.map(mapLead);
   },
   createCheckoutSession: (token: string, amount: number, credits: number): Promise<CheckoutSession> =>
     request<CheckoutSession>("/api/credits/checkout/", { method: "POST", token, body: { amount, credits } }),
-  confirmCredits: (token: string, sessionId: string, credits: number) =>
-    request<{ credits: number }>("/api/credits/confirm/", { method: "POST", token, body: { session_id: sessionId, credits } }),
+  // Credits are added by the Stripe webhook; this only reports whether that happened yet.
+  confirmCredits: (token: string, sessionId: string) =>
+    request<CreditConfirmation>("/api/credits/confirm/", { method: "POST", token, body: { session_id: sessionId } }),
 };
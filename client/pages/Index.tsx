@@ -7,15 +7,19 @@ import { Accordion, AccordionContent, AccordionItem, AccordionTrigger } from "@/
 import { toast } from "sonner";
 import { useLeadsSelection } from "@/hooks/useLeadsSelection";
 import { useAuth } from "@/context/AuthContext";
-import { api } from "@/lib/api";
+import { api, type LeadFacets } from "@/lib/api";
 import { LeadToolbar } from "@/features/leads/components/LeadToolbar";
 import { LeadTable } from "@/features/leads/components/LeadTable";
 import { useLeadWorkspace } from "@/features/leads/hooks/useLeadWorkspace";
 import type { FilterCriteria, SavedFilter, SavedList } from "@/features/leads/types";
 import { exportSelectedLeads, parseCsvFile } from "@/features/leads/utils/csv";
 
+// Fallback options until the user's own facet counts have loaded.
 const COUNTRIES = ["United States", "India", "United Kingdom", "Canada", "Australia"];
 const INDUSTRIES = ["Technology", "Finance", "Healthcare", "Manufacturing", "Retail"];
+// Stripe's webhook usually lands within seconds of the redirect back.
+const CONFIRM_POLL_ATTEMPTS = 10;
+const CONFIRM_POLL_INTERVAL_MS = 2000;
 
 export default function Index() {
   // Shared selection across table and saved list actions.
@@ -73,6 +77,7 @@ export default function Index() {
   const [listNameInput, setListNameInput] = useState("");
   const [filterNameInput, setFilterNameInput] = useState("");
   const [filterCountries, setFilterCountries] = useState<string[]>([]);
+  const [facets, setFacets] = useState<LeadFacets | null>(null);
   const [filterIndustries, setFilterIndustries] = useState<string[]>([]);
   const [filterTags, setFilterTags] = useState<string[]>([]);
   const [filterTagInput, setFilterTagInput] = useState("");
@@ -81,27 +86,46 @@ export default function Index() {
   const [topUpCredits, setTopUpCredits] = useState(25);
   const [topUpAmount, setTopUpAmount] = useState(500); // cents
 
-  // If Stripe redirects back with a session, finalize the credit top-up.
+  // If Stripe redirects back with a session, wait for its webhook to credit the account.
   useEffect(() => {
     const params = new URLSearchParams(window.location.search);
     const sessionId = params.get("session_id");
-    const creditParam = params.get("credits");
-    if (sessionId && creditParam && accessToken) {
-      const creditsToAdd = parseInt(creditParam, 10);
+    if (!sessionId || !accessToken) return;
+    let cancelled = false;
+    const clearParams = () => window.history.replaceState({}, document.title, `${window.location.pathname}`);
+    const poll = (attempt: number) => {
       api
-        .confirmCredits(accessToken, sessionId, creditsToAdd)
+        .confirmCredits(accessToken, sessionId)
         .then((result) => {
+          if (cancelled) return;
           setCredits(result.credits);
-          toast.success("Credits added to your account");
-          params.delete("session_id");
-          params.delete("credits");
-          params.delete("payment");
-          window.history.replaceState({}, document.title, `${window.location.pathname}`);
+          if (result.credited) {
+            toast.success(`${result.added} credits added to your account`);
+            clearParams();
+          } else if (attempt < CONFIRM_POLL_ATTEMPTS) {
+            window.setTimeout(() => poll(attempt + 1), CONFIRM_POLL_INTERVAL_MS);
+          } else {
+            toast.message("Payment received; your credits will appear shortly");
+            clearParams();
+          }
         })
         .catch(() => toast.error("Unable to confirm credits"));
-    }
+    };
+    poll(1);
+    return () => {
+      cancelled = true;
+    };
   }, [accessToken, setCredits]);
 
+  // Facet counts come from a per-user server cache, so refreshing on open is cheap.
+  useEffect(() => {
+    if (!filterModalOpen || !accessToken) return;
+    api.leadFacets(accessToken).then(setFacets).catch(() => setFacets(null));
+  }, [accessToken, filterModalOpen]);
+
+  const countryOptions: { value: string; count: number | null }[] = facets?.location.length ? facets.location : COUNTRIES.map((value) => ({ value, count: null }));
+  const industryOptions: { value: string; count: number | null }[] = facets?.industry.length ? facets.industry : INDUSTRIES.map((value) => ({ value, count: null }));
+
   const selectedCount = selection.getSelectedCount();
 
   // Saved list handlers ------------------------------------------------------
@@ -466,7 +490,7 @@ export default function Index() {
             <div>
               <div className="text-sm font-semibold mb-2">Countries</div>
               <div className="flex flex-wrap gap-2">
-                {COUNTRIES.map((country) => (
+                {countryOptions.map(({ value: country, count }) => (
                   <button
                     key={country}
                     className={`px-3 py-1 rounded-full text-xs border ${filterCountries.includes(country) ? "bg-blue-600 text-white" : "border-slate-300 dark:border-slate-700"}`}
@@ -477,6 +501,7 @@ export default function Index() {
                     }
                   >
                     {country}
+                    {count !== null && <span className="ml-1 opacity-70">({count})</span>}
                   </button>
                 ))}
               </div>
@@ -484,7 +509,7 @@ export default function Index() {
             <div>
               <div className="text-sm font-semibold mb-2">Industries</div>
               <div className="flex flex-wrap gap-2">
-                {INDUSTRIES.map((industry) => (
+                {industryOptions.map(({ value: industry, count }) => (
                   <button
                     key={industry}
                     className={`px-3 py-1 rounded-full text-xs border ${filterIndustries.includes(industry) ? "bg-blue-600 text-white" : "border-slate-300 dark:border-slate-700"}`}
@@ -495,6 +520,7 @@ export default function Index() {
                     }
                   >
                     {industry}
+                    {count !== null && <span className="ml-1 opacity-70">({count})</span>}
                   </button>
                 ))}
               </div>